@@ -0,0 +1,545 @@
+version = "2026-10-18"
+
+'''
+SSCBenchmark.py
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+Offline benchmark for SuperStakerCheckup, no qtum.info API calls.
+
+Starts a local HTTP stand-in for the qtum.info API serving synthetic /info,
+/address/<addr> and /address/<addr>/utxo responses for one super staker with a
+given number of delegates, each with a given number of UTXOs, and an injected
+latency per request. The same server is a stub qtumd JSON-RPC node (POST with
+getblockcount, getstakinginfo, getaddressbalance, getaddressutxos and
+getdelegationsforstaker, batch calls too) for the dataSource rpc
+configuration. Then runs SuperStakerCheckup main() end to end against it, once
+per scenario, and reports:
+
+    wall time of main()
+    API requests and requests per second
+    peak RSS (resident memory) of the checkup process
+    parse throughput, decoded MB and UTXOs per second of UTXO decoding
+
+Each scenario runs in its own process, so the peak RSS is for that scenario
+alone. The stand-in server runs in this process.
+
+Usage, lists are comma separated and every combination is run:
+
+    python SSCBenchmark.py
+    python SSCBenchmark.py --delegates 10,200,2000 --utxos 1,100 --latency 20 --workers 1,8
+    python SSCBenchmark.py --delegates 10 --utxos 50000 --stream
+    python SSCBenchmark.py --delegates 2000 --utxos 20 --workers 1 --rpc
+
+Options:
+
+    --delegates     delegates of the super staker (default 10,200,2000)
+    --utxos         UTXOs per address (default 20)
+    --latency       milliseconds added to every request (default 20)
+    --workers       numWorkers configuration entry (default 1,8)
+    --stream        also run each scenario with streamUTXOs true
+    --rpc           also run each scenario with dataSource rpc
+    --script        the SuperStakerCheckup script to benchmark (default the
+                    newest SuperStakerCheckup*.py next to this file)
+
+The synthetic responses are generated before each scenario starts, 2000
+delegates with 50,000 UTXOs each is about 20 GB of JSON, so keep
+delegates x UTXOs to a few million.
+
+Revisions
+
+2026-10-18 First version
+2026-10-18 Stub qtumd JSON-RPC node and --rpc
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+'''
+
+import sys                                              # for system exit
+import os
+import glob
+import json
+import gzip                                             # for gzip transfer encoding
+import io
+import random
+import subprocess                                       # one process per scenario
+import tempfile
+import threading
+import time
+import importlib.util                                   # to load the dated script as a module
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+try:
+    import resource                                     # for peak RSS, not on Windows
+except ImportError:
+    resource = None
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    # serves the prebuilt responses, HTTP/1.1 keep-alive, gzip if asked for
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True      # or small responses wait for the delayed ACK
+
+    def log_message(self, format, *args):   # no request log
+
+        return
+
+    def do_GET(self):
+
+        time.sleep(self.server.latency)
+
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        body = None
+        utxoCount = 0
+
+        if parts[-1] == "info":
+            body = self.server.info
+
+        elif len(parts) >= 3 and parts[-1] == "utxo" and parts[-3] == "address":
+            body = self.server.utxoBodies.get(parts[-2])
+            utxoCount = utxos_per_address(self.server, parts[-2])
+
+        elif len(parts) >= 2 and parts[-2] == "address":
+            body = self.server.addressBodies.get(parts[-1])
+
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        raw, compressed = body
+
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.utxosServed += utxoCount
+
+        self.send_body(raw, compressed)
+
+    def send_body(self, raw, compressed):
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            raw = compressed
+            self.send_header("Content-Encoding", "gzip")
+
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        # stub qtumd JSON-RPC, a single call or a batch
+
+        time.sleep(self.server.latency)
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))))
+        utxoCount = 0
+
+        if isinstance(request, list):
+            responses = []
+
+            for call in request:
+                response, count = rpc_response(self.server, call)
+                responses.append(response)
+                utxoCount += count
+        else:
+            responses, utxoCount = rpc_response(self.server, request)
+
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.utxosServed += utxoCount
+
+        self.send_body(*make_body(json.dumps(responses, separators = (",", ":"))))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def rpc_response(server, call):
+    # the response to one JSON-RPC call and the number of UTXOs in it
+
+    method = call.get("method")
+    params = call.get("params", [])
+    result = None
+    error = None
+    utxoCount = 0
+
+    if method == "getblockcount":
+        result = benchmarkHeight
+
+    elif method == "getstakinginfo":
+        result = {"enabled": False, "staking": False, "netstakeweight": 2151586138402970}
+
+    elif method == "getdelegationsforstaker":
+        if params[0] == server.stakerAddress:
+            result = [{"delegate": delegation["delegator"], "staker": server.stakerAddress, "fee": delegation["fee"],
+                       "blockHeight": 500000, "weight": 0, "PoD": ""} for delegation in server.delegations]
+        else:
+            result = []
+
+    elif method in ("getaddressbalance", "getaddressutxos"):
+        addresses = params[0]["addresses"]
+
+        if any(address not in server.utxoColumns for address in addresses):
+            error = {"code": -5, "message": "Invalid address"}
+
+        elif method == "getaddressbalance":
+            balance = sum(sum(value for value, blockHeight in server.utxoColumns[address]) for address in addresses)
+            result = {"balance": balance, "received": balance, "immature": 0}
+
+        else:
+            result = []
+
+            for address in addresses:
+                for value, blockHeight in server.utxoColumns[address]:
+                    result.append({"address": address, "txid": "%064x" % len(result), "outputIndex": 0,
+                                   "script": scriptPubKey, "satoshis": value, "height": blockHeight, "isStake": False})
+
+            utxoCount = len(result)
+
+    else:
+        error = {"code": -32601, "message": "Method not found"}
+
+    return {"result": result, "error": error, "id": call.get("id")}, utxoCount
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def utxos_per_address(server, address):
+    # the staker has three times as many UTXOs as each delegate
+
+    if address == server.stakerAddress:
+        return 3 * server.numUTXOs
+
+    return server.numUTXOs
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_address(rng):
+    # a random mainnet address, Q and 33 base58 characters
+
+    return "Q" + "".join(rng.choice(base58Alphabet) for i in range(33))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_body(text):
+    # (plain, gzip) bytes for a response
+
+    raw = text.encode()
+
+    return raw, gzip.compress(raw, compresslevel = 1)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_utxos(rng, address, count):
+    # JSON text of count UTXOs, about a third each valid, too small and immature,
+    # and the list of their (value, blockHeight) for the RPC stub
+
+    utxos = []
+    columns = []
+
+    for i in range(count):
+        kind = rng.randrange(3)
+
+        if kind == 0:
+            value = rng.randint(1, 99 * 100000000)                      # too small
+        else:
+            value = rng.randint(100 * 100000000, 400 * 100000000)
+
+        if kind == 2:
+            blockHeight = rng.randint(benchmarkHeight - 499, benchmarkHeight)   # immature
+        else:
+            blockHeight = rng.randint(300000, benchmarkHeight - 501)
+
+        utxos.append('{"transactionId":"%064x","outputIndex":%d,"scriptPubKey":"%s","address":"%s",'
+                     '"value":"%d","isStake":%s,"blockHeight":%d,"confirmations":%d}' %
+                     (rng.getrandbits(256), rng.randrange(4), scriptPubKey, address, value,
+                      "true" if kind == 2 else "false", blockHeight, benchmarkHeight - blockHeight + 1))
+        columns.append((value, blockHeight))
+
+    return "[" + ",".join(utxos) + "]", columns
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def start_mock_server(numDelegates, numUTXOs, latency):
+    # build the synthetic responses and serve them on a free local port
+    # returns the server, its api URL is server.endpoint
+
+    rng = random.Random(numDelegates * 100003 + numUTXOs)      # same data for the same scale
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAPIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.numUTXOs = numUTXOs
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.utxosServed = 0
+    server.stakerAddress = make_address(rng)
+    server.addressBodies = {}
+    server.utxoBodies = {}
+    server.utxoColumns = {}
+
+    server.info = make_body(json.dumps({"height": benchmarkHeight, "supply": 103023968, "circulatingSupply": 103023968,
+                                        "blockTime": 1609008176, "difficulty": 4371001.580485245,
+                                        "stakeWeight": 2151586138402970, "fullnodes": 1158, "feeRate": 0.00440734,
+                                        "addresses": 2071441, "netStakeWeight": 2151586138402970},
+                                       separators = (",", ":")))
+
+    delegations = []
+
+    for i in range(numDelegates):
+        delegations.append({"delegator": make_address(rng), "fee": rng.choice([benchmarkFee, benchmarkFee,
+                                                                               benchmarkFee, benchmarkFee + 5,
+                                                                               benchmarkFee - 5])})
+
+    for address in [server.stakerAddress] + [delegation["delegator"] for delegation in delegations]:
+        count = utxos_per_address(server, address)
+        utxoText, server.utxoColumns[address] = make_utxos(rng, address, count)
+        balance = str(sum(value for value, blockHeight in server.utxoColumns[address]))
+        summary = {"balance": balance, "totalReceived": balance, "totalSent": "0", "unconfirmed": "0",
+                   "staking": "0", "mature": balance, "qrc20Balances": [], "qrc721Balances": [], "ranking": 95,
+                   "transactionCount": count, "blocksMined": 0}
+
+        if address == server.stakerAddress:
+            summary["delegations"] = delegations
+
+        server.addressBodies[address] = make_body(json.dumps(summary, separators = (",", ":")))
+        server.utxoBodies[address] = make_body(utxoText)
+
+    server.delegations = delegations
+    server.endpoint = "http://127.0.0.1:" + str(server.server_address[1]) + "/api/"
+
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+
+    return server
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_scenario(scriptFile, server, numWorkers, streamUTXOs, useRPC):
+    # run the checkup in a new process against the server, returns the results
+    # the child process prints them as JSON on its last line
+
+    with tempfile.TemporaryDirectory() as workDir:
+        configFile = os.path.join(workDir, "SSCConfigurationFile.txt")
+        timingFile = os.path.join(workDir, "SSCTimings.json")
+
+        with open(configFile, "w") as f:
+            f.write('"stakerAddress": ' + server.stakerAddress + ',\n')
+            f.write('"stakerFee": ' + str(benchmarkFee) + ',\n')
+            f.write('"stakerMinUTXOSize": 100,\n')
+            f.write('"isMainnet": true,\n')
+            f.write('"numWorkers": ' + str(numWorkers) + ',\n')
+            f.write('"streamUTXOs": ' + ("true" if streamUTXOs == True else "false") + ',\n')
+
+            if useRPC == True:
+                f.write('"dataSource": rpc,\n')
+                f.write('"rpcURL": ' + server.endpoint + ',\n')
+            f.write('"timingFile": SSCTimings.json,\n')          # in workDir, the child's directory
+
+        with server.lock:
+            server.requests = 0
+            server.utxosServed = 0
+
+        child = subprocess.run([sys.executable, __file__, "--child", scriptFile, configFile, server.endpoint],
+                               cwd = workDir, capture_output = True, text = True)
+
+        if child.returncode != 0 or len(child.stdout.strip()) == 0:
+            print(child.stdout[-2000:])
+            print(child.stderr[-2000:])
+            return None
+
+        results = json.loads(child.stdout.strip().splitlines()[-1])
+
+        timings = {"requests": []}
+
+        if os.path.exists(timingFile):      # older scripts have no timingFile entry
+            with open(timingFile) as f:
+                timings = json.load(f)
+
+    # parse time and decoded size of the UTXO responses, a streamed response
+    # is decoded as it arrives so its parse time is not separable, the RPC
+    # batch calls are counted whole
+
+    parseSeconds = 0
+    parseBytes = 0
+
+    for call in timings["requests"]:
+        if (call["url"].endswith("/utxo") or useRPC == True) and call["parse"] is not None:
+            parseSeconds += call["parse"]
+            parseBytes += call["bytes"]
+
+    results["requests"] = server.requests
+    results["utxos"] = server.utxosServed
+    results["parseSeconds"] = parseSeconds
+    results["parseBytes"] = parseBytes
+
+    return results
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_child(scriptFile, configFile, endpoint):
+    # in the scenario process, load the script as a module, point it at the
+    # stand-in server and run main(), print the results as JSON
+
+    spec = importlib.util.spec_from_file_location("SuperStakerCheckup", scriptFile)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    # the dated script runs the superstakercheckup package, older ones are the whole program
+
+    checkup = getattr(script, "checkup", script)
+
+    checkup.config_file_name = configFile
+    checkup.APIEndpointMainnet = endpoint
+    checkup.APIEndpointTestnet = endpoint
+
+    output = io.StringIO()
+    start = time.perf_counter()
+
+    with redirect_stdout(output):
+        checkup.main()
+
+    wallTime = time.perf_counter() - start
+
+    peakRSS = None
+
+    if resource is not None:
+        peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        if sys.platform != "darwin":    # kilobytes, bytes on macOS
+            peakRSS *= 1024
+
+    print(json.dumps({"wallTime": wallTime, "peakRSS": peakRSS}))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_results(numDelegates, numUTXOs, numWorkers, streamUTXOs, useRPC, results):
+
+    tempStr = "{:>9}{:>7}{:>8}{:>7}{:>7}".format(numDelegates, numUTXOs, numWorkers, "yes" if streamUTXOs == True else "no",
+                                                "rpc" if useRPC == True else "api")
+
+    if results is None:
+        print(tempStr + "   FAILED")
+        return
+
+    requestRate = results["requests"] / results["wallTime"]
+
+    if results["peakRSS"] is None:
+        peak = "n/a"
+    else:
+        peak = format(results["peakRSS"] / 1048576, "0.1f")
+
+    if results["parseSeconds"] > 0:
+        parseRate = format(results["parseBytes"] / 1048576 / results["parseSeconds"], "0.1f")
+        utxoRate = format(results["utxos"] / results["parseSeconds"], "0.0f")
+    else:
+        parseRate = "n/a"
+        utxoRate = "n/a"
+
+    print(tempStr + "{:>9.2f}{:>10}{:>9.1f}{:>10}{:>10}{:>12}".format(results["wallTime"], results["requests"],
+          requestRate, peak, parseRate, utxoRate))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_option(name, default):
+    # value of --name from the command line, or the default
+
+    if name in sys.argv:
+        index = sys.argv.index(name)
+
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+
+        print("Missing value for", name)
+        sys.exit()
+
+    return default
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_int_list(name, default):
+
+    try:
+        values = [int(value) for value in get_option(name, default).split(",")]
+    except ValueError:
+        print("Bad value for", name)
+        sys.exit()
+
+    return values
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# global variables
+
+benchmarkHeight = 777320                                # block height served by /info
+benchmarkFee = 10                                       # super staker fee
+base58Alphabet = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+scriptPubKey = "21031f48b26481bea513a84573de5f62b4b23d2989a823158e897ce85f755818f04fac"
+
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# MAIN PROGRAM STARTS HERE  = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+def main():
+
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3], sys.argv[4])
+        return
+
+    scriptFile = get_option("--script", "")
+
+    if len(scriptFile) == 0:
+        scripts = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "SuperStakerCheckup*.py")))
+
+        if len(scripts) == 0:
+            print("No SuperStakerCheckup*.py script found, use --script")
+            sys.exit()
+
+        scriptFile = scripts[-1]
+
+    delegateCounts = get_int_list("--delegates", "10,200,2000")
+    utxoCounts = get_int_list("--utxos", "20")
+    workerCounts = get_int_list("--workers", "1,8")
+    latency = int(get_option("--latency", "20")) / 1000
+
+    if "--stream" in sys.argv:
+        streamModes = [False, True]
+    else:
+        streamModes = [False]
+
+    if "--rpc" in sys.argv:
+        sources = [False, True]
+    else:
+        sources = [False]
+
+    print("SSCBenchmark", version, "\n")
+    print("Script", os.path.basename(scriptFile) + ", latency", int(latency * 1000), "ms\n")
+    print("Delegates  UTXOs Workers Stream Source   Wall s  Requests    Req/s  Peak MB  Parse MB/s     UTXOs/s")
+
+    for numDelegates in delegateCounts:
+        for numUTXOs in utxoCounts:
+            server = start_mock_server(numDelegates, numUTXOs, latency)
+
+            for numWorkers in workerCounts:
+                for streamUTXOs in streamModes:
+                    for useRPC in sources:
+                        if useRPC == True and streamUTXOs == True:     # no streaming from the node
+                            continue
+
+                        results = run_scenario(scriptFile, server, numWorkers, streamUTXOs, useRPC)
+                        print_results(numDelegates, numUTXOs, numWorkers, streamUTXOs, useRPC, results)
+
+            server.shutdown()
+            server.server_close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+version = "2026-10-18"
+
+'''
+SSCHistory.py
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+Range queries on the results history SuperStakerCheckup records with the
+historyFile configuration entry, no API calls.
+
+Usage:
+
+    python SSCHistory.py
+    python SSCHistory.py --address QLo9J... --blocks 10000
+    python SSCHistory.py --staker QTJDT... --from 760000 --to 777320
+    python SSCHistory.py --staker QTJDT... --csv > trend.csv
+    python SSCHistory.py --shares --from 0 --bucket 81000 --csv > shares.csv
+
+Options:
+
+    --file          the history file (default SSCHistory.db)
+    --address       the weight of one address, a delegate or a staker, at
+                    each recorded height
+    --staker        the staker trend, its weight, percent staked, delegates
+                    weight and delegates being staked at each recorded height
+    --blocks        the last blocks of history to show (default 10000)
+    --from, --to    the range of heights to show instead of --blocks
+    --shares        the share of the network stake weight of every staker, or
+                    of --staker, with the expected blocks per day, their
+                    standard deviation and the expected reward per day, from
+                    the heights recorded with networkShare
+    --bucket        the blocks averaged in each --shares row (default 2700)
+    --csv           write the rows as CSV, weights in satoshis
+
+Without --address, --staker or --shares it lists the stakers in the history.
+
+Weights are the valid UTXO sums (mature and big enough to stake) in QTUM.
+
+Revisions
+
+2026-10-18 First version
+2026-10-18 --shares and --bucket, expected blocks per day from the network share
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+'''
+
+import sys                                              # for system exit
+import os
+import csv
+import time
+
+from superstakercheckup.checkup import HistoryStore
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_option(name, default):
+    # value of --name from the command line, or the default
+
+    if name in sys.argv:
+        index = sys.argv.index(name)
+
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+
+        print("Missing value for", name)
+        sys.exit()
+
+    return default
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_int(name, default):
+
+    try:
+        return int(get_option(name, str(default)))
+    except ValueError:
+        print("Bad value for", name)
+        sys.exit()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_stakers(store):
+
+    print("Staker                              First height  Last height   Runs")
+
+    for stakerAddress, firstHeight, lastHeight, runs in store.stakers():
+        print("{:<36}{:>12}{:>13}{:>7}".format(stakerAddress, firstHeight, lastHeight, runs))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_address_history(rows, writeCSV):
+
+    if writeCSV == True:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["height", "stakerAddress", "fee", "status", "numValid", "sumValid", "numImmature",
+                         "sumImmature", "numTooSmall", "sumTooSmall", "numTotal", "sumTotal"])
+        writer.writerows(rows)
+        return
+
+    print("  Height  Staker                              Fee  Valid UTXOs      Weight    Immature   Too Small       Total")
+
+    for row in rows:
+        height, stakerAddress, fee, status, numValid, sumValid, numImmature, sumImmature, numTooSmall, sumTooSmall, \
+            numTotal, sumTotal = row
+
+        print("{:>8}  {:<34}{:>5}{:>13}{:>12.2f}{:>12.2f}{:>12.2f}{:>12.2f}".format(height, stakerAddress, fee, numValid,
+              sumValid / 100000000, sumImmature / 100000000, sumTooSmall / 100000000, sumTotal / 100000000))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_staker_history(rows, writeCSV):
+
+    if writeCSV == True:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["height", "sumValid", "sumImmature", "percentStaked", "delegatesWeight", "stakingDelegations"])
+        writer.writerows(rows)
+        return
+
+    print("  Height      Weight    Immature  Percent Staked  Delegates Weight  Delegates Staked")
+
+    for height, sumValid, sumImmature, percentStaked, delegatesWeight, stakingDelegations in rows:
+        if percentStaked is None:
+            percent = "n/a"
+        else:
+            percent = format(percentStaked, "0.2f")
+
+        print("{:>8}{:>12.2f}{:>12.2f}{:>16}{:>18.2f}{:>18}".format(height, sumValid / 100000000, sumImmature / 100000000,
+              percent, delegatesWeight / 100000000, stakingDelegations))
+
+def print_share_table(rows, writeCSV):
+
+    if writeCSV == True:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["stakerAddress", "height", "samples", "weight", "netStakeWeight", "share", "expectedBlocks",
+                         "standardDeviation", "expectedReward"])
+        writer.writerows(rows)
+        return
+
+    print("Staker                                Height  Runs        Weight  Share %  Blocks/day  Std dev  QTUM/day")
+
+    for stakerAddress, height, samples, weight, netStakeWeight, share, expectedBlocks, standardDeviation, \
+            expectedReward in rows:
+        print("{:<36}{:>8}{:>6}{:>14.2f}{:>9.4f}{:>12.3f}{:>9.3f}{:>10.4f}".format(stakerAddress, height, samples,
+              weight / 100000000, 100 * share, expectedBlocks, standardDeviation, expectedReward / 100000000))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# MAIN PROGRAM STARTS HERE  = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+def main():
+
+    fileName = get_option("--file", "SSCHistory.db")
+
+    if not os.path.exists(fileName):
+        print("No history file", fileName + ", set historyFile in the configuration file to record one")
+        sys.exit()
+
+    store = HistoryStore(fileName)
+
+    address = get_option("--address", "")
+    stakerAddress = get_option("--staker", "")
+    writeCSV = "--csv" in sys.argv
+    shares = "--shares" in sys.argv
+
+    if len(address) == 0 and len(stakerAddress) == 0 and shares == False:
+        print_stakers(store)
+        store.close()
+        return
+
+    toHeight = get_int("--to", store.last_height())
+    fromHeight = get_int("--from", toHeight - get_int("--blocks", 10000) + 1)
+
+    queryStart = time.perf_counter()
+
+    if shares == True:
+        rows = store.share_table(fromHeight, toHeight, get_int("--bucket", 2700), stakerAddress)
+        queryTime = time.perf_counter() - queryStart
+
+        if writeCSV == False:
+            print("Network share, heights", fromHeight, "to", toHeight, "-", len(rows), "rows in",
+                  format(queryTime * 1000, "0.1f"), "ms\n")
+
+        print_share_table(rows, writeCSV)
+        store.close()
+        return
+
+    if len(address) > 0:
+        rows = store.address_history(address, fromHeight, toHeight)
+    else:
+        rows = store.staker_history(stakerAddress, fromHeight, toHeight)
+
+    queryTime = time.perf_counter() - queryStart
+
+    if writeCSV == False:
+        if len(address) > 0:
+            print("Address", address, end = "")
+        else:
+            print("Staker", stakerAddress, end = "")
+
+        print(", heights", fromHeight, "to", toHeight, "-", len(rows), "rows in", format(queryTime * 1000, "0.1f"), "ms\n")
+
+    if len(address) > 0:
+        print_address_history(rows, writeCSV)
+    else:
+        print_staker_history(rows, writeCSV)
+
+    store.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+version = "2026-10-18"
+
+'''
+SSCWhatIf.py
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+What the delegates of the stakers in the configuration file would be at other
+staker fees and min UTXO sizes, before changing them. The delegations and the
+UTXOs of every delegate, whatever its fee, are fetched once, then each point
+of the grid is worked out from them without more API calls.
+
+Usage:
+
+    python SSCWhatIf.py
+    python SSCWhatIf.py --fees 5:15 --sizes 50:500:50
+    python SSCWhatIf.py --staker QTJDT... --fees 0:99 --sizes 0:990:10 --csv > grid.csv
+
+Options:
+
+    --config        the configuration file (default SSCConfigurationFile.txt)
+    --staker        one of the stakers in the configuration file, or another
+                    staker address, instead of all of them
+    --fees          the staker fees, percent, from:to or from:to:step
+                    (default 0:100:5)
+    --sizes         the min UTXO sizes, QTUM, from:to or from:to:step
+                    (default 0:1000:100)
+    --csv           write the grid as CSV, weights in satoshis
+
+For each fee and min UTXO size:
+
+    Staked          delegations with a fee at least the staker fee
+    Staking         staked delegates with a valid UTXO (mature and at least
+                    the min UTXO size)
+    Weight          the valid UTXO sum of the staked delegates, QTUM
+    Too Small       the UTXOs under the min UTXO size, QTUM
+    Recombine       delegates with a warning, too small UTXOs that add up to
+                    the min UTXO size
+
+The row with the configured fee and min UTXO size is marked with *. With
+responseCacheFile in the configuration file the responses are revalidated
+from the cache, so a second run downloads only what changed.
+
+Revisions
+
+2026-10-18 First version
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+'''
+
+import sys                                              # for system exit
+import csv
+import time
+
+from superstakercheckup import what_if, load_config, ConfigError, CheckupError
+from superstakercheckup.checkup import make_settings, make_client, make_response_cache
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_option(name, default):
+    # value of --name from the command line, or the default
+
+    if name in sys.argv:
+        index = sys.argv.index(name)
+
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+
+        print("Missing value for", name)
+        sys.exit()
+
+    return default
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_range(name, default):
+    # from:to or from:to:step of --name, to included, as a range
+
+    try:
+        parts = [int(part) for part in get_option(name, default).split(":")]
+    except ValueError:
+        parts = []
+
+    if len(parts) == 2:
+        parts.append(1)
+
+    if len(parts) != 3 or parts[0] < 0 or parts[1] < parts[0] or parts[2] <= 0:
+        print("Bad value for", name)
+        sys.exit()
+
+    return range(parts[0], parts[1] + 1, parts[2])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_points(staker, writer):
+
+    if writer is not None:
+        for point in staker.points:
+            writer.writerow([staker.address] + list(point))
+
+        return
+
+    print("Staker", staker.address, "-", staker.delegationCount, "delegations, configured fee", staker.fee,
+          "min UTXO size", staker.minUTXOSize, "\n")
+    print("   Fee  Min UTXO  Staked  Staking          Weight       Too Small  Recombine")
+
+    for point in staker.points:
+        if point.fee == staker.fee and point.minUTXOSize == staker.minUTXOSize:
+            mark = "*"
+        else:
+            mark = " "
+
+        print("{}{:>5}{:>10}{:>8}{:>9}{:>16.2f}{:>16.2f}{:>11}".format(mark, point.fee, point.minUTXOSize,
+              point.stakedDelegations, point.stakingDelegations, point.delegatesWeight / 100000000,
+              point.sumTooSmall / 100000000, point.recombineWarnings))
+
+    print()
+
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# MAIN PROGRAM STARTS HERE  = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+def main():
+
+    try:
+        config = load_config(get_option("--config", "SSCConfigurationFile.txt"))
+    except ConfigError as e:
+        print(e)
+        sys.exit()
+
+    stakerAddress = get_option("--staker", "")
+    fees = get_range("--fees", "0:100:5")
+    minUTXOSizes = get_range("--sizes", "0:1000:100")
+    writeCSV = "--csv" in sys.argv
+
+    if len(stakerAddress) > 0:          # the configured fee and min UTXO size, if it is there
+        stakers = [staker for staker in config["stakers"] if staker[0] == stakerAddress]
+        config["stakers"] = stakers[:1] or [(stakerAddress, 0, 0)]
+
+    try:
+        settings = make_settings(config)
+        client = make_client(settings, cache = make_response_cache(settings))
+    except ConfigError as e:
+        print(e)
+        sys.exit()
+
+    runStart = time.perf_counter()
+
+    try:
+        result = what_if(config, fees, minUTXOSizes, client)
+
+    except (ConfigError, CheckupError) as e:
+        print(e)
+        sys.exit()
+
+    finally:
+        client.close()
+
+        if client.cache is not None:
+            client.cache.close()
+
+    runTime = time.perf_counter() - runStart
+    writer = None
+
+    if writeCSV == True:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["stakerAddress", "fee", "minUTXOSize", "stakedDelegations", "stakingDelegations",
+                         "delegatesWeight", "sumTooSmall", "recombineWarnings"])
+    else:
+        print("Height", result.height, "-", len(fees), "fees x", len(minUTXOSizes), "min UTXO sizes in",
+              format(runTime, "0.2f"), "seconds\n")
+
+    for staker in result.stakers:
+        print_points(staker, writer)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+if __name__ == '__main__':
+    main()
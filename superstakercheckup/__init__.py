@@ -0,0 +1,25 @@
+'''
+superstakercheckup
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+SuperStakerCheckup as a package.
+
+    checkup.py      the program, run by "SuperStakerCheckup - <date>.py" or
+                    python -m superstakercheckup, and Checkup, the checkup
+                    engine it and api.py run
+    api.py          check_staker() and check_staker_async(), the checkup as a
+                    library call for another program, and what_if() for a
+                    grid of staker fees and min UTXO sizes
+
+'''
+
+from .checkup import version, CheckupError, ConfigError, APIClient, ResponseCache, Checkup
+from .checkup import UTXOTotals, StakerResult, DelegateResult, StakerSummary, ProjectionResult, MaturitySchedule
+from .checkup import projection_points, UTXOPlanner, UTXOPlan, PlanTransaction, WhatIfSimulator, WhatIfPoint
+from .api import check_staker, check_staker_async, load_config, CheckupResult, StakerReport
+from .api import what_if, WhatIfResult, StakerWhatIf
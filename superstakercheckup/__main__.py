@@ -0,0 +1,5 @@
+# python -m superstakercheckup runs the program, like "SuperStakerCheckup - <date>.py"
+
+from .checkup import main
+
+main()
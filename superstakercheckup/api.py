@@ -0,0 +1,226 @@
+'''
+api.py
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+The checkup as a library call, for a program that checks stakers many times a
+day, a monitoring service for example, without starting SuperStakerCheckup
+for each check:
+
+    from superstakercheckup import check_staker
+
+    result = check_staker({"stakerAddress": "QTJDT...", "stakerFee": 3, "stakerMinUTXOSize": 100,
+                           "isMainnet": True})
+
+    for report in result.stakers:
+        print(report.staker.address, report.summary.stakingDelegations, report.summary.delegatesWeight)
+
+or from a coroutine:
+
+    result = await check_staker_async(config)
+
+what_if() fetches the same UTXOs once, for every delegation whatever its fee,
+and returns the delegates weight for each staker fee and min UTXO size of a
+grid, to see what a new fee or min UTXO size would do before setting it:
+
+    result = what_if(config, range(0, 21), range(50, 501, 50))
+
+The configuration is a dict with the configuration file entries, or the dict
+from load_config(). More than one staker goes in "stakers", a list of
+(address, fee, min UTXO size). "apiEndpoint" can point the qtum.info requests
+at another server. The entries are checked by the same rules as the
+configuration file, the ones only the program uses (watchMode, cacheFile,
+outputFormat, timingReport and so on) are ignored.
+
+Nothing is printed and nothing is kept in module variables, a bad
+configuration raises ConfigError and a request that still fails after its
+retries raises CheckupError, so check_staker() can run in many threads at
+once. Each call makes its own APIClient and closes it, pass an APIClient as
+client to keep its connections open between calls, with a ResponseCache as its
+cache to revalidate the responses of the last call instead of downloading them.
+
+The checkup itself is the Checkup engine of checkup.py, the program runs it
+too, with its report writer, the UTXO cache and the timings, so the program
+and check_staker() give the same results. This module only imports checkup.py,
+never the other way. Pass a report writer of checkup.py as writer to get each
+result as the program does, as soon as it is ready:
+
+    result = check_staker(config, writer = checkup.TextWriter(True))
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+'''
+
+import asyncio                                          # for check_staker_async()
+from collections import namedtuple
+
+from .checkup import Checkup, make_client, make_source, make_response_cache   # the engine, exported here too
+from .checkup import ConfigError, WhatIfSimulator, TeeWriter, get_delegations, load_config_file, make_settings
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# the result of check_staker(), height is the block height checked (an int) and
+# stakers has a StakerReport for each staker, in configuration order
+# a StakerReport has the StakerResult, a DelegateResult for each delegation and
+# the StakerSummary, as the program's report writers get them, and with
+# projectionBlocks the ProjectionResult (otherwise None), its schedules answer
+# weight_at(height) for any later height, and with networkShare the
+# NetworkShare (otherwise None)
+
+CheckupResult = namedtuple("CheckupResult", ["height", "isMainnet", "stakers"])
+StakerReport = namedtuple("StakerReport", ["staker", "delegates", "summary", "projection", "network"],
+                          defaults = [None])
+
+# the result of what_if(), stakers has a StakerWhatIf for each staker, with its
+# configured fee and min UTXO size, and a WhatIfPoint for each grid point
+
+WhatIfResult = namedtuple("WhatIfResult", ["height", "isMainnet", "stakers"])
+StakerWhatIf = namedtuple("StakerWhatIf", ["address", "fee", "minUTXOSize", "delegationCount", "points"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def load_config(fileName = "SSCConfigurationFile.txt"):
+    # read a configuration file, returns the configuration dict for check_staker()
+    # raises ConfigError if it can not be read or has a bad value
+    # the file is only parsed again when it changes, call it before each check
+    # to pick up an edit
+
+    try:
+        return load_config_file(fileName)
+
+    except OSError as e:
+        raise ConfigError("Can not read the configuration file " + fileName) from e
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def check_staker(config, client = None, writer = None):
+    # run the checkup for the stakers in config, returns a CheckupResult
+    # raises ConfigError for a bad configuration and CheckupError if a request
+    # failed after its retries, client is an APIClient to share between calls
+    # writer is a report writer that gets each result too, as it is ready
+
+    def run(settings, engine):
+
+        results = ResultWriter(settings["isMainnet"])
+
+        if writer is None:
+            engine.run(engine.get_block_height(), results)
+        else:
+            engine.run(engine.get_block_height(), TeeWriter([results, writer]))
+
+        return results.result
+
+    return call_with_checkup(config, client, run)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def what_if(config, fees, minUTXOSizes, client = None):
+    # the delegates weight of each staker in config for each fee (percent) and
+    # min UTXO size (QTUM), returns a WhatIfResult, the UTXOs of every
+    # delegation are fetched once and the grid is worked out from them with no
+    # more requests, raises ConfigError or CheckupError like check_staker()
+
+    fees = list(fees)
+    minUTXOSizes = list(minUTXOSizes)
+
+    def run(settings, engine):
+
+        height = engine.get_block_height()
+        summaries = engine.get_summaries()
+        stakers = []
+
+        engine.start_fetches(height, summaries, True)
+
+        for (address, fee, minUTXOSize), summary in zip(settings["stakers"], summaries):
+            simulator = WhatIfSimulator(height)
+
+            for delegation in get_delegations(summary):
+                simulator.add(delegation.fee, engine.get_utxos(delegation.address, height))
+
+            stakers.append(StakerWhatIf(address, fee, minUTXOSize, simulator.delegationCount,
+                                        simulator.sweep(fees, minUTXOSizes)))
+
+        return WhatIfResult(int(height), settings["isMainnet"], stakers)
+
+    return call_with_checkup(config, client, run)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def call_with_checkup(config, client, run):
+    # run(settings, engine) with a Checkup engine for config, closed after it,
+    # and an APIClient of its own if client is None
+
+    settings = make_settings(config)
+    ownClient = client is None
+
+    if ownClient == True:
+        client = make_client(settings)
+
+    engine = Checkup(settings, client)
+
+    try:
+        return run(settings, engine)
+
+    finally:
+        engine.close()
+
+        if ownClient == True:
+            client.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+async def check_staker_async(config, client = None):
+    # check_staker() in a worker thread, the event loop keeps running while the
+    # requests are in flight
+
+    return await asyncio.to_thread(check_staker, config, client)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ResultWriter:
+    # a report writer that keeps the results of a run, as the CheckupResult
+    # check_staker() returns, in result when the run is done
+
+    def __init__(self, isMainnet):
+
+        self.isMainnet = isMainnet
+        self.height = 0
+        self.reports = []
+        self.result = None
+
+    def start(self, height):
+
+        self.height = int(height)
+        self.reports = []
+
+    def staker(self, result):
+
+        self.reports.append(StakerReport(result, [], None, None))
+
+    def changes(self, result):
+
+        return
+
+    def delegate(self, result):
+
+        self.reports[-1].delegates.append(result)
+
+    def staker_end(self, summary):
+
+        self.reports[-1] = self.reports[-1]._replace(summary = summary)
+
+    def projection(self, result):
+
+        self.reports[-1] = self.reports[-1]._replace(projection = result)
+
+    def network(self, result):
+
+        self.reports[-1] = self.reports[-1]._replace(network = result)
+
+    def finish(self):
+
+        self.result = CheckupResult(self.height, self.isMainnet, self.reports)
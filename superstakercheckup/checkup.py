@@ -0,0 +1,4324 @@
+version = "2021-01-18"
+
+'''
+SuperStakerCheckup.py 
+
+Copyright (c) 2020 Jackson Belove
+Beta software, use at your own risk
+MIT License, free, open software for the Qtum Community
+
+= = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+A program to use qtum.info API calls to determine the number of mature UTXOs for
+an address.
+
+Uses configuration file inputs of staker address, required fee, and minimum UTXO
+size to analyze the Staker UTXOs and the delegate address UTXOs
+and determine the weight based on:
+
+    for the super staker
+    UTXO has > 500 confirmations from the current block height
+    UTXO is >= 100.0 QTUM
+    
+    for the delegted addresses:
+    Delegation meets minumum staker fee
+    UTXO has > 500 confirmations from the current block height
+    UTXO is >= the minimum UTXO size
+
+qtum.info API reference https://github.com/qtumproject/qtuminfo-api#qtuminfo-api-documentation
+
+The format of the UTXO API request is (mainnet):
+
+https://qtum.info/api/address/q_address/utxo
+
+Example output:
+
+SuperStakerCheckup 2021-01-18 
+
+Configuration file SSCConfigurationFile.txt:
+Staker Address QTJDT..., Staker Fee 3, Staker Min UTXO 100, is Mainet True
+Mainnet height 777320
+
+Super Staker QTJDT... 
+  Number Valid UTXOs = 257 Sum Valid UTXOs = 25704.36070569
+  Number Immature (probably staked) UTXOs = 6 Sum Immature (probably staked) UTXOs = 608.48315254
+  Number Too Small UTXOs = 0 Sum Too Small UTXOs = 0.0
+  Number Total UTXOs = 263 Sum Total UTXOs 26312.84385823
+  Percent Stake to Total = 2.312494825030787 
+
+Delegate QLo9J... Fee 3
+  Number Valid UTXOs = 4 Sum Valid UTXOs = 456.28494585
+  Number Immature UTXOs = 0 Sum Immature UTXOs = 0.0
+  Number Too Small UTXOs = 4 Sum Too Small UTXOs = 7.97643255
+  Number Total UTXOs = 8 Sum Total UTXOs 464.2613784 
+
+Delegate QM29f... Fee 3
+  Number Valid UTXOs = 1 Sum Valid UTXOs = 132.55552601
+  Number Immature UTXOs = 0 Sum Immature UTXOs = 0.0
+  Number Too Small UTXOs = 1 Sum Too Small UTXOs = 0.1267916
+  Number Total UTXOs = 2 Sum Total UTXOs 132.68231761 
+
+<snip>
+
+Number of valid Staker UTXOs (mature + immature) 263
+Number of delegates being staked 33
+Delegates weight 220148.20535546 
+
+To Add
+
+
+Revisions
+
+2020-12-26 Repurposed from GetWeightForAddresses - Multiple
+2026-10-18 Optional numWorkers for concurrent delegate UTXO fetches, report order unchanged
+2026-10-18 Pooled keep-alive API connections with gzip transfer encoding
+2026-10-18 Decode API responses with json instead of scanning str(result)
+2026-10-18 Optional streamUTXOs to decode UTXO responses as they arrive from the socket
+2026-10-18 Optional cacheFile, on-disk UTXO cache refreshed when an address balance or transaction count changes
+2026-10-18 One UTXO classification engine, classify_utxos(), for the staker and the delegates
+2026-10-18 Optional watchMode, rerun on each new block and print what changed
+2026-10-18 Batch checkup of several stakers, each address fetched once per run
+2026-10-18 Adaptive rate limit and retries with backoff, stop instead of printing zero totals
+2026-10-18 Optional timingReport and timingFile, per request and per phase timing
+2026-10-18 Optional outputFormat json, csv or ndjson and outputFile, analysers return results for a report writer
+2026-10-18 Optional dataSource rpc, a local qtumd node with batched JSON-RPC calls instead of qtum.info
+2026-10-18 UTXOSet and Delegation __slots__ records, per staker totals instead of module globals
+2026-10-18 superstakercheckup package with check_staker(), data sources keep no module state
+2026-10-18 Optional projectionBlocks, when the immature UTXOs will add to the staker and delegates weight
+2026-10-18 Optional historyFile, SQLite time series of the results by block height, see SSCHistory.py
+2026-10-18 Optional incrementalMode, diff the delegations with the last run and refetch only what changed
+2026-10-18 Optional utxoPageSize, fetch the UTXOs of an address in pages, several at a time
+2026-10-18 Optional classifyProcesses, classify large UTXO sets in a process pool through shared memory
+2026-10-18 Optional planUTXOs, the transactions to split and combine UTXOs under the split warnings
+2026-10-18 Optional responseCacheFile, HTTP response cache with ETag/If-Modified-Since revalidation
+2026-10-18 Optional networkShare, share of the network stake weight and expected blocks per day
+2026-10-18 Configuration file as JSON, TOML or YAML too, every entry checked, parsed once per file change
+2026-10-18 WhatIfSimulator, delegates weight for a grid of staker fees and min UTXO sizes, see SSCWhatIf.py
+2026-10-18 One checkup engine, Checkup, for the program and check_staker(), settings instead of module globals
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - 
+
+Program Summary
+
+On startup read the configuration file for staker address, fee,
+  minimum delegated UTXO size, and mainnet true or false (false = testnet)
+
+Call the qtum.info API to get the current block height.
+
+Call the qtum.info API to analyse current UTXOs for staker.
+
+Loop through all the delegates and analyze their UTXOs.
+
+Print statistics, warnings, etc.
+
+UTXos are sorted into three categores:
+  valid UTXOs: mature and big enough for staking
+  too small UTXOs (for delegated addresses) are smaller than the size a super staker will stake
+  immature UTXOs have < 500 confirmations, may be new UTXOs or stakes
+
+- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+'''
+
+from timeit import default_timer as timer               # for timer()
+import sys                                              # for system exit
+import os                                               # for the configuration file modification time
+from urllib.error import URLError, HTTPError            # for URL errors
+from concurrent.futures import ThreadPoolExecutor       # for concurrent UTXO fetches
+from concurrent.futures import Future                   # each address fetched once per run
+from concurrent.futures import wait, FIRST_COMPLETED    # for concurrent UTXO page fetches
+from concurrent.futures import ProcessPoolExecutor      # for classifying on many cores
+from multiprocessing import shared_memory               # UTXO columns shared with the classify processes
+import http.client                                      # for keep-alive API connections
+from urllib.parse import urlsplit
+import threading
+import queue
+import gzip                                             # for gzip transfer encoding
+import zlib                                             # for streaming gzip decompression
+import codecs
+import sqlite3                                          # for the on-disk UTXO cache
+import time
+import random                                           # for backoff jitter
+from collections import namedtuple, OrderedDict
+import io                                               # for capturing a report in watch mode
+from contextlib import redirect_stdout, contextmanager, nullcontext
+import difflib
+import re
+import json                                             # for decoding API responses
+try:
+    import tomllib                                      # for a TOML configuration file, Python 3.11
+except ImportError:
+    tomllib = None
+import csv                                              # for the csv report
+from array import array                                 # for compact UTXO columns
+import base64                                           # for the node RPC password
+from bisect import bisect_right                         # for the maturity projection
+from bisect import bisect_left, insort                  # for packing the planned transactions
+from itertools import accumulate
+import math
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def read_config_file(configFileName):
+    # read in parameters from the configuration file, returns the settings
+    # from make_settings(), with the defaults for the entries not in the file
+    # print configuration at startup
+
+    '''
+    "stakerAddress": qMUR738THXBXABfx1Rk6iWtiStEPtQKWYK,
+    "stakerFee": 10,
+    "stakerMinUTXOSize": 100,
+    "isMainnet": false,
+    '''
+
+    try:
+        settings = make_settings(load_config_file(configFileName))
+
+    except OSError:
+        print("ERROR opening configuration file")
+        print('The configuration file "SSCConfigurationFile.txt" must be in the same directory with SuperStakerCheckup')
+        sys.exit()
+
+    except ConfigError as e:
+        print(e)
+        sys.exit()
+
+    tempStr = "Configuration file " + config_file_name + ":"
+    print(tempStr)
+
+    for address, fee, minUTXOSize in settings["stakers"]:
+        tempStr = "Staker Address " + address + ", Staker Fee " + str(fee) + ", Staker Min UTXO " +\
+               str(minUTXOSize) + ", is Mainet " + str(settings["isMainnet"])
+        print(tempStr)
+
+    return settings
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def load_config_file(fileName):
+    # the configuration of a file, parsed and checked once and kept by file
+    # name, it is only parsed again when the file modification time or size
+    # changes, so a service that reloads it before each check rereads nothing
+    # raises OSError if the file can not be read and ConfigError for a bad entry
+
+    status = os.stat(fileName)
+    stamp = (status.st_mtime_ns, status.st_size)
+    key = os.path.abspath(fileName)
+    cached = configCache.get(key)
+
+    if cached is None or cached[0] != stamp:
+        with open(fileName, "rb") as configFile:
+            data = configFile.read()
+
+        try:
+            data = data.decode("utf-8-sig")     # without the BOM a Windows editor may write
+        except UnicodeDecodeError:
+            data = data.decode("latin-1")
+
+        cached = (stamp, parse_config(data, fileName))
+        configCache[key] = cached
+
+    config = dict(cached[1])            # a copy, the caller may change it
+    config["stakers"] = list(config["stakers"])
+
+    return config
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_config(data, fileName = ''):
+    # parse the configuration file data, returns a dict with "stakers", a list
+    # of (address, fee, min UTXO size), and the other entries found in the
+    # file, keyed like the file, raises ConfigError for a bad entry
+    # entries that are not in the file are left out, the caller keeps its defaults
+    # the file is the "key": value, lines of SSCConfigurationFile.txt, JSON,
+    # TOML or YAML, by the fileName extension or else by its first line
+
+    configFormat = config_format(data, fileName)
+
+    if configFormat == "json":
+        try:
+            entries = json.loads(data)
+
+        except ValueError as e:
+            raise ConfigError("Bad JSON in configuration file, " + str(e)) from e
+
+        if not isinstance(entries, dict):
+            raise ConfigError("Bad JSON in configuration file, not an object")
+
+    elif configFormat == "toml":
+        if tomllib is None:
+            raise ConfigError("A TOML configuration file needs Python 3.11 or later")
+
+        try:
+            entries = tomllib.loads(data)
+
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError("Bad TOML in configuration file, " + str(e)) from e
+
+    elif configFormat == "yaml":
+        entries = parse_yaml_config(data)
+
+    else:
+        return make_config(parse_legacy_config(data))
+
+    # a staker at the top of the file, then the ones in "stakers"
+
+    pairs = []
+    staker = {key: entries[key] for key in stakerKeys if key in entries}
+
+    if len(staker) > 0:
+        pairs.extend(staker_pairs(staker))
+
+    stakers = entries.get("stakers", [])
+
+    if not isinstance(stakers, list):
+        raise ConfigError("Bad value in configuration file stakers, not a list")
+
+    for staker in stakers:
+        pairs.extend(staker_pairs(staker))
+
+    pairs.extend((key, value) for key, value in entries.items() if key not in stakerKeys and key != "stakers")
+
+    return make_config(pairs)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def config_format(data, fileName):
+    # json, toml, yaml or legacy, the "key": value, lines
+
+    extension = os.path.splitext(fileName)[1].lower()
+
+    if extension == ".json":
+        return "json"
+
+    if extension == ".toml":
+        return "toml"
+
+    if extension in (".yaml", ".yml"):
+        return "yaml"
+
+    for line in data.splitlines():
+        line = line.strip()
+
+        if len(line) == 0 or line.startswith("#"):
+            continue
+
+        if line.startswith("{"):
+            return "json"
+
+        if line.startswith('"'):
+            return "legacy"
+
+        if line.startswith("[") or re.match(r"[A-Za-z_]\w*\s*=", line):
+            return "toml"
+
+        if re.match(r"[A-Za-z_]\w*\s*:", line) or line.startswith("---"):
+            return "yaml"
+
+        raise ConfigError("Bad configuration file, not JSON, TOML, YAML or \"key\": value, lines: " + line)
+
+    return "legacy"
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def staker_pairs(staker):
+    # the stakerAddress, stakerFee and stakerMinUTXOSize (key, value) pairs of
+    # an entry of "stakers", a table or [address, fee, min UTXO size]
+
+    if isinstance(staker, (list, tuple)) and len(staker) == 3:
+        return list(zip(stakerKeys, staker))
+
+    if isinstance(staker, dict):
+        for key in staker:
+            if key not in stakerKeys:
+                raise ConfigError("Unknown configuration entry " + str(key) + " in stakers")
+
+        if "stakerAddress" not in staker:
+            raise ConfigError("No stakerAddress for the staker " + repr(staker) + " in the configuration file")
+
+        return [(key, staker[key]) for key in stakerKeys if key in staker]
+
+    raise ConfigError("Bad value in configuration file stakers " + repr(staker))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_legacy_config(data):
+    # the (key, value) pairs of the "key": value, lines in file order, values
+    # as strings, a line may end with a # comment, a line that is not blank,
+    # a comment or an entry raises ConfigError
+
+    pairs = []
+
+    for lineNumber, line in enumerate(data.splitlines(), 1):
+        match = legacyLine.fullmatch(line)
+
+        if match is None:
+            raise ConfigError("Bad line " + str(lineNumber) + " in configuration file: " + line.strip())
+
+        if match.group(1) is not None:
+            pairs.append((match.group(1), match.group(2)))
+
+    return pairs
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_yaml_config(data):
+    # the entries of a YAML configuration file, the YAML a configuration needs:
+    # key: value lines, # comments, and a "stakers:" list of "- key: value"
+    # tables or [address, fee, min UTXO size] lists, values as strings
+
+    entries = {}
+    items = None                        # the list being read, "stakers"
+    item = None                         # its table being read
+
+    for lineNumber, line in enumerate(data.splitlines(), 1):
+        text = strip_comment(line).rstrip()
+
+        if len(text.strip()) == 0 or text.strip() in ("---", "..."):
+            continue
+
+        indent = len(text) - len(text.lstrip())
+        text = text.strip()
+        isItem = text.startswith("- ") or text == "-"
+
+        if isItem:
+            text = text[1:].strip()
+
+        if indent == 0 and not isItem:
+            match = yamlEntry.fullmatch(text)
+
+            if match is None:
+                raise ConfigError("Bad line " + str(lineNumber) + " in configuration file: " + line.strip())
+
+            key, value = match.groups()
+
+            if key in entries:
+                raise ConfigError("Duplicate configuration entry " + key)
+
+            items = None
+            item = None
+
+            if len(value) == 0:         # a list follows
+                items = []
+                entries[key] = items
+            else:
+                entries[key] = yaml_value(value)
+
+        elif items is not None and isItem and text.startswith("["):
+            if not text.endswith("]"):
+                raise ConfigError("Bad line " + str(lineNumber) + " in configuration file: " + line.strip())
+
+            items.append([yaml_value(value.strip()) for value in text[1:-1].split(",")])
+            item = None
+
+        elif items is not None and (isItem or item is not None):
+            match = yamlEntry.fullmatch(text)
+
+            if match is None or len(match.group(2)) == 0:
+                raise ConfigError("Bad line " + str(lineNumber) + " in configuration file: " + line.strip())
+
+            if isItem:
+                item = {}
+                items.append(item)
+
+            key, value = match.groups()
+
+            if key in item:
+                raise ConfigError("Duplicate configuration entry " + key + " in stakers")
+
+            item[key] = yaml_value(value)
+
+        else:
+            raise ConfigError("Bad line " + str(lineNumber) + " in configuration file: " + line.strip())
+
+    return entries
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def strip_comment(line):
+    # the line without a # comment, a # in quotes is kept
+
+    quote = ''
+
+    for i, character in enumerate(line):
+        if len(quote) > 0:
+            if character == quote:
+                quote = ''
+        elif character in "\"'":
+            quote = character
+        elif character == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i]
+
+    return line
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def yaml_value(value):
+    # a YAML scalar, without its quotes
+
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+
+    return value
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_config(pairs):
+    # the configuration dict from (key, value) pairs in file order, values as
+    # strings from a text file or typed from JSON or TOML, each checked once
+    # each stakerAddress starts a staker, its stakerFee and stakerMinUTXOSize
+    # follow, raises ConfigError for an unknown, repeated or bad entry
+
+    config = {}
+    stakers = []
+    staker = None
+
+    for key, value in pairs:
+        if key == "stakerAddress":
+            staker = {"stakerAddress": value}
+            stakers.append(staker)
+
+        elif key in stakerKeys:
+            if staker is None:
+                raise ConfigError(key + " before the first stakerAddress in the configuration file")
+
+            if key in staker:
+                raise ConfigError("Duplicate configuration entry " + key + " for staker " + str(staker["stakerAddress"]))
+
+            staker[key] = value
+
+        elif key in config:
+            raise ConfigError("Duplicate configuration entry " + key)
+
+        elif key in configKinds:
+            config[key] = config_value(key, configKinds[key], value)
+
+        else:
+            raise ConfigError("Unknown configuration entry " + str(key))
+
+    if len(stakers) == 0:
+        raise ConfigError("No stakerAddress in the configuration file")
+
+    config["stakers"] = [check_staker_entry(staker) for staker in stakers]
+
+    return config
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def check_staker_entry(staker):
+    # (address, fee, min UTXO size) of a staker, ConfigError if one is bad
+    # an address may be quoted, "stakerAddress": "Q...", as in older files
+
+    address = staker["stakerAddress"]
+
+    if isinstance(address, str):
+        address = address.strip('"')
+
+    if not isinstance(address, str) or stakerAddressPattern.fullmatch(address) is None:
+        raise ConfigError("Bad value in configuration file stakerAddress " + repr(address))
+
+    for key in ("stakerFee", "stakerMinUTXOSize"):
+        if key not in staker:
+            raise ConfigError("No " + key + " for staker " + address + " in the configuration file")
+
+    fee = config_value("stakerFee", "count", staker["stakerFee"])
+    minUTXOSize = config_value("stakerMinUTXOSize", "count", staker["stakerMinUTXOSize"])
+
+    if fee > 100:
+        raise ConfigError("Bad value in configuration file stakerFee " + str(fee) + " for staker " + address)
+
+    return (address, fee, minUTXOSize)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_settings(config):
+    # the settings of a checkup from a configuration dict, from
+    # load_config_file() or built by a caller, every entry of configEntries
+    # with its default if it is not set and "stakers", a list of (address,
+    # fee, min UTXO size), checked by the same rules as the configuration
+    # file, raises ConfigError for an unknown or bad entry
+    # one staker is stakerAddress, stakerFee and stakerMinUTXOSize, several
+    # are "stakers", a stakerFee or stakerMinUTXOSize next to "stakers" would
+    # be ignored, so it is a ConfigError too
+
+    settings = dict(configDefaults)
+
+    for key, value in config.items():
+        if key in configKinds:
+            settings[key] = config_value(key, configKinds[key], value)
+        elif key != "stakers" and key not in stakerKeys:
+            raise ConfigError("Unknown configuration entry " + str(key))
+
+    if "stakers" in config:
+        for key in stakerKeys:
+            if key in config:
+                raise ConfigError(key + " and stakers in the configuration, put it in the stakers entry")
+
+        stakers = config["stakers"]
+    elif "stakerAddress" in config:
+        stakers = [{key: config[key] for key in stakerKeys if key in config}]
+    else:
+        stakers = []
+
+    if not isinstance(stakers, (list, tuple)) or len(stakers) == 0:
+        raise ConfigError("No stakerAddress in the configuration")
+
+    settings["stakers"] = [check_staker_entry(dict(staker_pairs(staker))) for staker in stakers]
+
+    return settings
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def config_value(key, kind, value):
+    # the checked value of an entry, a string from a text file or typed from
+    # JSON or TOML, ConfigError if it is bad
+    # int is a positive integer, count zero or more, bool true or false, str
+    # any string and choice one of configChoices[key], in any case
+
+    if isinstance(value, str):
+        if kind in ("int", "count"):
+            if value.isdigit():
+                value = int(value)
+        elif kind == "bool":
+            value = {"true": True, "false": False}.get(value, value)
+        else:
+            value = value.strip('"')
+
+    if kind in ("int", "count"):
+        if isinstance(value, int) and not isinstance(value, bool) and (value > 0 or (kind == "count" and value == 0)):
+            return value
+
+    elif kind == "bool":
+        if isinstance(value, bool):
+            return value
+
+    elif isinstance(value, str):
+        if kind != "choice":
+            return value
+
+        if value.lower() in configChoices[key]:
+            return value.lower()
+
+    raise ConfigError("Bad value in configuration file " + key + " " + repr(value))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class CheckupError(Exception):
+    # an API request failed even after retrying, the report would be wrong
+    pass
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ConfigError(ValueError):
+    # a bad configuration value, the program prints it and exits
+    pass
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# a response in the ResponseCache, body is the decompressed body, etag and
+# lastModified the validators the server sent ('' if none), fetched the time
+# it was fetched or last revalidated
+
+CachedResponse = namedtuple("CachedResponse", ["body", "etag", "lastModified", "fetched"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ResponseCache:
+    # HTTP response cache under the APIClient, for the GET requests
+    # a bounded in-memory LRU of the most recently used responses, up to
+    # maxMemoryBytes of bodies, in front of an on-disk SQLite store of up to
+    # maxEntries responses (fileName '' = memory only)
+    # a cached response is revalidated with If-None-Match / If-Modified-Since,
+    # an unchanged address comes back as a 304 with no body, and the /info
+    # response is used without a request for infoSeconds after it was fetched
+    # only responses with an ETag or Last-Modified (and /info) are kept, there
+    # is nothing to revalidate the others with
+    # streamed responses are not cached
+
+    def __init__(self, fileName = '', maxMemoryBytes = 64000000, maxEntries = 5000, infoSeconds = 10):
+
+        self.memory = OrderedDict()             # url -> CachedResponse, least recently used first
+        self.memoryBytes = 0
+        self.maxMemoryBytes = maxMemoryBytes
+        self.maxEntries = maxEntries
+        self.infoSeconds = infoSeconds
+        self.lock = threading.Lock()
+        self.hits = 0                           # served without a request
+        self.revalidated = 0                    # 304 Not Modified
+        self.misses = 0                         # full download
+        self.db = None
+
+        if len(fileName) > 0:
+            self.db = sqlite3.connect(fileName, check_same_thread = False)
+
+            with self.lock:
+                self.db.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, etag TEXT, "
+                                "lastModified TEXT, fetched REAL, lastUsed REAL, body BLOB)")
+                self.db.execute("CREATE INDEX IF NOT EXISTS responsesLastUsed ON responses (lastUsed)")
+
+    def is_info(self, url):
+
+        return urlsplit(url).path.rstrip("/").endswith("/info")
+
+    def lookup(self, url):
+        # the CachedResponse for url from memory, or from disk into memory, or None
+
+        with self.lock:
+            if url in self.memory:
+                self.memory.move_to_end(url)
+                return self.memory[url]
+
+            if self.db is None:
+                return None
+
+            row = self.db.execute("SELECT body, etag, lastModified, fetched FROM responses WHERE url = ?",
+                                  (url,)).fetchone()
+
+            if row is None:
+                return None
+
+            self.db.execute("UPDATE responses SET lastUsed = ? WHERE url = ?", (time.time(), url))
+            entry = CachedResponse(*row)
+            self.remember(url, entry)
+
+        return entry
+
+    def is_fresh(self, url, entry):
+        # True if the entry can be used without asking the server, /info only
+
+        return self.is_info(url) and time.time() - entry.fetched < self.infoSeconds
+
+    def remember(self, url, entry):
+        # put an entry in the memory LRU, evicting the least recently used, lock held
+
+        if url in self.memory:
+            self.memoryBytes -= len(self.memory.pop(url).body)
+
+        self.memory[url] = entry
+        self.memoryBytes += len(entry.body)
+
+        while self.memoryBytes > self.maxMemoryBytes and len(self.memory) > 1:
+            url, entry = self.memory.popitem(last = False)
+            self.memoryBytes -= len(entry.body)
+
+    def store(self, url, body, etag, lastModified):
+        # keep a downloaded response, if it can be revalidated or is /info
+
+        if len(etag) == 0 and len(lastModified) == 0 and self.is_info(url) == False:
+            return
+
+        entry = CachedResponse(body, etag, lastModified, time.time())
+
+        with self.lock:
+            self.remember(url, entry)
+
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                                (url, etag, lastModified, entry.fetched, entry.fetched, body))
+
+    def refresh(self, url, entry, etag = '', lastModified = ''):
+        # the server answered 304, the entry is current again, with the new
+        # validators if the 304 sent them, only those and the times are
+        # written, the body on disk is unchanged
+
+        entry = CachedResponse(entry.body, etag or entry.etag, lastModified or entry.lastModified, time.time())
+
+        with self.lock:
+            self.remember(url, entry)
+
+            if self.db is not None:
+                self.db.execute("UPDATE responses SET etag = ?, lastModified = ?, fetched = ?, lastUsed = ? "
+                                "WHERE url = ?", (entry.etag, entry.lastModified, entry.fetched, entry.fetched, url))
+
+    def count(self, counter):
+
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def summary(self):
+
+        return "Response cache: " + str(self.hits) + " hits, " + str(self.revalidated) + " revalidated (304), " +\
+               str(self.misses) + " misses"
+
+    def close(self):
+        # evict the disk store down to maxEntries, save and close
+
+        if self.db is None:
+            return
+
+        with self.lock:
+            count = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+            if count > self.maxEntries:
+                self.db.execute("DELETE FROM responses WHERE url IN (SELECT url FROM responses "
+                                "ORDER BY lastUsed LIMIT ?)", (count - self.maxEntries,))
+
+            self.db.commit()
+            self.db.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RateLimiter:
+    # token bucket shared by all the API requests and worker threads
+    # allows maxRate requests per second with bursts of up to one second's worth
+    # maxRate 0 means no limit until the server answers 429 Too Many Requests
+    # the rate adapts to the server: it is halved on each 429 and raised a
+    # little after each successful request, back up to maxRate (or back to no
+    # limit), so it settles near the highest rate the API accepts
+
+    def __init__(self, maxRate):
+
+        self.maxRate = maxRate
+        self.rate = maxRate                     # current requests per second, 0 = no limit
+        self.tokens = max(1, maxRate)
+        self.lastTime = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # wait for a token
+
+        while True:
+            with self.lock:
+                if self.rate == 0:
+                    return
+
+                now = time.monotonic()
+                self.tokens = min(max(1, self.rate), self.tokens + (now - self.lastTime) * self.rate)
+                self.lastTime = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def slow_down(self):
+        # the server answered 429
+
+        with self.lock:
+            if self.rate == 0:
+                self.rate = throttledRequestsPerSecond
+            else:
+                self.rate = max(0.5, self.rate / 2)
+
+            self.tokens = min(self.tokens, 1)
+            self.lastTime = time.monotonic()
+
+    def speed_up(self):
+        # a request succeeded
+
+        with self.lock:
+            if self.rate == 0:
+                return
+
+            if self.maxRate > 0:
+                self.rate = min(self.maxRate, self.rate + 0.05 * self.maxRate)
+            else:
+                self.rate += 0.5
+
+                if self.rate >= 2 * throttledRequestsPerSecond:    # no longer throttled
+                    self.rate = 0
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class APIClient:
+    # shared client for the qtum.info API calls
+    # keeps a pool of idle keep-alive connections for each endpoint (mainnet and
+    # testnet have different hosts), so a checkup with hundreds of requests
+    # reuses a few connections instead of a TCP and TLS handshake per request
+    # asks for gzip transfer encoding and decompresses the response
+    # paces the requests with a RateLimiter and retries 429, 5xx and connection
+    # errors up to maxRetries times with jittered exponential backoff
+    # raises URLError or HTTPError like urlopen() when the retries run out
+    # each request is recorded in timings if it is a Timings
+    # the GET requests go through cache if it is a ResponseCache
+
+    def __init__(self, headers, maxConnections = 1, timeout = 60, requestsPerSecond = 0, maxRetries = 5,
+                 timings = None, cache = None):
+
+        self.headers = dict(headers)
+        self.headers["Accept-Encoding"] = "gzip"
+        self.headers["Connection"] = "keep-alive"
+        self.maxConnections = maxConnections    # idle connections kept per endpoint
+        self.timeout = timeout                  # seconds
+        self.pools = {}                         # (scheme, host, port) -> queue of idle connections
+        self.lock = threading.Lock()
+        self.connectionsOpened = 0
+        self.requestCount = 0
+        self.retryCount = 0
+        self.limiter = RateLimiter(requestsPerSecond)
+        self.maxRetries = maxRetries
+        self.timings = timings
+        self.cache = cache
+
+    def get_pool(self, key):
+
+        with self.lock:
+            if key not in self.pools:
+                self.pools[key] = queue.LifoQueue()
+
+            return self.pools[key]
+
+    def new_connection(self, scheme, host, port):
+
+        with self.lock:
+            self.connectionsOpened += 1
+
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout = self.timeout)
+        else:
+            return http.client.HTTPConnection(host, port, timeout = self.timeout)
+
+    def release(self, key, conn):
+        # return a connection to its pool, or close it if the pool is full
+
+        pool = self.get_pool(key)
+
+        if pool.qsize() < self.maxConnections:
+            pool.put(conn)
+        else:
+            conn.close()
+
+    def open(self, url, body = None, headers = None):
+        # send the GET request, or POST body, with the extra headers, returns
+        # (pool key, connection, response, call) with the response headers read
+        # and the body still to be read, call is the timing record for the
+        # request, completed by record()
+
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path
+
+        if parts.query:
+            path += "?" + parts.query
+
+        with self.lock:
+            self.requestCount += 1
+
+        pool = self.get_pool(key)
+
+        for attempt in range(2):
+            try:
+                conn = pool.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self.new_connection(parts.scheme, parts.hostname, parts.port)
+                reused = False
+
+            requestStart = time.perf_counter()
+            connectTime = None
+
+            try:
+                if reused == False:             # DNS, TCP and TLS, timed on their own
+                    conn.connect()
+                    connectTime = time.perf_counter() - requestStart
+
+                if body is None and headers is None:
+                    conn.request("GET", path, headers = self.headers)
+                elif body is None:
+                    conn.request("GET", path, headers = dict(self.headers, **headers))
+                else:
+                    conn.request("POST", path, body, headers = dict(self.headers, **headers))
+
+                response = conn.getresponse()
+
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+
+                if reused and attempt == 0:     # server closed an idle keep-alive connection, retry once
+                    continue
+
+                raise URLError(e)
+
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise URLError(e)
+
+            break
+
+        call = {"url": url, "start": requestStart, "connect": connectTime,
+                "firstByte": time.perf_counter() - requestStart - (connectTime or 0), "status": response.status}
+
+        return key, conn, response, call
+
+    def record(self, call, transferStart, wireBytes, bodyBytes, streamed = False):
+        # complete the timing record of a request once its body has been read
+
+        if self.timings is None:
+            return
+
+        call["transfer"] = time.perf_counter() - transferStart
+        call["wireBytes"] = wireBytes
+        call["bytes"] = bodyBytes
+        call["streamed"] = streamed
+
+        self.timings.add_call(call)
+
+    def close(self):
+        # close the idle connections, the client is done
+
+        with self.lock:
+            pools = list(self.pools.values())
+
+        for pool in pools:
+            while pool.empty() == False:
+                pool.get().close()
+
+    def finish(self, key, conn, response):
+        # the body has been read, keep the connection for the next request
+
+        if response.will_close:
+            conn.close()
+        else:
+            self.release(key, conn)
+
+    def backoff(self, attempt, retryAfter = None):
+        # seconds to wait before retry number attempt + 1, exponential with
+        # jitter so the worker threads do not retry in lockstep, at least the
+        # server's Retry-After if it sent one
+
+        delay = min(maxBackoff, 0.5 * 2 ** attempt)
+        delay = delay / 2 + random.uniform(0, delay / 2)
+
+        if retryAfter is not None and retryAfter.isdigit():
+            delay = max(delay, int(retryAfter))
+
+        return delay
+
+    def with_retries(self, function, url):
+        # call function(url) at the limiter's pace, retrying 429, 5xx and
+        # connection errors
+
+        for attempt in range(self.maxRetries + 1):
+
+            self.limiter.acquire()
+
+            try:
+                result = function(url)
+
+            except HTTPError as e:
+                if (e.code != 429 and e.code < 500) or attempt == self.maxRetries:
+                    raise
+
+                if e.code == 429:
+                    self.limiter.slow_down()
+
+                delay = self.backoff(attempt, e.headers.get("Retry-After"))
+
+            except URLError:
+                if attempt == self.maxRetries:
+                    raise
+
+                delay = self.backoff(attempt)
+
+            else:
+                self.limiter.speed_up()
+                return result
+
+            with self.lock:
+                self.retryCount += 1
+
+            time.sleep(delay)
+
+    def get(self, url):
+        # GET the url and return the (decompressed) response body
+
+        if self.cache is not None:
+            return self.get_cached(url)
+
+        return self.with_retries(self.get_once, url)
+
+    def get_cached(self, url):
+        # GET through the ResponseCache, a fresh /info is used as it is, any
+        # other cached response is revalidated with a conditional request
+
+        entry = self.cache.lookup(url)
+
+        if entry is not None and self.cache.is_fresh(url, entry):
+            self.cache.count("hits")
+            return entry.body
+
+        headers = {}
+
+        if entry is not None and len(entry.etag) > 0:
+            headers["If-None-Match"] = entry.etag
+
+        if entry is not None and len(entry.lastModified) > 0:
+            headers["If-Modified-Since"] = entry.lastModified
+
+        response, body = self.with_retries(lambda url: self.request_once(url, None, headers), url)
+
+        if response.status == 304 and entry is not None:
+            self.cache.count("revalidated")
+            self.cache.refresh(url, entry, response.getheader("ETag", ""), response.getheader("Last-Modified", ""))
+            return entry.body
+
+        self.cache.count("misses")
+        self.cache.store(url, body, response.getheader("ETag", ""), response.getheader("Last-Modified", ""))
+
+        return body
+
+    def post(self, url, body, headers):
+        # POST body (a node JSON-RPC call) and return the response body
+
+        return self.with_retries(lambda url: self.get_once(url, body, headers), url)
+
+    def get_once(self, url, body = None, headers = None):
+
+        response, body = self.request_once(url, body, headers)
+
+        return body
+
+    def request_once(self, url, body = None, headers = None):
+        # one request, returns (response, body) with the response headers
+
+        key, conn, response, call = self.open(url, body, headers)
+        transferStart = time.perf_counter()
+
+        try:
+            body = response.read()
+
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise URLError(e)
+
+        self.finish(key, conn, response)
+        wireBytes = len(body)
+
+        if response.getheader("Content-Encoding", "") == "gzip":
+            body = gzip.decompress(body)
+
+        self.record(call, transferStart, wireBytes, len(body))
+
+        if response.status >= 400:
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+
+        return response, body
+
+    def stream(self, url):
+        # GET the url and return an iterator over the (decompressed) response
+        # body in chunks as they arrive, instead of buffering the whole body
+        # HTTP errors are raised (after retries) here, read errors while iterating
+
+        return self.with_retries(self.stream_once, url)
+
+    def stream_once(self, url, chunkSize = 16384):
+        # the transfer time of a streamed request includes the time spent
+        # decoding the chunks as they arrive
+
+        key, conn, response, call = self.open(url)
+        transferStart = time.perf_counter()
+
+        if response.status >= 400:
+            self.get_rest(key, conn, response)
+            self.record(call, transferStart, 0, 0)
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+
+        if response.getheader("Content-Encoding", "") == "gzip":
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            decompressor = None
+
+        def chunks():
+
+            wireBytes = 0
+            bodyBytes = 0
+
+            try:
+                while True:
+                    chunk = response.read1(chunkSize)
+
+                    if len(chunk) == 0:
+                        break
+
+                    wireBytes += len(chunk)
+
+                    if decompressor is None:
+                        bodyBytes += len(chunk)
+                        yield chunk
+                        continue
+
+                    # limit each decompressed chunk, a highly compressed
+                    # response could otherwise inflate a chunk many times
+
+                    part = decompressor.decompress(chunk, chunkSize)
+                    bodyBytes += len(part)
+                    yield part
+
+                    while len(decompressor.unconsumed_tail) > 0:
+                        part = decompressor.decompress(decompressor.unconsumed_tail, chunkSize)
+                        bodyBytes += len(part)
+                        yield part
+
+            except (OSError, http.client.HTTPException, zlib.error) as e:
+                raise URLError(e)
+
+            finally:
+                if response.isclosed() or response.length == 0:    # the whole body was read
+                    response.close()
+                    self.finish(key, conn, response)
+                    self.record(call, transferStart, wireBytes, bodyBytes, True)
+                else:                           # failed or not read to the end
+                    conn.close()
+
+        return chunks()
+
+    def get_rest(self, key, conn, response):
+        # read and discard an error body so the connection can be reused
+
+        try:
+            response.read()
+            self.finish(key, conn, response)
+
+        except (OSError, http.client.HTTPException):
+            conn.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Timings:
+    # instrumentation to find where a checkup spends its time
+    # records each API request (connect, time to first byte, transfer, bytes on
+    # the wire and decoded, parse) and the wall time of each phase of the run
+    # (configuration, /info, staker summaries, each staker and delegate, report)
+    # times are seconds from time.perf_counter(), relative to start when exported
+    # rpc is set for dataSource rpc, every request is a JSON-RPC call
+
+    def __init__(self, start, rpc = False):
+
+        self.start = start
+        self.rpc = rpc
+        self.lock = threading.Lock()            # the worker threads add their requests
+        self.calls = []                         # timing record of each request, in completion order
+        self.parseTimes = {}                    # url -> seconds decoding its responses
+        self.phases = []                        # (phase, item, start, seconds) in completion order
+
+    def add_call(self, call):
+
+        with self.lock:
+            self.calls.append(call)
+
+    def add_parse(self, url, seconds):
+
+        with self.lock:
+            self.parseTimes[url] = self.parseTimes.get(url, 0) + seconds
+
+    def add_phase(self, name, item, phaseStart, seconds):
+
+        with self.lock:
+            self.phases.append((name, item, phaseStart, seconds))
+
+    @contextmanager
+    def phase(self, name, item = ""):
+        # time the body of a with statement as a phase
+
+        phaseStart = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.add_phase(name, item, phaseStart, time.perf_counter() - phaseStart)
+
+    def print_report(self):
+        # summary tables of the phases and of the requests by endpoint
+
+        print("\nTiming report\n")
+        print("{:<20}{:>7}{:>11}{:>11}".format("Phase", "Count", "Total s", "Max s"))
+
+        totals = {}             # phase -> [count, total, max], in first seen order
+
+        for name, item, phaseStart, seconds in self.phases:
+            total = totals.setdefault(name, [0, 0, 0])
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+
+        for name, (count, total, longest) in totals.items():
+            print("{:<20}{:>7}{:>11.3f}{:>11.3f}".format(name, count, total, longest))
+
+        print("\n{:<20}{:>7}{:>11}{:>13}{:>12}{:>10}{:>11}{:>12}".format("Requests", "Count", "Connect s",
+              "First byte s", "Transfer s", "Parse s", "Wire KB", "Decoded KB"))
+
+        groups = {}             # endpoint -> [count, connect, firstByte, transfer, parse, wire, decoded]
+
+        for call in self.calls:
+            for key in (get_endpoint_kind(call["url"], self.rpc), "all"):
+                group = groups.setdefault(key, [0, 0, 0, 0, 0, 0, 0])
+                group[0] += 1
+                group[1] += call["connect"] or 0
+                group[2] += call["firstByte"]
+                group[3] += call["transfer"]
+                group[5] += call["wireBytes"]
+                group[6] += call["bytes"]
+
+        for url, seconds in self.parseTimes.items():
+            for key in (get_endpoint_kind(url, self.rpc), "all"):
+                groups.setdefault(key, [0, 0, 0, 0, 0, 0, 0])[4] += seconds
+
+        for key in sorted(groups, key = lambda key: key == "all"):
+            count, connect, firstByte, transfer, parse, wire, decoded = groups[key]
+            print("{:<20}{:>7}{:>11.3f}{:>13.3f}{:>12.3f}{:>10.3f}{:>11.1f}{:>12.1f}".format(key, count, connect,
+                  firstByte, transfer, parse, wire / 1024, decoded / 1024))
+
+        slowest = sorted(self.calls, key = lambda call: -((call["connect"] or 0) + call["firstByte"] + call["transfer"]))
+
+        if len(slowest) > 0:
+            print("\nSlowest requests (connect + first byte + transfer s, decoded KB)")
+
+        for call in slowest[0:5]:
+            print("  {:.3f} {:>9.1f} {}".format((call["connect"] or 0) + call["firstByte"] + call["transfer"],
+                  call["bytes"] / 1024, call["url"]))
+
+    def export(self, fileName, extra):
+        # write everything recorded as JSON, with the counters in extra
+
+        calls = []
+
+        for call in self.calls:
+            call = dict(call)
+            call["start"] -= self.start
+            call["parse"] = self.parseTimes.get(call["url"])
+            calls.append(call)
+
+        phases = [{"phase": name, "item": item, "start": phaseStart - self.start, "seconds": seconds}
+                  for name, item, phaseStart, seconds in self.phases]
+
+        results = dict(extra)
+        results["phases"] = phases
+        results["requests"] = calls
+
+        with open(fileName, "w") as f:
+            json.dump(results, f, indent = 1)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_endpoint_kind(url, rpc = False):
+    # info, address or utxo, to group the requests in the timing report, rpc
+    # for the calls to a node
+
+    if rpc == True:
+        return "rpc"
+
+    parts = urlsplit(url).path.rstrip("/").split("/")
+
+    if parts[-1] == "info":
+        return "/info"
+    elif parts[-1] == "utxo":
+        return "/address/utxo"
+
+    return "/address"
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def timed_phase(timings, name, item = ""):
+    # context manager timing a phase of the run in timings if it is a
+    # Timings, does nothing without timings
+
+    if timings is None:
+        return nullcontext()
+
+    return timings.phase(name, item)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def timed_parse(timings, url, function, *args):
+    # function(*args) decoding the response for url, timed if timings is a Timings
+
+    if timings is None:
+        return function(*args)
+
+    parseStart = time.perf_counter()
+    result = function(*args)
+    timings.add_parse(url, time.perf_counter() - parseStart)
+
+    return result
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class UTXOSet:
+    # the UTXOs of an address as two compact columns, values in satoshis
+    # (int64) and block heights (int32, unconfirmedHeight if unconfirmed), in
+    # response order, 12 bytes a UTXO, shared by the fetch, cache, classify and
+    # report code so a large staker is decoded once and kept cheaply
+
+    __slots__ = ("values", "heights")
+
+    def __init__(self, values = None, heights = None):
+
+        self.values = array("q") if values is None else values
+        self.heights = array("i") if heights is None else heights
+
+    def __len__(self):
+
+        return len(self.values)
+
+    def append(self, value, blockHeight):
+
+        self.values.append(value)
+        self.heights.append(blockHeight)
+
+    def extend(self, utxos):
+        # add the UTXOs of another UTXOSet, a page of the same address
+
+        self.values.extend(utxos.values)
+        self.heights.extend(utxos.heights)
+
+    def to_bytes(self):
+        # (values, heights) as bytes, for the cache
+
+        return self.values.tobytes(), self.heights.tobytes()
+
+    @classmethod
+    def from_bytes(cls, valueBytes, heightBytes):
+
+        utxos = cls()
+        utxos.values.frombytes(valueBytes)
+        utxos.heights.frombytes(heightBytes)
+
+        return utxos
+
+    def classify(self, matureUTXOHeight, minimumSatsValue):
+
+        return classify_utxos(self.values, self.heights, matureUTXOHeight, minimumSatsValue)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class MaturitySchedule:
+    # when the UTXOs of one or more addresses become stakeable, built at the
+    # checkup height from the UTXOSets already fetched and classified
+    # a UTXO big enough to stake is valid from its block height + UTXOMaturity,
+    # the ones valid now are counted, the immature ones are kept as a sorted
+    # index of maturity heights with prefix sums of their values, so the valid
+    # count and weight at any later height is a bisect, O(log n)
+    # unconfirmed UTXOs are left out, they mature UTXOMaturity blocks after
+    # the block they get into
+
+    __slots__ = ("height", "numValid", "sumValid", "pending", "maturityHeights", "sums")
+
+    def __init__(self, height):
+
+        self.height = int(height)
+        self.numValid = 0                       # valid at the checkup height
+        self.sumValid = 0
+        self.pending = []                       # (maturity height, value), until sort()
+        self.maturityHeights = array("i")       # of the immature UTXOs, sorted
+        self.sums = array("q", [0])             # sums[i] = sum of the first i immature values
+
+    def add(self, utxos, minimumSatsValue):
+        # add a UTXOSet, UTXOs smaller than minimumSatsValue never become valid
+
+        matureUTXOHeight = self.height - UTXOMaturity
+
+        for value, blockHeight in zip(utxos.values, utxos.heights):
+            if value < minimumSatsValue or blockHeight == unconfirmedHeight:
+                continue
+
+            if blockHeight <= matureUTXOHeight:
+                self.numValid += 1
+                self.sumValid += value
+            else:
+                self.pending.append((blockHeight + UTXOMaturity, value))
+
+    def feed(self, batches, minimumSatsValue):
+        # pass the UTXOSet batches through, adding each one, for a streamed
+        # fetch that is classified batch by batch
+
+        for utxos in batches:
+            self.add(utxos, minimumSatsValue)
+
+            yield utxos
+
+    def sort(self):
+        # build the maturity index once the UTXOs are added
+
+        self.pending.sort()
+        self.maturityHeights = array("i", [maturityHeight for maturityHeight, value in self.pending])
+        self.sums = array("q", accumulate([value for maturityHeight, value in self.pending], initial = 0))
+        self.pending = []
+
+    def weight_at(self, height):
+        # (count, sum) of the valid UTXOs at a height at or after the checkup height
+
+        if height < self.height:
+            raise ValueError("the schedule starts at height " + str(self.height))
+
+        i = bisect_right(self.maturityHeights, height)
+
+        return self.numValid + i, self.sumValid + self.sums[i]
+
+    def steps(self, endHeight):
+        # the heights up to endHeight where the weight grows
+
+        return sorted(set(self.maturityHeights[:bisect_right(self.maturityHeights, endHeight)]))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# a planned transaction, inputs is a list of (value, block height), outputs a
+# list of values, size in bytes, values and fee in satoshis
+
+PlanTransaction = namedtuple("PlanTransaction", ["inputs", "outputs", "size", "fee"])
+
+# the split and combine transactions planned for an address, and the small
+# UTXOs left out (too few to make a UTXO big enough to stake, or worth less
+# than the fee to spend them)
+
+UTXOPlan = namedtuple("UTXOPlan", ["splits", "combines", "leftover"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def transaction_fee(size):
+    # satoshis for a transaction of size bytes at planFeePerKB
+
+    return (size * planFeePerKB + 999) // 1000
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def plan_splits(utxos, minimumSatsValue, maxTxBytes):
+    # split each (value, block height) into as many UTXOs of at least
+    # minimumSatsValue as its value and the transaction size allow, returns
+    # (inputs, outputs, size, fee) groups for pack_transactions(), size and
+    # fee without the transaction overhead, each group can still pay it
+
+    maxOutputs = (maxTxBytes - txOverheadBytes - txInputBytes) // txOutputBytes
+    groups = []
+
+    for value, blockHeight in utxos:
+        count = min(value // minimumSatsValue, maxOutputs)
+
+        while count >= 2 and (value - transaction_fee(txOverheadBytes + txInputBytes + count * txOutputBytes)) // count \
+                < minimumSatsValue:
+            count -= 1
+
+        if count < 2:
+            continue
+
+        size = txInputBytes + count * txOutputBytes
+        fee = transaction_fee(size)
+        share = (value - fee) // count
+        outputs = [share] * count
+        outputs[0] += value - fee - share * count
+
+        groups.append(([(value, blockHeight)], outputs, size, fee))
+
+    return groups
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def plan_combines(utxos, minimumSatsValue, maxTxBytes):
+    # combine the (value, block height) UTXOs, all smaller than
+    # minimumSatsValue, into as many UTXOs of at least minimumSatsValue as
+    # possible, returns (groups, leftover), groups of (inputs, outputs, size,
+    # fee) for pack_transactions(), size and fee without the transaction
+    # overhead, and the UTXOs left out
+    # each group starts with the largest UTXO left and is filled with the
+    # smallest ones until it covers minimumSatsValue and its fee, so little
+    # value is wasted over the minimum and the dust is swept up first, the
+    # small UTXOs left at the end go into the last group
+    # a group at the transaction input limit swaps its smallest input for the
+    # largest UTXO left, the swapped out ones are left out, as are the UTXOs
+    # worth less than the fee to spend them
+
+    maxInputs = (maxTxBytes - txOverheadBytes - txOutputBytes) // txInputBytes
+    inputFee = transaction_fee(txInputBytes)
+
+    leftover = [utxo for utxo in utxos if utxo[0] <= inputFee]
+    values = sorted(utxo for utxo in utxos if utxo[0] > inputFee)
+
+    groups = []
+    low = 0
+    high = len(values) - 1
+
+    while low <= high:
+        inputs = [values[high]]
+        total = values[high][0]
+        high -= 1
+        first = 1                   # inputs[1:first] were swapped out
+
+        while low <= high and \
+                total - transaction_fee(txOverheadBytes + (len(inputs) - first + 1) * txInputBytes + txOutputBytes) \
+                < minimumSatsValue:
+            if len(inputs) - first + 1 < maxInputs:
+                utxo = values[low]
+                low += 1
+            else:
+                total -= inputs[first][0]
+                first += 1
+                utxo = values[high]
+                high -= 1
+
+            inputs.append(utxo)
+            total += utxo[0]
+
+        leftover.extend(inputs[1:first])
+        inputs = inputs[:1] + inputs[first:]
+
+        size = len(inputs) * txInputBytes + txOutputBytes
+        fee = transaction_fee(size)
+
+        if total - transaction_fee(txOverheadBytes + size) < minimumSatsValue:     # not enough left to make one more
+            if len(groups) > 0 and len(groups[-1][0]) + len(inputs) <= maxInputs:
+                lastInputs = groups[-1][0] + inputs
+                size = len(lastInputs) * txInputBytes + txOutputBytes
+                fee = transaction_fee(size)
+                groups[-1] = (lastInputs, [sum(value for value, blockHeight in lastInputs) - fee], size, fee)
+            else:
+                leftover.extend(inputs)
+
+            break
+
+        groups.append((inputs, [total - fee], size, fee))
+
+    leftover.extend(values[low:high + 1])
+
+    return groups, leftover
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def pack_transactions(groups, maxTxBytes):
+    # pack the (inputs, outputs, size, fee) groups into as few transactions of
+    # at most maxTxBytes as it can, best fit decreasing: the largest group
+    # first, each into the fullest transaction it fits, found by a bisect on
+    # the sorted room left, O(n log n), returns a list of PlanTransactions
+    # the fee is worked out once per transaction from its final size, with
+    # one overhead, and the difference from the group fees comes out of the
+    # outputs of its first (largest) group, which could pay the overhead alone
+
+    packed = []                 # the groups in each transaction
+    rooms = []                  # sorted (bytes left, transaction index)
+
+    for group in sorted(groups, key = lambda group: group[2], reverse = True):
+        size = group[2]
+        i = bisect_left(rooms, (size, -1))
+
+        if i < len(rooms):
+            room, index = rooms.pop(i)
+            packed[index].append(group)
+            insort(rooms, (room - size, index))
+        else:
+            packed.append([group])
+            insort(rooms, (maxTxBytes - txOverheadBytes - size, len(packed) - 1))
+
+    transactions = []
+
+    for transactionGroups in packed:
+        size = txOverheadBytes + sum(group[2] for group in transactionGroups)
+        fee = transaction_fee(size)
+
+        firstOutputs = transactionGroups[0][1]
+        total = sum(firstOutputs) + sum(group[3] for group in transactionGroups) - fee
+        share = total // len(firstOutputs)
+        outputs = [share] * len(firstOutputs)
+        outputs[0] += total - share * len(firstOutputs)
+
+        inputs = [utxo for group in transactionGroups for utxo in group[0]]
+        outputs.extend(value for group in transactionGroups[1:] for value in group[1])
+
+        transactions.append(PlanTransaction(inputs, outputs, size, fee))
+
+    return transactions
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class UTXOPlanner:
+    # plans the transactions for the UTXOs behind the split warnings, built at
+    # the checkup height from the UTXOSets as they are classified
+    # the mature UTXOs smaller than minimumSatsValue are combined into UTXOs
+    # big enough to stake, and with a splitSatsValue the mature UTXOs at
+    # least that big are split into UTXOs of at least minimumSatsValue, more
+    # UTXOs to stake for the same weight
+    # immature UTXOs are left alone, a stake can not be spent until it matures
+    # the transactions are at most maxTxBytes, with the standard input and
+    # output sizes and a fee of planFeePerKB
+
+    __slots__ = ("height", "minimumSatsValue", "splitSatsValue", "maxTxBytes", "small", "large")
+
+    def __init__(self, height, minimumSatsValue, splitSatsValue = 0, maxTxBytes = 100000):
+
+        self.height = int(height)
+        self.minimumSatsValue = minimumSatsValue
+        self.splitSatsValue = splitSatsValue    # 0 = no splits
+        self.maxTxBytes = maxTxBytes
+        self.small = []                         # (value, block height) to combine
+        self.large = []                         # (value, block height) to split
+
+    def add(self, utxos):
+
+        matureUTXOHeight = self.height - UTXOMaturity
+        mature = [(value, blockHeight) for value, blockHeight in zip(utxos.values, utxos.heights)
+                  if blockHeight <= matureUTXOHeight]
+
+        self.small.extend(utxo for utxo in mature if utxo[0] < self.minimumSatsValue)
+
+        if self.splitSatsValue > 0:
+            self.large.extend(utxo for utxo in mature if utxo[0] >= self.splitSatsValue)
+
+    def feed(self, batches):
+        # pass the UTXOSet batches through, adding each one
+
+        for utxos in batches:
+            self.add(utxos)
+
+            yield utxos
+
+    def plan(self):
+        # the UTXOPlan for the UTXOs added
+
+        groups, leftover = plan_combines(self.small, self.minimumSatsValue, self.maxTxBytes)
+
+        return UTXOPlan(pack_transactions(plan_splits(self.large, self.minimumSatsValue, self.maxTxBytes),
+                                          self.maxTxBytes),
+                        pack_transactions(groups, self.maxTxBytes), leftover)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# a point of the what-if grid, the delegates of a staker if it asked fee
+# (percent) and minUTXOSize (QTUM): the delegations staked (fee high
+# enough), the ones with a valid UTXO and their weight, the sum of the too
+# small UTXOs and the delegates with a recombine warning, sums in satoshis
+
+WhatIfPoint = namedtuple("WhatIfPoint", ["fee", "minUTXOSize", "stakedDelegations", "stakingDelegations",
+                                         "delegatesWeight", "sumTooSmall", "recombineWarnings"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class WhatIfSimulator:
+    # what the delegates of a staker would be at other staker fees and min
+    # UTXO sizes, from their delegations and UTXOSets loaded once, with the
+    # same rules as analyse_delegate_utxos()
+    # the delegations are grouped by fee, each group keeps its mature UTXO
+    # values and the largest mature UTXO of each delegate sorted, with prefix
+    # sums, so the weight and the staking delegates of a group at any min
+    # UTXO size are bisects, and the delegates staked at a fee are the groups
+    # from that fee up, a suffix sum over the groups
+    # the recombine warning is per delegate, each keeps its values sorted
+    # with prefix sums for the too small sum at any min UTXO size
+
+    __slots__ = ("height", "groups", "delegationCount")
+
+    def __init__(self, height):
+
+        self.height = int(height)
+        self.groups = {}                        # fee -> (mature values, largest mature values, [(values, sums)])
+        self.delegationCount = 0
+
+    def add(self, fee, utxos):
+        # a delegation at fee and the UTXOSet of its delegate
+
+        matureUTXOHeight = self.height - UTXOMaturity
+        mature = [value for value, blockHeight in zip(utxos.values, utxos.heights) if blockHeight <= matureUTXOHeight]
+        values = sorted(utxos.values)
+
+        matureValues, largest, delegates = self.groups.setdefault(fee, ([], [], []))
+        matureValues.extend(mature)
+        largest.append(max(mature, default = -1))      # -1, never valid
+        delegates.append((values, list(accumulate(values, initial = 0))))
+        self.delegationCount += 1
+
+    def group_totals(self, fee, minimumSatsValues):
+        # (weight, staking, tooSmall, recombine) lists of the fee group, one
+        # entry for each minimum UTXO value
+
+        matureValues, largest, delegates = self.groups[fee]
+        matureValues.sort()
+        largest.sort()
+        sums = list(accumulate(matureValues, initial = 0))
+
+        weight = [sums[-1] - sums[bisect_left(matureValues, minimum)] for minimum in minimumSatsValues]
+        staking = [len(largest) - bisect_left(largest, minimum) for minimum in minimumSatsValues]
+        tooSmall = [0] * len(minimumSatsValues)
+        recombine = [0] * len(minimumSatsValues)
+
+        for values, valueSums in delegates:
+            for i, minimum in enumerate(minimumSatsValues):
+                sumTooSmall = valueSums[bisect_left(values, minimum)]
+                tooSmall[i] += sumTooSmall
+
+                if sumTooSmall >= minimum:      # the too small UTXOs should be recombined
+                    recombine[i] += 1
+
+        return weight, staking, tooSmall, recombine
+
+    def sweep(self, fees, minUTXOSizes):
+        # a WhatIfPoint for each fee and min UTXO size (QTUM), by fee and then
+        # by min UTXO size, in the order given
+
+        minUTXOSizes = list(minUTXOSizes)
+        minimumSatsValues = [size * 100000000 for size in minUTXOSizes]
+        groupFees = sorted(self.groups)
+
+        # the totals of the groups from each fee up, highest fee first
+
+        zeros = [0] * len(minUTXOSizes)
+        staked = [0]
+        totals = [(zeros, zeros, zeros, zeros)]
+
+        for fee in reversed(groupFees):
+            staked.append(staked[-1] + len(self.groups[fee][1]))
+            totals.append(tuple([a + b for a, b in zip(total, groupTotal)]
+                                for total, groupTotal in zip(totals[-1], self.group_totals(fee, minimumSatsValues))))
+
+        points = []
+
+        for fee in fees:
+            groups = len(groupFees) - bisect_left(groupFees, fee)      # the groups staked at this fee
+            weight, staking, tooSmall, recombine = totals[groups]
+
+            for i, size in enumerate(minUTXOSizes):
+                points.append(WhatIfPoint(fee, size, staked[groups], staking[i], weight[i], tooSmall[i], recombine[i]))
+
+        return points
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Delegation:
+    # a delegation to a staker, from the staker summary
+
+    __slots__ = ("address", "fee")
+
+    def __init__(self, address, fee):
+
+        self.address = address                  # delegate address
+        self.fee = fee                          # percent
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def get_delegations(summary):
+    # the delegations in a staker summary, in delegation order
+
+    return [Delegation(delegation["delegator"], delegation["fee"]) for delegation in summary.get("delegations", [])]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class UTXOCache:
+    # on-disk SQLite cache of the UTXO set of each address, stored as the
+    # compact value and height columns along with the block height they were
+    # fetched at and the balance and transaction count from /address/<addr>
+    # a cached set is reused while the balance and transaction count are
+    # unchanged, when the cache is over maxAddresses the addresses not used in
+    # this run (no longer delegates) are evicted, least recently used first
+
+    def __init__(self, fileName, maxAddresses):
+
+        self.db = sqlite3.connect(fileName, check_same_thread = False)
+        self.lock = threading.Lock()            # the worker threads share the connection
+        self.maxAddresses = maxAddresses
+        self.runTime = time.time()              # lastUsed for every address used in this run
+        self.hits = 0
+        self.misses = 0
+
+        with self.lock:
+            self.db.execute("CREATE TABLE IF NOT EXISTS utxos (address TEXT PRIMARY KEY, height INTEGER, "
+                            "balance TEXT, transactionCount INTEGER, lastUsed REAL, utxoValues BLOB, utxoHeights BLOB)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS utxosLastUsed ON utxos (lastUsed)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS delegationSets (stakerAddress TEXT PRIMARY KEY, height INTEGER, "
+                            "recheckHeight INTEGER, delegations TEXT)")
+
+    def get(self, address, summary = None):
+        # returns the UTXOSet if the cached UTXOs are still current, or None
+        # without a summary any cached UTXOs for the address are returned
+
+        with self.lock:
+            row = self.db.execute("SELECT balance, transactionCount, utxoValues, utxoHeights FROM utxos WHERE address = ?",
+                                  (address,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            if summary is not None and (row[0] != str(summary.get("balance")) or row[1] != summary.get("transactionCount")):
+                self.misses += 1
+                return None
+
+            self.db.execute("UPDATE utxos SET lastUsed = ? WHERE address = ?", (self.runTime, address))
+            self.hits += 1
+
+        return UTXOSet.from_bytes(row[2], row[3])
+
+    def is_current(self, address, summary = None):
+        # True if get() would return the cached UTXOs, without counting a hit
+
+        with self.lock:
+            row = self.db.execute("SELECT balance, transactionCount FROM utxos WHERE address = ?", (address,)).fetchone()
+
+        if row is None:
+            return False
+
+        return summary is None or (row[0] == str(summary.get("balance")) and row[1] == summary.get("transactionCount"))
+
+    def put(self, address, height, summary, utxos):
+
+        valueBytes, heightBytes = utxos.to_bytes()
+
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO utxos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (address, int(height), str(summary.get("balance")), summary.get("transactionCount"),
+                             self.runTime, valueBytes, heightBytes))
+
+    def get_delegation_set(self, stakerAddress):
+        # the delegations saved for a staker by put_delegation_set(), returns
+        # (delegations, height, recheckHeight), delegations is a dict of
+        # delegate address -> fee, or (None, None, None) if none were saved
+
+        with self.lock:
+            row = self.db.execute("SELECT delegations, height, recheckHeight FROM delegationSets WHERE stakerAddress = ?",
+                                  (stakerAddress,)).fetchone()
+
+        if row is None:
+            return None, None, None
+
+        return json.loads(row[0]), row[1], row[2]
+
+    def put_delegation_set(self, stakerAddress, delegations, height, recheckHeight):
+        # save the delegations of a staker at this height, recheckHeight is the
+        # last height every delegate was checked for changes
+
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO delegationSets VALUES (?, ?, ?, ?)",
+                            (stakerAddress, int(height), int(recheckHeight), json.dumps(delegations)))
+
+    def close(self):
+        # evict down to maxAddresses, save and close
+
+        with self.lock:
+            count = self.db.execute("SELECT COUNT(*) FROM utxos").fetchone()[0]
+
+            if count > self.maxAddresses:
+                self.db.execute("DELETE FROM utxos WHERE address IN (SELECT address FROM utxos WHERE lastUsed < ? "
+                                "ORDER BY lastUsed LIMIT ?)", (self.runTime, count - self.maxAddresses))
+
+            self.db.commit()
+            self.db.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class HistoryStore:
+    # SQLite time series of the checkup results, keyed by block height
+    # each address is stored once in addresses and referred to by its id, a
+    # sample is the UTXO totals of a staker or delegate address at a checked
+    # height, a summary is the staker summary at a checked height
+    # both are WITHOUT ROWID tables clustered on their key, address first and
+    # then height, so the history of one address over a range of heights is a
+    # single range scan of the table, milliseconds for years of blocks
+    # a run is committed when it is finished, a run that stopped leaves nothing
+
+    def __init__(self, fileName):
+
+        self.db = sqlite3.connect(fileName)
+        self.ids = {}                           # address -> id
+
+        self.db.execute("CREATE TABLE IF NOT EXISTS addresses (id INTEGER PRIMARY KEY, address TEXT UNIQUE NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS samples (addressId INTEGER, height INTEGER, stakerId INTEGER, "
+                        "fee INTEGER, status TEXT, numValid INTEGER, sumValid INTEGER, numImmature INTEGER, "
+                        "sumImmature INTEGER, numTooSmall INTEGER, sumTooSmall INTEGER, numTotal INTEGER, "
+                        "sumTotal INTEGER, PRIMARY KEY (addressId, height, stakerId)) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS summaries (stakerId INTEGER, height INTEGER, time REAL, "
+                        "delegationCount INTEGER, stakerValidUTXOs INTEGER, stakingDelegations INTEGER, "
+                        "delegatesWeight INTEGER, PRIMARY KEY (stakerId, height)) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS network (height INTEGER PRIMARY KEY, netStakeWeight INTEGER)")
+
+    def address_id(self, address, add = True):
+        # the id of an address, a new one if add is True, otherwise None if
+        # the address is not in the history
+
+        if address not in self.ids:
+            row = self.db.execute("SELECT id FROM addresses WHERE address = ?", (address,)).fetchone()
+
+            if row is None and add == False:
+                return None
+
+            if row is None:
+                self.ids[address] = self.db.execute("INSERT INTO addresses (address) VALUES (?)", (address,)).lastrowid
+            else:
+                self.ids[address] = row[0]
+
+        return self.ids[address]
+
+    def add_sample(self, height, stakerAddress, address, fee, status, totals):
+
+        self.db.execute("INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (self.address_id(address), int(height), self.address_id(stakerAddress), fee, status,
+                         totals.numValid, totals.sumValid, totals.numImmature, totals.sumImmature,
+                         totals.numTooSmall, totals.sumTooSmall, totals.numTotal, totals.sumTotal))
+
+    def add_summary(self, height, summary):
+
+        self.db.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (self.address_id(summary.address), int(height), time.time(), summary.delegationCount,
+                         summary.stakerValidUTXOs, summary.stakingDelegations, summary.delegatesWeight))
+
+    def add_network(self, height, netStakeWeight):
+
+        self.db.execute("INSERT OR REPLACE INTO network VALUES (?, ?)", (int(height), netStakeWeight))
+
+    def commit(self):
+
+        self.db.commit()
+
+    def close(self):
+
+        self.db.close()
+
+    def stakers(self):
+        # (stakerAddress, first height, last height, runs) for each staker in the history
+
+        return self.db.execute("SELECT address, MIN(height), MAX(height), COUNT(*) FROM summaries "
+                               "JOIN addresses ON addresses.id = stakerId GROUP BY stakerId ORDER BY address").fetchall()
+
+    def last_height(self):
+        # the highest recorded height, 0 if there is none
+
+        row = self.db.execute("SELECT MAX(height) FROM summaries").fetchone()
+
+        return row[0] or 0
+
+    def address_history(self, address, fromHeight, toHeight):
+        # the samples for an address from fromHeight to toHeight, oldest first,
+        # as (height, stakerAddress, fee, status, numValid, sumValid,
+        # numImmature, sumImmature, numTooSmall, sumTooSmall, numTotal, sumTotal)
+
+        addressId = self.address_id(address, False)
+
+        if addressId is None:
+            return []
+
+        return self.db.execute("SELECT height, addresses.address, fee, status, numValid, sumValid, numImmature, "
+                               "sumImmature, numTooSmall, sumTooSmall, numTotal, sumTotal FROM samples "
+                               "JOIN addresses ON addresses.id = stakerId WHERE addressId = ? AND height BETWEEN ? AND ? "
+                               "ORDER BY height", (addressId, fromHeight, toHeight)).fetchall()
+
+    def staker_history(self, stakerAddress, fromHeight, toHeight):
+        # the staker trend from fromHeight to toHeight, oldest first, as (height,
+        # sumValid, sumImmature, percentStaked, delegatesWeight, stakingDelegations)
+        # percentStaked is the Percent Stake to Total of the report, None if
+        # the staker had no valid UTXOs
+
+        stakerId = self.address_id(stakerAddress, False)
+
+        if stakerId is None:
+            return []
+
+        rows = self.db.execute("SELECT summaries.height, sumValid, sumImmature, delegatesWeight, stakingDelegations "
+                               "FROM summaries JOIN samples ON samples.addressId = summaries.stakerId AND "
+                               "samples.height = summaries.height AND samples.stakerId = summaries.stakerId "
+                               "WHERE summaries.stakerId = ? AND summaries.height BETWEEN ? AND ? "
+                               "ORDER BY summaries.height", (stakerId, fromHeight, toHeight)).fetchall()
+
+        trend = []
+
+        for height, sumValid, sumImmature, delegatesWeight, stakingDelegations in rows:
+            percentStaked = None
+
+            if sumValid + sumImmature > 0:
+                percentStaked = 100 * sumImmature / (sumImmature + sumValid)
+
+            trend.append((height, sumValid, sumImmature, percentStaked, delegatesWeight, stakingDelegations))
+
+        return trend
+
+    def share_table(self, fromHeight, toHeight, bucketBlocks, stakerAddress = ''):
+        # the expected blocks table of every staker (or one) from fromHeight to
+        # toHeight, in buckets of bucketBlocks, at the heights recorded with
+        # the network stake weight (networkShare), oldest first, as
+        # (stakerAddress, bucket height, samples, weight, netStakeWeight,
+        # share, expectedBlocks, standardDeviation, expectedReward), the
+        # weights and share are the bucket averages and the rest is per day
+        # the averages are one GROUP BY in SQLite over the range scan of the
+        # history, so years of history for many stakers take seconds, only a
+        # row per staker and bucket comes back to Python
+
+        query = "SELECT address, bucket, COUNT(*), AVG(weight), AVG(netStakeWeight), AVG(share), " \
+                "AVG(share * (1 - share)) FROM (SELECT summaries.stakerId AS stakerId, " \
+                "summaries.height / ? * ? AS bucket, sumValid + delegatesWeight AS weight, netStakeWeight, " \
+                "MIN(1.0, CAST(sumValid + delegatesWeight AS REAL) / netStakeWeight) AS share FROM summaries " \
+                "JOIN samples ON samples.addressId = summaries.stakerId AND samples.height = summaries.height AND " \
+                "samples.stakerId = summaries.stakerId JOIN network ON network.height = summaries.height " \
+                "WHERE summaries.height BETWEEN ? AND ? AND netStakeWeight > 0"
+        parameters = [bucketBlocks, bucketBlocks, fromHeight, toHeight]
+
+        if len(stakerAddress) > 0:
+            stakerId = self.address_id(stakerAddress, False)
+
+            if stakerId is None:
+                return []
+
+            query += " AND summaries.stakerId = ?"
+            parameters.append(stakerId)
+
+        query += ") JOIN addresses ON addresses.id = stakerId GROUP BY stakerId, bucket ORDER BY address, bucket"
+
+        table = []
+
+        for address, bucket, samples, weight, netStakeWeight, share, shareVariance in self.db.execute(query, parameters):
+            blocks = blocks_per_day(bucket)
+            table.append((address, bucket, samples, weight, netStakeWeight, share, blocks * share,
+                          math.sqrt(blocks * shareVariance), blocks * share * block_reward(bucket)))
+
+        return table
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def report_url_error(url, error):
+    # a request failed after all its retries, carrying on would print wrong
+    # (zero) totals, so stop the checkup, nothing is printed here, the
+    # program prints the CheckupError, with the reason
+
+    raise CheckupError("request failed for " + url + ", " + str(getattr(error, "reason", error))) from error
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def decode_json(result, default):
+    # decode an API response, an empty response (failed request) gives the
+    # default, a response that can not be decoded stops the checkup
+
+    if len(result) == 0:
+        return default
+
+    try:
+        return json.loads(result)
+    except ValueError:
+        raise CheckupError("could not decode the API response " + repr(result[:60]))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def parse_utxos(result):
+    # decode a /address/<addr>/utxo response in one pass into a UTXOSet, two
+    # compact columns, UTXO values in satoshis and UTXO block heights, in response order
+    # an unconfirmed UTXO has no block height, give it one that is never mature
+
+    utxos = decode_json(result, [])
+
+    values = array("q", [int(utxo["value"]) for utxo in utxos])
+    heights = array("i", [unconfirmedHeight if blockHeight is None or blockHeight > unconfirmedHeight else blockHeight
+                          for blockHeight in [utxo["blockHeight"] for utxo in utxos]])
+
+    return UTXOSet(values, heights)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def iter_utxo_stream(chunks):
+    # incremental decoder for a /address/<addr>/utxo response arriving in chunks
+    # yields (value, blockHeight) for each UTXO as soon as its closing brace has
+    # arrived, so memory is bounded by one read chunk plus one UTXO record
+    # instead of by the size of the response
+
+    decoder = json.JSONDecoder()
+    textDecoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    dataIndex = 0
+    foundArray = False      # found the opening [
+    foundEnd = False        # found the closing ]
+
+    for chunk in chunks:
+
+        if foundEnd == True:    # read to the end of the response so the connection can be reused
+            continue
+
+        buffer = buffer[dataIndex:] + textDecoder.decode(chunk)
+        dataIndex = 0
+
+        while True:
+
+            while dataIndex < len(buffer) and buffer[dataIndex] in " \t\r\n,":
+                dataIndex += 1
+
+            if dataIndex >= len(buffer):        # need more data
+                break
+
+            if foundArray == False:
+                if buffer[dataIndex] != "[":
+                    raise ValueError("UTXO response is not a JSON array")
+
+                foundArray = True
+                dataIndex += 1
+                continue
+
+            if buffer[dataIndex] == "]":        # end of the UTXOs
+                foundEnd = True
+                break
+
+            try:
+                utxo, dataIndex = decoder.raw_decode(buffer, dataIndex)
+            except ValueError:                  # incomplete UTXO record, need more data
+                break
+
+            blockHeight = utxo["blockHeight"]
+
+            if blockHeight is None or blockHeight > unconfirmedHeight:
+                blockHeight = unconfirmedHeight
+
+            yield int(utxo["value"]), blockHeight
+
+    if foundArray == True and foundEnd == False:
+        raise ValueError("UTXO response ended before the closing ]")
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class QtumInfoSource:
+    # the qtum.info REST API at endpoint, the /api/ URL for the chain, the
+    # default dataSource
+    # a data source gives the block height, the /address/<addr> style summary
+    # (balance, transactionCount and, for a staker, delegations) and the UTXOSet
+    # of an address, returning (result, URLError or None) so a fetch in
+    # a worker thread can be reported later
+    # the requests go through client, an APIClient, a data source keeps no
+    # module state so several can run at once
+    # with a pageSize the UTXOs of an address are fetched in pages of pageSize
+    # UTXOs, pageFetches at a time, see iter_utxo_pages()
+
+    def __init__(self, client, endpoint, streamUTXOs = False, timings = None, pageSize = 0, pageFetches = 4):
+
+        self.client = client
+        self.endpoint = endpoint
+        self.streamUTXOs = streamUTXOs          # decode the UTXO responses as they arrive
+        self.timings = timings
+        self.pageSize = pageSize                # UTXOs per /utxo request, 0 = one request for all
+        self.pageFetches = max(1, pageFetches)  # concurrent page requests for one address
+        self.info = None                        # the last /info response
+
+    def fetch(self, url):
+        # open the url and read the response
+        # returns (result, error) instead of printing the error, so a fetch running
+        # in a worker thread can be reported later in delegation order
+
+        result = ""
+        error = None
+
+        try:
+            result = self.client.get(url)
+
+        except URLError as e:
+            error = e
+
+        return result, error
+
+    def get_block_height(self):
+        # the current block height from /info as a string, '' if the request failed
+
+        url = self.info_url()
+        result, error = self.fetch(url)
+
+        info = timed_parse(self.timings, url, decode_json, result, {})
+
+        height = ""
+
+        if "height" in info:
+            height = str(info["height"])
+            self.info = info
+
+        # note, leave height as string
+
+        return height, error
+
+    def get_network_weight(self):
+        # the network stake weight (satoshis) from the last /info, fetched if
+        # there is none, returns (weight, error), weight None if it is missing
+
+        info = self.info
+        error = None
+
+        if info is None:
+            url = self.info_url()
+            result, error = self.fetch(url)
+            info = timed_parse(self.timings, url, decode_json, result, {})
+
+        return info.get("netStakeWeight"), error
+
+    def get_staker_summary(self, address):
+
+        return self.get_summary(address)
+
+    def get_summary(self, address):
+
+        url = self.summary_url(address)
+        result, error = self.fetch(url)
+
+        return timed_parse(self.timings, url, decode_json, result, {}), error
+
+    def get_utxos(self, address):
+        # in streaming mode the response is decoded into the UTXOSet as it arrives
+
+        url = self.utxo_url(address)
+
+        if self.pageSize > 0:
+            utxos = UTXOSet()
+
+            for page, error in self.iter_utxo_pages(address):
+                if error is not None:
+                    return utxos, error
+
+                utxos.extend(page)
+
+            return utxos, None
+
+        if self.streamUTXOs == False:
+            result, error = self.fetch(url)
+
+            return timed_parse(self.timings, url, parse_utxos, result), error
+
+        def read_stream(url):
+            # one streamed request, a failed one, even part way through the
+            # body, is retried by the client and starts over
+
+            utxos = UTXOSet()
+
+            for value, blockHeight in iter_utxo_stream(self.client.stream_once(url)):
+                utxos.append(value, blockHeight)
+
+            return utxos
+
+        try:
+            return self.client.with_retries(read_stream, url), None
+
+        except URLError as e:
+            return UTXOSet(), e
+
+    def get_utxo_batches(self, address):
+        # serial fetch, the UTXOSet batches for classify_utxo_batches(), any
+        # error is printed and stops the checkup
+
+        url = self.utxo_url(address)
+
+        if self.pageSize > 0:               # classify each page as it arrives
+            return self.page_utxo_batches(address)
+
+        if self.streamUTXOs == True:        # decode and classify the UTXOs as they arrive
+            return self.stream_utxo_batches(url)
+
+        result, error = self.fetch(url)
+
+        if error is not None:
+            report_url_error(url, error)
+
+        return [timed_parse(self.timings, url, parse_utxos, result)]
+
+    def stream_utxo_batches(self, url):
+        # serial streaming fetch of the UTXOs for url, returns an iterator of
+        # UTXOSet batches of up to utxoBatchSize UTXOs, read from
+        # the socket as it is consumed, so memory stays bounded by one batch
+        # any error is printed and stops the checkup
+
+        try:
+            chunks = self.client.stream(url)
+
+        except URLError as e:
+            report_url_error(url, e)
+            return iter(())
+
+        def batches():
+
+            utxos = UTXOSet()
+
+            try:
+                for value, blockHeight in iter_utxo_stream(chunks):
+                    utxos.append(value, blockHeight)
+
+                    if len(utxos) >= utxoBatchSize:
+                        yield utxos
+
+                        utxos = UTXOSet()
+
+            except URLError as e:
+                report_url_error(url, e)
+
+            yield utxos
+
+        return batches()
+
+    def get_utxo_page(self, address, offset):
+        # one page of the UTXOs of an address, returns (UTXOSet, first
+        # UTXO record or None, error)
+        # the whole record, not its transaction id, the outputs of a split
+        # transaction can start several pages with the same transaction id
+
+        url = self.page_url(address, offset)
+        result, error = self.fetch(url)
+        firstUTXO = None
+
+        if len(result) > 0:
+            match = utxoRecordPattern.search(result)
+
+            if match is not None:
+                firstUTXO = match.group(0)
+
+        return timed_parse(self.timings, url, parse_utxos, result), firstUTXO, error
+
+    def iter_utxo_pages(self, address):
+        # the UTXOs of an address in pages of pageSize, yields (UTXOSet, error)
+        # for each page as it arrives, not in offset order
+        # the first page is fetched alone, so a small address is one request,
+        # then pageFetches pages are kept in flight until a page comes back
+        # short, the pages past the end are empty, memory stays bounded by the
+        # pages in flight
+        # a first page longer than pageSize means the endpoint does not page,
+        # it has all the UTXOs, and a page starting with the same UTXO as one
+        # already read means it ignores the offset, the page is dropped
+        # and the paging stops, as it does after maxUTXOPages full pages
+
+        utxos, firstUTXO, error = self.get_utxo_page(address, 0)
+        yield utxos, error
+
+        if error is not None or len(utxos) != self.pageSize:
+            return
+
+        firstUTXOs = {firstUTXO}            # the first UTXO record of each page read
+
+        with ThreadPoolExecutor(max_workers = self.pageFetches) as pagePool:
+            offset = self.pageSize
+            pending = set()
+            foundEnd = False
+
+            while True:
+                while foundEnd == False and len(pending) < self.pageFetches and \
+                        offset < maxUTXOPages * self.pageSize:
+                    pending.add(pagePool.submit(self.get_utxo_page, address, offset))
+                    offset += self.pageSize
+
+                if len(pending) == 0:
+                    if foundEnd == False:       # still full pages at maxUTXOPages
+                        yield UTXOSet(), URLError("more than " + str(maxUTXOPages) + " pages of UTXOs")
+
+                    break
+
+                done, pending = wait(pending, return_when = FIRST_COMPLETED)
+
+                for future in done:
+                    utxos, firstUTXO, error = future.result()
+
+                    if firstUTXO is not None and firstUTXO in firstUTXOs:     # the offset was ignored
+                        foundEnd = True
+                        continue
+
+                    firstUTXOs.add(firstUTXO)
+
+                    if error is not None or len(utxos) < self.pageSize:
+                        foundEnd = True
+
+                    yield utxos, error
+
+    def page_utxo_batches(self, address):
+        # serial paged fetch, each page is a batch for classify_utxo_batches()
+        # as it arrives, any error is printed and stops the checkup
+
+        for utxos, error in self.iter_utxo_pages(address):
+            if error is not None:
+                report_url_error(self.utxo_url(address), error)
+
+            yield utxos
+
+    def prefetch(self, addresses, summaries, utxoCache = None, checkForChanges = True):
+        # nothing to do, the worker threads fetch ahead
+
+        return
+
+    def info_url(self):
+
+        return self.endpoint + "info"
+
+    def summary_url(self, address):
+
+        return self.endpoint + "address/" + address
+
+    def utxo_url(self, address):
+
+        return self.endpoint + "address/" + address + "/utxo"
+
+    def page_url(self, address, offset):
+
+        return self.utxo_url(address) + "?limit=" + str(self.pageSize) + "&offset=" + str(offset)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class RPCSource:
+    # a local qtumd node over JSON-RPC, the node needs -addressindex for
+    # getaddressutxos and getaddressbalance
+    # prefetch() gets the summaries and UTXOs of all the addresses of a run in
+    # JSON-RPC batch calls of up to batchSize requests each, so the delegate
+    # sweep is a few local round trips instead of two requests per delegate
+    # the node has no transaction count for an address, the summary uses the
+    # total received instead, it also changes whenever the UTXOs change
+
+    def __init__(self, client, url, user, password, batchSize, timings = None):
+
+        self.client = client                    # APIClient
+        self.url = url
+        self.timings = timings
+        self.headers = {"Content-Type": "application/json"}
+        self.batchSize = batchSize
+        self.lock = threading.Lock()
+        self.summaries = {}                     # address -> summary, from prefetch()
+        self.utxos = {}                         # address -> UTXOSet, from prefetch()
+
+        if len(user) > 0:
+            self.headers["Authorization"] = "Basic " + base64.b64encode((user + ":" + password).encode()).decode()
+
+    def call(self, calls):
+        # run a list of (method, params) calls in batches, returns a list of
+        # (result, error) in the same order, raises URLError if the node could
+        # not be reached
+
+        results = []
+
+        for i in range(0, len(calls), self.batchSize):
+            batch = [{"jsonrpc": "1.0", "id": j, "method": method, "params": params}
+                     for j, (method, params) in enumerate(calls[i:i + self.batchSize])]
+
+            body = self.client.post(self.url, json.dumps(batch).encode(), self.headers)
+            responses = {}
+
+            for response in timed_parse(self.timings, self.url, decode_json, body, []):
+                responses[response.get("id")] = response
+
+            for j in range(len(batch)):
+                response = responses.get(j)
+
+                if response is None:
+                    results.append((None, URLError("no response to " + batch[j]["method"])))
+                elif response.get("error") is not None:
+                    results.append((None, URLError(batch[j]["method"] + " error " + str(response["error"].get("code")) +
+                                                   " " + str(response["error"].get("message")))))
+                else:
+                    results.append((response.get("result"), None))
+
+        return results
+
+    def call_each(self, calls):
+        # call() with a node that can not be reached reported as an error for each call
+
+        try:
+            return self.call(calls)
+
+        except URLError as e:
+            return [(None, e)] * len(calls)
+
+    def get_block_height(self):
+
+        try:
+            [(result, error)] = self.call([("getblockcount", [])])
+
+        except URLError as e:
+            return '', e
+
+        if error is not None:
+            return '', error
+
+        return str(result), None
+
+    def get_network_weight(self):
+        # the network stake weight (satoshis) from getstakinginfo
+
+        try:
+            [(result, error)] = self.call([("getstakinginfo", [])])
+
+        except URLError as e:
+            return None, e
+
+        if error is not None:
+            return None, error
+
+        return result.get("netstakeweight"), None
+
+    def make_summary(self, balance, delegations = None):
+        # an /address/<addr> style summary from getaddressbalance and getdelegationsforstaker
+
+        summary = {"balance": str(balance["balance"]), "transactionCount": balance["received"]}
+
+        if delegations is not None:
+            summary["delegations"] = [{"delegator": delegation["delegate"], "fee": delegation["fee"]}
+                                      for delegation in delegations]
+
+        return summary
+
+    def make_utxo_set(self, utxos):
+        # getaddressutxos results to a UTXOSet
+
+        values = array("q", [utxo["satoshis"] for utxo in utxos])
+        heights = array("i", [unconfirmedHeight if utxo["height"] <= 0 or utxo["height"] > unconfirmedHeight
+                              else utxo["height"] for utxo in utxos])
+
+        return UTXOSet(values, heights)
+
+    def get_staker_summary(self, address):
+
+        [(balance, error), (delegations, delegationsError)] = self.call_each([
+            ("getaddressbalance", [{"addresses": [address]}]), ("getdelegationsforstaker", [address])])
+
+        if error is None:
+            error = delegationsError
+
+        if error is not None:
+            return {}, error
+
+        return self.make_summary(balance, delegations), None
+
+    def get_summary(self, address):
+
+        with self.lock:
+            if address in self.summaries:
+                return self.summaries.pop(address), None
+
+        [(balance, error)] = self.call_each([("getaddressbalance", [{"addresses": [address]}])])
+
+        if error is not None:
+            return {}, error
+
+        return self.make_summary(balance), None
+
+    def get_utxos(self, address):
+
+        with self.lock:
+            if address in self.utxos:
+                return self.utxos.pop(address), None
+
+        [(utxos, error)] = self.call_each([("getaddressutxos", [{"addresses": [address]}])])
+
+        if error is not None:
+            return UTXOSet(), error
+
+        return self.make_utxo_set(utxos), None
+
+    def get_utxo_batches(self, address):
+
+        utxos, error = self.get_utxos(address)
+
+        if error is not None:
+            report_url_error(self.utxo_url(address), error)
+
+        return [utxos]
+
+    def prefetch(self, addresses, summaries, utxoCache = None, checkForChanges = True):
+        # batch fetch the UTXOs of the addresses for this run, with the utxoCache
+        # only those that changed, summaries has the staker summaries already
+        # fetched, the other summaries are batch fetched first
+        # a failed call is left for get_summary() or get_utxos() to report
+
+        with self.lock:
+            self.summaries = {}
+            self.utxos = {}
+
+        if utxoCache is not None and checkForChanges == False:     # watch mode between rechecks
+            addresses = [address for address in addresses if utxoCache.is_current(address) == False]
+
+        elif utxoCache is not None:
+            summaries = dict(summaries)
+            missing = [address for address in addresses if address not in summaries]
+            fetched = self.call_each([("getaddressbalance", [{"addresses": [address]}]) for address in missing])
+
+            for address, (balance, error) in zip(missing, fetched):
+                if error is None:
+                    summaries[address] = self.make_summary(balance)
+
+                    with self.lock:
+                        self.summaries[address] = summaries[address]
+
+            addresses = [address for address in addresses
+                         if address not in summaries or utxoCache.is_current(address, summaries[address]) == False]
+
+        fetched = self.call_each([("getaddressutxos", [{"addresses": [address]}]) for address in addresses])
+
+        with self.lock:
+            for address, (utxos, error) in zip(addresses, fetched):
+                if error is None:
+                    self.utxos[address] = self.make_utxo_set(utxos)
+
+    def info_url(self):
+
+        return self.url + " getblockcount"
+
+    def summary_url(self, address):
+
+        return self.url + " getaddressbalance " + address
+
+    def utxo_url(self, address):
+
+        return self.url + " getaddressutxos " + address
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def diff_delegations(previous, delegations):
+    # compare two delegation sets, dicts of delegate address -> fee, returns
+    # (added, removed, feeChanged), added and removed are lists of
+    # (address, fee), feeChanged is a list of (address, previous fee, fee)
+
+    added = [(address, fee) for address, fee in delegations.items() if address not in previous]
+    removed = [(address, fee) for address, fee in previous.items() if address not in delegations]
+    feeChanged = [(address, previous[address], fee) for address, fee in delegations.items()
+                  if address in previous and previous[address] != fee]
+
+    return added, removed, feeChanged
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# counts and sums (satoshis) for the UTXOs of an address, from classify_utxos()
+# maxValue is the largest UTXO, for the staker split check
+
+UTXOTotals = namedtuple("UTXOTotals", ["numTotal", "sumTotal", "numValid", "sumValid", "numImmature", "sumImmature",
+                                       "numTooSmall", "sumTooSmall", "maxValue"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def classify_utxos(values, heights, matureUTXOHeight, minimumSatsValue):
+    # the UTXO classification engine shared by the staker, the delegates and
+    # any batch tools, values (satoshis) and heights are parallel columns,
+    # array.array or lists, the counts, sums and max all come from one pass
+    #
+    #   valid: mature (blockHeight <= matureUTXOHeight) and >= minimumSatsValue
+    #   too small: < minimumSatsValue, mature or immature
+    #   immature: big enough but not mature yet
+
+    numValid = 0
+    sumValid = 0
+    numTooSmall = 0
+    sumTooSmall = 0
+    sumTotal = 0
+    maxValue = 0
+
+    for value, blockHeight in zip(values, heights):
+        sumTotal += value
+
+        if value > maxValue:
+            maxValue = value
+
+        if value < minimumSatsValue:
+            numTooSmall += 1
+            sumTooSmall += value
+        elif blockHeight <= matureUTXOHeight:
+            numValid += 1
+            sumValid += value
+
+    numTotal = len(values)
+
+    return UTXOTotals(numTotal, sumTotal, numValid, sumValid,
+                      numTotal - numValid - numTooSmall, sumTotal - sumValid - sumTooSmall,
+                      numTooSmall, sumTooSmall, maxValue)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def add_utxo_totals(a, b):
+    # combine the totals for two batches of UTXOs
+
+    return UTXOTotals(a.numTotal + b.numTotal, a.sumTotal + b.sumTotal, a.numValid + b.numValid, a.sumValid + b.sumValid,
+                      a.numImmature + b.numImmature, a.sumImmature + b.sumImmature,
+                      a.numTooSmall + b.numTooSmall, a.sumTooSmall + b.sumTooSmall, max(a.maxValue, b.maxValue))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def classify_shared(name, count, pieces):
+    # classify the pieces of the count UTXOs in the shared memory block name,
+    # values (int64) then heights (int32), run in a ClassifyPool process
+    # pieces are (start, end, matureUTXOHeight, minimumSatsValue), returns
+    # the UTXOTotals of each piece, the columns are read in place, nothing
+    # is copied
+
+    block = shared_memory.SharedMemory(name = name)
+    totals = []
+
+    try:
+        for start, end, matureUTXOHeight, minimumSatsValue in pieces:
+            with block.buf[start * 8:end * 8] as valueBytes, valueBytes.cast("q") as values, \
+                 block.buf[count * 8 + start * 4:count * 8 + end * 4] as heightBytes, heightBytes.cast("i") as heights:
+                totals.append(classify_utxos(values, heights, matureUTXOHeight, minimumSatsValue))
+
+    finally:
+        block.close()
+
+    return totals
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class ClassifyPool:
+    # classifies large UTXOSets in a pool of processes, for a batch analysis
+    # of many stakers on many cores
+    # the values and heights columns are copied once into a shared memory
+    # block and each process classifies its shard in place, only the block
+    # name, the shard bounds and the UTXOTotals pass between the processes
+    # classify_many() puts all the UTXOSets of a run in one block and cuts the
+    # shards across them, so the many small sets of a batch are spread over
+    # the processes as well as one large set
+    # UTXOs fewer than two shards of shardSize are classified here, the
+    # process overhead is more than the work
+
+    def __init__(self, processes, shardSize):
+
+        self.processes = processes
+        self.shardSize = max(1, shardSize)
+        self.pool = ProcessPoolExecutor(max_workers = processes)
+
+    def classify(self, utxos, matureUTXOHeight, minimumSatsValue):
+
+        return self.classify_many([(utxos, matureUTXOHeight, minimumSatsValue)])[0]
+
+    def classify_many(self, jobs):
+        # the UTXOTotals of each (UTXOSet, matureUTXOHeight, minimumSatsValue)
+        # job, in job order
+        # the sets are laid end to end in the block and cut into shards of
+        # equal size, a shard is the pieces of the sets it covers, each piece
+        # classified with the heights of its set
+
+        count = sum(len(utxos) for utxos, matureUTXOHeight, minimumSatsValue in jobs)
+
+        if count < 2 * self.shardSize:
+            return [utxos.classify(matureUTXOHeight, minimumSatsValue)
+                    for utxos, matureUTXOHeight, minimumSatsValue in jobs]
+
+        numShards = min(self.processes, count // self.shardSize)
+        bounds = [count * i // numShards for i in range(numShards + 1)]
+        shards = [[] for i in range(numShards)]             # (job, start, end) pieces of each shard
+        block = shared_memory.SharedMemory(create = True, size = count * 12)
+
+        try:
+            start = 0
+            shard = 0
+
+            for job, (utxos, matureUTXOHeight, minimumSatsValue) in enumerate(jobs):
+                end = start + len(utxos)
+                block.buf[start * 8:end * 8] = memoryview(utxos.values).cast("B")
+                block.buf[count * 8 + start * 4:count * 8 + end * 4] = memoryview(utxos.heights).cast("B")
+
+                while start < end:
+                    while bounds[shard + 1] <= start:
+                        shard += 1
+
+                    shards[shard].append((job, start, min(end, bounds[shard + 1])))
+                    start = min(end, bounds[shard + 1])
+
+            futures = [self.pool.submit(classify_shared, block.name, count,
+                                        [(start, end, jobs[job][1], jobs[job][2]) for job, start, end in pieces])
+                       for pieces in shards]
+
+            totals = [UTXOTotals(0, 0, 0, 0, 0, 0, 0, 0, 0)] * len(jobs)
+
+            for pieces, future in zip(shards, futures):
+                for (job, start, end), pieceTotals in zip(pieces, future.result()):
+                    totals[job] = add_utxo_totals(totals[job], pieceTotals)
+
+        finally:
+            block.close()
+            block.unlink()
+
+        return totals
+
+    def close(self):
+
+        self.pool.shutdown()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def classify_utxo_batches(batches, matureUTXOHeight, minimumSatsValue, classifyPool = None):
+    # classify each UTXOSet batch and add up the totals, in the processes of
+    # classifyPool if there is one
+
+    totals = UTXOTotals(0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    for utxos in batches:
+        if classifyPool is not None:
+            totals = add_utxo_totals(totals, classifyPool.classify(utxos, matureUTXOHeight, minimumSatsValue))
+        else:
+            totals = add_utxo_totals(totals, utxos.classify(matureUTXOHeight, minimumSatsValue))
+
+    return totals
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def analyse_staker_utxos(batches, height, schedule = None, classifyPool = None, planner = None, totals = None):
+    # returns (totals, splitFlag, recombineFlag) for the staker UTXOSet batches
+    # at this height, the flags are set if a UTXO should be split or the small
+    # UTXOs recombined, the UTXOs are also added to schedule and planner if
+    # there are, and classified in classifyPool if there is one, or not at
+    # all if the totals are passed in, classified with the rest of a run
+
+    minimumSatsValue = stakerMinimumSats
+    matureUTXOHeight = int(height) - UTXOMaturity
+
+    if schedule is not None:
+        batches = schedule.feed(batches, minimumSatsValue)
+
+    if planner is not None:
+        batches = planner.feed(batches)
+
+    if totals is None:
+        totals = classify_utxo_batches(batches, matureUTXOHeight, minimumSatsValue, classifyPool)
+    else:
+        for utxos in batches:       # only for schedule and planner
+            pass
+
+    intsatsSumTooSmallUTXOs = totals.sumTooSmall    # sum of too small UTXOs
+
+    splitFlag = totals.maxValue >= 20000000000      # found a UTXO >= 200.0 QTUM, should be split
+
+    recombineFlag = intsatsSumTooSmallUTXOs > 10000000000  # the small UTXOs should be split (recombined)
+    
+    return totals, splitFlag, recombineFlag
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -    
+
+def analyse_delegate_utxos(batches, height, localStakerMinUTXOSize, schedule = None, classifyPool = None,
+                           planner = None, totals = None):
+    # returns (totals, recombineFlag) for the delegate UTXOSet batches at this
+    # height, recombineFlag is set if the too small UTXOs add up to a stakeable
+    # UTXO and should be recombined, the UTXOs are also added to schedule and
+    # planner if there are, and classified in classifyPool if there is one,
+    # or not at all if the totals are passed in
+
+    minimumSatsValue = localStakerMinUTXOSize * 100000000
+    matureUTXOHeight = int(height) - UTXOMaturity
+
+    if schedule is not None:
+        batches = schedule.feed(batches, minimumSatsValue)
+
+    if planner is not None:
+        batches = planner.feed(batches)
+
+    if totals is None:
+        totals = classify_utxo_batches(batches, matureUTXOHeight, minimumSatsValue, classifyPool)
+    else:
+        for utxos in batches:
+            pass
+
+    intsatsSumTooSmallUTXOs = totals.sumTooSmall
+
+    # the delegate UTXOs should be split (recombined)
+    recombineFlag = intsatsSumTooSmallUTXOs >= localStakerMinUTXOSize * 100000000
+
+    return totals, recombineFlag
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# results of a checkup, passed to the report writer as each one is ready
+# sums are in satoshis, status is "staked", "fee too high" (staked) or "fee too low"
+# (not staked, no totals), plan is the UTXOPlan with planUTXOs, otherwise None
+
+StakerResult = namedtuple("StakerResult", ["address", "fee", "minUTXOSize", "totals", "splitFlag", "recombineFlag",
+                                           "plan"], defaults = [None])
+DelegateResult = namedtuple("DelegateResult", ["stakerAddress", "address", "fee", "status", "totals", "recombineFlag",
+                                               "plan"], defaults = [None])
+StakerSummary = namedtuple("StakerSummary", ["address", "delegationCount", "stakerValidUTXOs", "stakingDelegations",
+                                             "delegatesWeight"])
+
+# incremental mode, how the delegations of a staker changed since the run at
+# sinceHeight (None if there was no earlier run), recheck is True if every
+# delegate was checked for changes in this run
+
+DelegationChanges = namedtuple("DelegationChanges", ["stakerAddress", "sinceHeight", "added", "removed", "feeChanged",
+                                                     "recheck"])
+
+# the share of the network stake weight of a staker and its staked delegates
+# at a height, weights in satoshis, share a fraction, and per day the
+# expected blocks, their variance and the expected block rewards (satoshis)
+
+NetworkShare = namedtuple("NetworkShare", ["stakerAddress", "height", "stakerWeight", "delegatesWeight",
+                                           "netStakeWeight", "share", "expectedBlocks", "variance", "expectedReward"])
+
+# the maturity projection for a staker, MaturitySchedules for the staker UTXOs
+# and for the UTXOs of the staked delegates, projected horizon blocks past height
+
+ProjectionResult = namedtuple("ProjectionResult", ["stakerAddress", "height", "horizon", "stakerSchedule",
+                                                   "delegatesSchedule"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def projection_points(result):
+    # (height, stakerWeight, delegatesWeight) of a ProjectionResult at the
+    # checkup height and at each block of the horizon where a weight grows, the
+    # weights stay the same between these blocks
+
+    endHeight = result.height + result.horizon
+    heights = sorted(set(result.stakerSchedule.steps(endHeight)) | set(result.delegatesSchedule.steps(endHeight)))
+
+    return [(height, result.stakerSchedule.weight_at(height)[1], result.delegatesSchedule.weight_at(height)[1])
+            for height in [result.height] + heights if height >= result.height]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def blocks_per_day(height):
+    # mainnet, 128 second blocks, 32 seconds from the reduce block time fork
+
+    if height < reduceBlockTimeHeight:
+        return 675
+
+    return 2700
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def block_reward(height):
+    # mainnet block reward in satoshis, 4 QTUM, 1 QTUM from the reduce block
+    # time fork, halved at firstHalvingHeight and every halvingBlocks after
+
+    if height < reduceBlockTimeHeight:
+        return 400000000
+
+    if height < firstHalvingHeight:
+        return 100000000
+
+    return 100000000 >> (1 + (height - firstHalvingHeight) // halvingBlocks)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def network_share(stakerAddress, height, stakerWeight, delegatesWeight, netStakeWeight):
+    # the NetworkShare of a staker, each block goes to the staker with
+    # probability share, so the blocks won in a day are binomial, blocks per
+    # day trials
+
+    height = int(height)
+    share = min(1, (stakerWeight + delegatesWeight) / netStakeWeight)
+    blocks = blocks_per_day(height)
+
+    return NetworkShare(stakerAddress, height, stakerWeight, delegatesWeight, netStakeWeight, share, blocks * share,
+                        blocks * share * (1 - share), blocks * share * block_reward(height))
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def changes_record(result):
+    # a DelegationChanges as a dict for the machine readable writers
+
+    return {"type": "changes", "stakerAddress": result.stakerAddress, "sinceHeight": result.sinceHeight,
+            "added": [{"address": address, "fee": fee} for address, fee in result.added],
+            "removed": [{"address": address, "fee": fee} for address, fee in result.removed],
+            "feeChanged": [{"address": address, "previousFee": previousFee, "fee": fee}
+                           for address, previousFee, fee in result.feeChanged],
+            "recheck": result.recheck}
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def plan_record(plan):
+    # a UTXOPlan as a dict for the machine readable writers
+
+    def transaction_records(transactions):
+
+        return [{"inputs": [{"value": value, "height": blockHeight} for value, blockHeight in transaction.inputs],
+                 "outputs": transaction.outputs, "size": transaction.size, "fee": transaction.fee}
+                for transaction in transactions]
+
+    return {"splits": transaction_records(plan.splits), "combines": transaction_records(plan.combines),
+            "leftover": [{"value": value, "height": blockHeight} for value, blockHeight in plan.leftover]}
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def plan_summary(action, transactions):
+    # one line for the text report, "split 3 UTXOs (812.5 QTUM) into 8 UTXOs
+    # in 1 transaction, 630 bytes, fee 0.00252"
+
+    def plural(count, word):
+
+        return str(count) + " " + word + ("" if count == 1 else "s")
+
+    numInputs = sum(len(transaction.inputs) for transaction in transactions)
+    sumInputs = sum(value for transaction in transactions for value, blockHeight in transaction.inputs)
+    numOutputs = sum(len(transaction.outputs) for transaction in transactions)
+
+    return action + " " + plural(numInputs, "UTXO") + " (" + str(sumInputs / 100000000) + " QTUM) into " +\
+           plural(numOutputs, "UTXO") + " in " + plural(len(transactions), "transaction") + ", " +\
+           str(sum(transaction.size for transaction in transactions)) + " bytes, fee " +\
+           str(sum(transaction.fee for transaction in transactions) / 100000000)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def projection_record(result):
+    # a ProjectionResult as a dict for the machine readable writers
+
+    return {"type": "projection", "stakerAddress": result.stakerAddress, "horizon": result.horizon,
+            "points": [{"height": height, "stakerWeight": stakerWeight, "delegatesWeight": delegatesWeight}
+                       for height, stakerWeight, delegatesWeight in projection_points(result)]}
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class TextWriter:
+    # the printed report, the default outputFormat
+
+    def __init__(self, isMainnet):
+
+        self.isMainnet = isMainnet
+
+    def start(self, height):
+
+        temp = ""
+
+        if self.isMainnet == True:
+            temp += "Mainnet height "
+
+        else:
+            temp += "Testnet height "
+
+        temp += height + "\n"
+
+        print(temp)
+
+    def staker(self, result):
+
+        totals = result.totals
+        splitWarning = ''    
+
+        if result.splitFlag == True:  # has UTXOs that should be split
+            splitWarning = "UTXO(s) >= 200 SHOULD BE SPLIT"
+
+        tempStr = "Super Staker " + result.address
+
+        if len(splitWarning) > 0:
+            pad = "." * (72 - len(tempStr))   # "tab" over to align warning messages vertically
+        else:
+            pad = ""  
+        
+        tempStr += pad + splitWarning
+        
+        print(tempStr)
+
+        if result.plan is not None and len(result.plan.splits) > 0:
+            print("  Plan: " + plan_summary("split", result.plan.splits))
+
+        print("  Number Valid UTXOs =", totals.numValid, "Sum Valid UTXOs =", totals.sumValid / 100000000)
+
+        # these are probably staked
+        print("  Number Immature (probably staked) UTXOs =", totals.numImmature, "Sum Immature (probably staked) UTXOs =",\
+              totals.sumImmature / 100000000)
+
+        splitWarning = ''
+    
+        if result.recombineFlag == True:          # the small UTXOs should be split (recombined)
+            splitWarning = "SMALL UTXOs SHOULD SPLIT (RECOMBINED)"
+
+        tempStr = "  Number Too Small UTXOs = " + str(totals.numTooSmall) + " Sum Too Small UTXOs = " + str(totals.sumTooSmall / 100000000)
+
+        if len(splitWarning) > 0:
+            pad = "." * (72 - len(tempStr))
+        else:
+            pad = ""
+        
+        tempStr += pad + splitWarning
+                
+        print(tempStr)
+        self.print_combines(result.plan)
+        print("  Number Total UTXOs =", totals.numTotal, "Sum Total UTXOs", totals.sumTotal / 100000000)
+
+        if (totals.sumImmature + totals.sumValid > 0):
+            print("  Percent Stake to Total =", 100 * totals.sumImmature / (totals.sumImmature + totals.sumValid), "\n")
+        else:
+            print("  No valid UTXOs\n")
+
+    def changes(self, result):
+
+        if result.sinceHeight is None:
+            print("No saved delegations, checking every delegate\n")
+            return
+
+        count = len(result.added) + len(result.removed) + len(result.feeChanged)
+
+        tempStr = "Delegation changes since height " + str(result.sinceHeight) + ": " + str(len(result.added)) +\
+                  " added, " + str(len(result.removed)) + " removed, " + str(len(result.feeChanged)) + " fee changed"
+
+        if result.recheck == True:
+            tempStr += ", every delegate rechecked"
+
+        print(tempStr)
+
+        for address, fee in result.added:
+            print("  +", address, "Fee", fee)
+
+        for address, fee in result.removed:
+            print("  -", address, "Fee", fee)
+
+        for address, previousFee, fee in result.feeChanged:
+            print("  ~", address, "Fee", previousFee, "->", fee)
+
+        print()
+
+    def delegate(self, result):
+
+        if result.status == "fee too low":
+            tempStr = "Delegate" + str(result.address) + " Fee " + str(result.fee)
+            pad = "." * (72 - len(tempStr))
+            tempStr += pad + "FEE TOO LOW, NOT STAKED" + "\n"
+            print(tempStr)
+            return
+
+        if result.status == "staked":
+            print("Delegate", result.address, "Fee", result.fee)
+        else:
+            tempStr = "Delegate" + str(result.address) + " Fee " + str(result.fee)
+            pad = "." * (72 - len(tempStr))
+            tempStr += pad + "FEE TOO HIGH"
+            print(tempStr)
+
+        totals = result.totals
+
+        print("  Number Valid UTXOs =", totals.numValid, "Sum Valid UTXOs =", totals.sumValid / 100000000)
+
+        print("  Number Immature UTXOs =", totals.numImmature, "Sum Immature UTXOs =", totals.sumImmature / 100000000)
+    
+        if result.recombineFlag == True:  # the delegate UTXOs should be split (recombined)
+            splitWarning = "SHOULD SPLIT UTXOS"
+        else:
+            splitWarning = ''
+
+        tempStr = "  Number Too Small UTXOs = " + str(totals.numTooSmall) + " Sum Too Small UTXOs = " + str(totals.sumTooSmall / 100000000)
+
+        if len(splitWarning) > 0:
+            pad = "." * (72 - len(tempStr))
+        else:
+            pad = ""
+        
+        tempStr += pad + splitWarning    
+
+        print(tempStr)
+        self.print_combines(result.plan)
+        print("  Number Total UTXOs =", totals.numTotal, "Sum Total UTXOs", totals.sumTotal / 100000000, "\n")
+
+    def print_combines(self, plan):
+        # the combine plan, under the too small UTXOs line
+
+        if plan is None:
+            return
+
+        if len(plan.combines) > 0:
+            tempStr = "  Plan: " + plan_summary("combine", plan.combines)
+        elif len(plan.leftover) > 0:
+            tempStr = "  Plan: nothing to combine yet"
+        else:
+            return
+
+        if len(plan.leftover) > 0:
+            tempStr += ", " + str(len(plan.leftover)) + " UTXOs left (" +\
+                       str(sum(value for value, blockHeight in plan.leftover) / 100000000) + " QTUM)"
+
+        print(tempStr)
+
+    def staker_end(self, summary):
+
+        if summary.delegationCount > 0:   # found delegates
+            print("Number of valid Staker UTXOs (mature + immature)", summary.stakerValidUTXOs)
+            print("Number of delegates being staked", summary.stakingDelegations)      # have valid UTXO(s)
+            print("Delegates weight", summary.delegatesWeight / 100000000, "\n")
+
+        else:
+            print("This staker address has no delegations", "\n")
+
+    def projection(self, result):
+
+        print("Maturity projection to height", result.height + result.horizon, "(" + str(result.horizon), "blocks)")
+
+        for height, stakerWeight, delegatesWeight in projection_points(result):
+            print("  Height", height, "Staker weight", stakerWeight / 100000000, "Delegates weight", delegatesWeight / 100000000)
+
+        print()
+
+    def network(self, result):
+
+        print("Network stake weight", result.netStakeWeight / 100000000, "Staker + delegates weight",
+              (result.stakerWeight + result.delegatesWeight) / 100000000, "Share", format(100 * result.share, "0.4f"), "%")
+        print("Expected blocks per day", format(result.expectedBlocks, "0.3f"), "Standard deviation",
+              format(math.sqrt(result.variance), "0.3f"), "Expected reward per day",
+              format(result.expectedReward / 100000000, "0.4f"), "QTUM\n")
+
+    def finish(self):
+
+        return
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def result_record(recordType, result):
+    # a staker, delegate or summary result as a flat dict for the machine
+    # readable writers, the UTXO totals are inlined
+
+    record = {"type": recordType}
+
+    for key, value in result._asdict().items():
+        if key == "totals":
+            if value is not None:
+                record.update(value._asdict())
+        elif key == "plan":
+            if value is not None:
+                record[key] = plan_record(value)
+        else:
+            record[key] = value
+
+    return record
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class JSONWriter:
+    # one JSON document per checkup run, written when the run is done
+    # {"height", "network", "stakers": [{staker..., "delegates": [...], "summary": {...}}]}
+
+    def __init__(self, file, isMainnet):
+
+        self.file = file
+        self.isMainnet = isMainnet
+        self.report = None
+
+    def start(self, height):
+
+        self.report = {"height": int(height), "network": "mainnet" if self.isMainnet == True else "testnet",
+                       "stakers": []}
+
+    def staker(self, result):
+
+        record = result_record("staker", result)
+        record["delegates"] = []
+        self.report["stakers"].append(record)
+
+    def changes(self, result):
+
+        record = changes_record(result)
+        del record["type"], record["stakerAddress"]
+        self.report["stakers"][-1]["changes"] = record
+
+    def delegate(self, result):
+
+        self.report["stakers"][-1]["delegates"].append(result_record("delegate", result))
+
+    def staker_end(self, summary):
+
+        self.report["stakers"][-1]["summary"] = result_record("summary", summary)
+
+    def projection(self, result):
+
+        record = projection_record(result)
+        del record["type"], record["stakerAddress"]
+        self.report["stakers"][-1]["projection"] = record
+
+    def network(self, result):
+
+        record = result_record("network", result)
+        del record["type"], record["stakerAddress"]
+        self.report["stakers"][-1]["network"] = record
+
+    def finish(self):
+
+        json.dump(self.report, self.file, indent = 1)
+        self.file.write("\n")
+        self.file.flush()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NDJSONWriter:
+    # streaming JSON, one line per staker, delegate and staker summary, written
+    # as each is checked (in report order) so a reader can follow a long run
+
+    def __init__(self, file):
+
+        self.file = file
+        self.height = 0
+
+    def start(self, height):
+
+        self.height = int(height)
+
+    def write(self, record):
+
+        record["height"] = self.height
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def staker(self, result):
+
+        self.write(result_record("staker", result))
+
+    def changes(self, result):
+
+        self.write(changes_record(result))
+
+    def delegate(self, result):
+
+        self.write(result_record("delegate", result))
+
+    def staker_end(self, summary):
+
+        self.write(result_record("summary", summary))
+
+    def projection(self, result):
+
+        self.write(projection_record(result))
+
+    def network(self, result):
+
+        self.write(result_record("network", result))
+
+    def finish(self):
+
+        return
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class CSVWriter:
+    # one row per staker and delegate address, written as each is checked
+    # the staker summaries are sums of the delegate rows, so they are left out
+    # with the maturity projection there is also a projection row for each
+    # point, with three more columns
+
+    columns = ["height", "type", "stakerAddress", "address", "fee", "status", "numValid", "sumValid", "numImmature",
+               "sumImmature", "numTooSmall", "sumTooSmall", "numTotal", "sumTotal", "maxValue", "splitFlag",
+               "recombineFlag"]
+    projectionColumns = ["projectedHeight", "stakerWeight", "delegatesWeight"]
+
+    def __init__(self, file, projection = False):
+
+        self.file = file
+
+        if projection == True:
+            self.writer = csv.DictWriter(file, self.columns + self.projectionColumns, extrasaction = "ignore")
+        else:
+            self.writer = csv.DictWriter(file, self.columns, extrasaction = "ignore")
+
+        self.writer.writeheader()
+        self.height = 0
+
+    def start(self, height):
+
+        self.height = int(height)
+
+    def write(self, record):
+
+        record["height"] = self.height
+        self.writer.writerow(record)
+        self.file.flush()
+
+    def staker(self, result):
+
+        record = result_record("staker", result)
+        record["stakerAddress"] = result.address
+        self.write(record)
+
+    def changes(self, result):
+
+        return
+
+    def delegate(self, result):
+
+        self.write(result_record("delegate", result))
+
+    def staker_end(self, summary):
+
+        return
+
+    def projection(self, result):
+
+        for height, stakerWeight, delegatesWeight in projection_points(result):
+            self.write({"type": "projection", "stakerAddress": result.stakerAddress, "projectedHeight": height,
+                        "stakerWeight": stakerWeight, "delegatesWeight": delegatesWeight})
+
+    def network(self, result):
+
+        return
+
+    def finish(self):
+
+        return
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class HistoryWriter:
+    # records the results in a HistoryStore, alongside the report writer
+
+    def __init__(self, store):
+
+        self.store = store
+        self.height = 0
+
+    def start(self, height):
+
+        self.height = int(height)
+
+    def staker(self, result):
+
+        self.store.add_sample(self.height, result.address, result.address, result.fee, "staker", result.totals)
+
+    def changes(self, result):
+
+        return
+
+    def delegate(self, result):
+
+        if result.totals is not None:       # fee too low, not checked
+            self.store.add_sample(self.height, result.stakerAddress, result.address, result.fee, result.status,
+                                  result.totals)
+
+    def staker_end(self, summary):
+
+        self.store.add_summary(self.height, summary)
+
+    def projection(self, result):
+
+        return
+
+    def network(self, result):
+
+        self.store.add_network(self.height, result.netStakeWeight)
+
+    def finish(self):
+
+        self.store.commit()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class TeeWriter:
+    # sends each result to all of the writers, in order
+
+    def __init__(self, writers):
+
+        self.writers = writers
+
+    def start(self, height):
+
+        for writer in self.writers:
+            writer.start(height)
+
+    def staker(self, result):
+
+        for writer in self.writers:
+            writer.staker(result)
+
+    def changes(self, result):
+
+        for writer in self.writers:
+            writer.changes(result)
+
+    def delegate(self, result):
+
+        for writer in self.writers:
+            writer.delegate(result)
+
+    def staker_end(self, summary):
+
+        for writer in self.writers:
+            writer.staker_end(summary)
+
+    def projection(self, result):
+
+        for writer in self.writers:
+            writer.projection(result)
+
+    def network(self, result):
+
+        for writer in self.writers:
+            writer.network(result)
+
+    def finish(self):
+
+        for writer in self.writers:
+            writer.finish()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_report_writer(settings, file):
+    # the report writer for the outputFormat configuration entry
+
+    outputFormat = settings["outputFormat"]
+
+    if outputFormat == "json":
+        return JSONWriter(file, settings["isMainnet"])
+    elif outputFormat == "ndjson":
+        return NDJSONWriter(file)
+    elif outputFormat == "csv":
+        return CSVWriter(file, settings["projectionBlocks"] > 0)
+
+    return TextWriter(settings["isMainnet"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_response_cache(settings):
+    # the ResponseCache for the settings responseCacheFile, None without one
+    # or for a node, its JSON-RPC calls are not cached
+
+    if len(settings["responseCacheFile"]) == 0 or settings["dataSource"] == "rpc":
+        return None
+
+    return ResponseCache(settings["responseCacheFile"], settings["responseCacheMemoryMB"] * 1000000,
+                         settings["responseCacheMaxEntries"], settings["infoCacheSeconds"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_client(settings, timings = None, cache = None):
+    # the APIClient for the settings, one connection per worker is enough to
+    # keep every worker busy, or per page request in flight with utxoPageSize
+    # timings and cache as for APIClient
+
+    maxConnections = settings["numWorkers"]
+
+    if settings["utxoPageSize"] > 0 and settings["dataSource"] != "rpc":
+        maxConnections = settings["numWorkers"] * settings["utxoPageFetches"]
+
+    return APIClient(headers, maxConnections, settings["timeout"], settings["requestsPerSecond"],
+                     settings["maxRetries"], timings, cache)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def make_source(settings, client, timings = None):
+    # the data source for the settings, its requests go through client
+
+    if settings["dataSource"] == "rpc":
+        url = settings["rpcURL"]
+
+        if len(url) == 0:
+            if settings["isMainnet"] == True:
+                url = "http://127.0.0.1:" + str(RPCPortMainnet) + "/"
+            else:
+                url = "http://127.0.0.1:" + str(RPCPortTestnet) + "/"
+
+        return RPCSource(client, url, settings["rpcUser"], settings["rpcPassword"], settings["rpcBatchSize"], timings)
+
+    endpoint = settings["apiEndpoint"]
+
+    if len(endpoint) == 0:
+        if settings["isMainnet"] == True:
+            endpoint = APIEndpointMainnet
+        else:
+            endpoint = APIEndpointTestnet
+
+    return QtumInfoSource(client, endpoint, settings["streamUTXOs"], timings, settings["utxoPageSize"],
+                          settings["utxoPageFetches"])
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class Checkup:
+    # the checkup engine, the program, check_staker() and what_if() all run it
+    # settings are from make_settings(), the requests go through client, an
+    # APIClient, and close() stops the worker threads and classify processes
+    # run() checks the stakers at a height and sends each result to a report
+    # writer as soon as it is ready
+    # utxoCache is a UTXOCache, the UTXOs of an unchanged address are used
+    # from it and the delegations are kept in it for incrementalMode, and
+    # timings a Timings for the timing report, the program passes them
+
+    def __init__(self, settings, client, utxoCache = None, timings = None):
+
+        self.settings = settings
+        self.stakers = settings["stakers"]          # (address, fee, min UTXO size)
+        self.source = make_source(settings, client, timings)
+        self.utxoCache = utxoCache
+        self.timings = timings
+        self.executor = None                        # worker threads if numWorkers > 1
+        self.classifyPool = None                    # ClassifyPool if classifyProcesses > 1
+        self.fetches = {}                           # (function, address) -> Future, fetches for this run
+        self.classified = {}                        # (address, minimum sats) -> UTXOTotals from classifyPool
+        self.reuseAddresses = set()                 # incremental mode, cached UTXOs used without a change check
+        self.checkForChanges = True                 # False = use cached UTXOs without the change check
+        self.lock = threading.Lock()
+
+        if settings["numWorkers"] > 1:
+            self.executor = ThreadPoolExecutor(max_workers = settings["numWorkers"])
+
+        if settings["classifyProcesses"] > 1:
+            self.classifyPool = ClassifyPool(settings["classifyProcesses"], settings["classifyShardSize"])
+
+    def close(self):
+
+        if self.executor is not None:
+            self.executor.shutdown()
+
+        if self.classifyPool is not None:
+            self.classifyPool.close()
+
+    def get_block_height(self):
+        # the current block height from the data source, as a string
+        # CheckupError if the request failed
+
+        with timed_phase(self.timings, "info"):
+            height, error = self.source.get_block_height()
+
+        if error is not None:
+            report_url_error(self.source.info_url(), error)
+
+        if len(height) == 0:
+            raise CheckupError("no block height from " + self.source.info_url())
+
+        return height
+
+    def run(self, height, writer, checkForChanges = True):
+        # analyze the stakers and their delegates at this height, the results
+        # go to writer
+        # with more than one worker, all the UTXO fetches for every staker and
+        # delegate are started first, an address used by several stakers is
+        # fetched once, and the results still come in configuration order
+        # with checkForChanges False the cached UTXOs are used without a
+        # change check, watch mode between rechecks
+
+        self.fetches = {}
+        self.classified = {}
+        self.reuseAddresses = set()
+        self.checkForChanges = checkForChanges
+        delegationSets = []
+
+        writer.start(height)
+
+        summaries = self.get_summaries()
+        changes = [None] * len(self.stakers)
+        netStakeWeight = None
+
+        if self.settings["networkShare"] == True:
+            netStakeWeight, error = self.source.get_network_weight()
+
+            if error is not None:
+                report_url_error(self.source.info_url(), error)
+
+        if self.settings["incrementalMode"] == True and self.utxoCache is not None:
+            changes, self.reuseAddresses, delegationSets = self.diff_staker_delegations(height, summaries)
+
+        self.start_fetches(height, summaries)
+
+        if self.classifyPool is not None:
+            self.classify_all(height, summaries)
+
+        for (address, fee, minUTXOSize), summary, stakerChanges in zip(self.stakers, summaries, changes):
+            self.check_staker(writer, address, fee, minUTXOSize, summary, height, stakerChanges, netStakeWeight)
+
+        for stakerAddress, delegations, recheckHeight in delegationSets:    # the run is done, save for the next one
+            self.utxoCache.put_delegation_set(stakerAddress, delegations, height, recheckHeight)
+
+        writer.finish()
+
+    def get_summaries(self):
+        # the staker summaries, in configuration order, they have the delegate
+        # addresses and the balance and transaction count for the UTXO cache
+
+        with timed_phase(self.timings, "staker summaries"):
+            for address, fee, minUTXOSize in self.stakers:
+                self.fetch_once(self.source.get_staker_summary, address)
+
+            summaries = []
+
+            for address, fee, minUTXOSize in self.stakers:
+                summary, error = self.fetch_once(self.source.get_staker_summary, address).result()
+
+                if error is not None:
+                    report_url_error(self.source.summary_url(address), error)
+
+                summaries.append(summary)
+
+        return summaries
+
+    def start_fetches(self, height, summaries, allDelegations = False):
+        # prefetch the UTXOs of the stakers and their staked delegates, for a
+        # data source that batches its requests, and with more than one
+        # worker start fetching them, with allDelegations the delegates with
+        # a fee too low too
+
+        addresses = []
+        stakerSummaries = {}
+
+        for (address, fee, minUTXOSize), summary in zip(self.stakers, summaries):
+            addresses.append(address)
+
+            if len(summary) > 0:
+                stakerSummaries[address] = summary
+
+            for delegation in get_delegations(summary):
+                if delegation.fee >= fee or allDelegations == True:
+                    addresses.append(delegation.address)
+
+        with timed_phase(self.timings, "prefetch"):
+            self.source.prefetch([address for address in dict.fromkeys(addresses) if address not in self.reuseAddresses],
+                                 stakerSummaries, self.utxoCache, self.checkForChanges)
+
+        if self.executor is not None:
+            for (address, fee, minUTXOSize), summary in zip(self.stakers, summaries):
+                self.fetch_once(self.fetch_utxos, address, height, summary)
+
+                for delegation in get_delegations(summary):
+                    if delegation.fee >= fee or allDelegations == True:
+                        self.fetch_once(self.fetch_utxos, delegation.address, height)
+
+    def classify_all(self, height, summaries):
+        # classify the UTXOSets of every staker and staked delegate of the run
+        # together in classifyPool, so the processes share out many small sets
+        # too, the totals are kept in classified for check_staker()
+        # an address whose fetch failed is left out, check_staker() reports it
+        # at its place in the report
+
+        matureUTXOHeight = int(height) - UTXOMaturity
+        jobs = {}                   # (address, minimum sats) -> (UTXOSet, matureUTXOHeight, minimum sats)
+
+        for (address, fee, minUTXOSize), summary in zip(self.stakers, summaries):
+            addresses = [(address, stakerMinimumSats, summary)]
+
+            for delegation in get_delegations(summary):
+                if delegation.fee >= fee:
+                    addresses.append((delegation.address, minUTXOSize * 100000000, None))
+
+            for address, minimumSatsValue, addressSummary in addresses:
+                if (address, minimumSatsValue) not in jobs:
+                    utxos, error = self.fetch_once(self.fetch_utxos, address, height, addressSummary).result()
+
+                    if error is None:
+                        jobs[(address, minimumSatsValue)] = (utxos, matureUTXOHeight, minimumSatsValue)
+
+        with timed_phase(self.timings, "classify"):
+            self.classified = dict(zip(jobs, self.classifyPool.classify_many(list(jobs.values()))))
+
+    def diff_staker_delegations(self, height, summaries):
+        # incremental mode, compare the delegations of each staker with the ones
+        # saved by the last run, returns (changes, reuseAddresses, delegationSets)
+        # changes has the DelegationChanges for each staker, reuseAddresses the
+        # delegates whose cached UTXOs are used without fetching their summary, and
+        # delegationSets the (staker, delegations, recheckHeight) to save
+        # added and fee changed delegates are fetched, the rest reuse their cached
+        # UTXOs, reclassified at this height, except every incrementalRecheckBlocks
+        # blocks when every delegate is checked for a balance change; a node
+        # (dataSource rpc) checks all the balances in one batch call, so there
+        # every delegate is checked on every run
+
+        changes = []
+        reuse = set()
+        refresh = set()
+        delegationSets = []
+
+        for (address, fee, minUTXOSize), summary in zip(self.stakers, summaries):
+            delegations = {delegation.address: delegation.fee for delegation in get_delegations(summary)}
+
+            previous, savedHeight, recheckHeight = self.utxoCache.get_delegation_set(address)
+
+            if previous is None:
+                added, removed, feeChanged = [], [], []
+                recheck = True
+            else:
+                added, removed, feeChanged = diff_delegations(previous, delegations)
+                recheck = int(height) - recheckHeight >= self.settings["incrementalRecheckBlocks"] or \
+                    self.settings["dataSource"] == "rpc"
+
+            if recheck == True:
+                refresh.update(delegations)
+                recheckHeight = int(height)
+            else:
+                reuse.update(delegations)
+                refresh.update(delegate for delegate, delegateFee in added)
+                refresh.update(delegate for delegate, previousFee, delegateFee in feeChanged)
+
+            changes.append(DelegationChanges(address, savedHeight, added, removed, feeChanged, recheck))
+
+            if len(summary) > 0:
+                delegationSets.append((address, delegations, recheckHeight))
+
+        return changes, reuse - refresh, delegationSets
+
+    def check_staker(self, writer, address, fee, minUTXOSize, summary, height, changes = None, netStakeWeight = None):
+        # check one staker and its delegates, each result goes to writer as
+        # soon as it is ready
+        # summary is the staker /address/<addr> response, {} if it failed
+        # changes is the DelegationChanges in incremental mode
+        # netStakeWeight is the network stake weight with networkShare
+
+        projectionBlocks = self.settings["projectionBlocks"]
+        planMaxTxBytes = 0
+        stakerSchedule = None
+        delegatesSchedule = None
+        planner = None
+        plan = None
+
+        if self.settings["planUTXOs"] == True:
+            planMaxTxBytes = self.settings["planMaxTxBytes"]
+
+        if projectionBlocks > 0:        # for the maturity projection
+            stakerSchedule = MaturitySchedule(height)
+            delegatesSchedule = MaturitySchedule(height)
+
+        if planMaxTxBytes > 0:          # staker UTXOs of 100 to 200 QTUM
+            planner = UTXOPlanner(height, stakerMinimumSats, 20000000000, planMaxTxBytes)
+
+        with timed_phase(self.timings, "staker", address):
+            totals, splitFlag, recombineFlag = analyse_staker_utxos(self.utxo_batches(address, height, summary), height,
+                                                                    stakerSchedule, self.classifyPool, planner,
+                                                                    self.classified.get((address, stakerMinimumSats)))
+
+            if planner is not None:
+                plan = planner.plan()
+
+            writer.staker(StakerResult(address, fee, minUTXOSize, totals, splitFlag, recombineFlag, plan))
+
+        if changes is not None:
+            writer.changes(changes)
+
+        stakerValidUTXOs = totals.numValid + totals.numImmature     # mature + immature
+        stakerWeight = totals.sumValid
+        delegatesWeight = 0                 # sum of the valid delegate UTXOs
+        stakingDelegations = 0              # delegates with at least one valid UTXO
+
+        # analyze UTXOs for delegates
+
+        delegations = get_delegations(summary)
+
+        for delegation in delegations:
+
+            if delegation.fee >= fee:
+                if delegation.fee == fee:
+                    status = "staked"
+                else:
+                    status = "fee too high"
+
+                with timed_phase(self.timings, "delegate", delegation.address):
+                    if planMaxTxBytes > 0:
+                        planner = UTXOPlanner(height, minUTXOSize * 100000000, 0, planMaxTxBytes)
+
+                    totals, recombineFlag = analyse_delegate_utxos(self.utxo_batches(delegation.address, height),
+                                                                   height, minUTXOSize, delegatesSchedule,
+                                                                   self.classifyPool, planner,
+                                                                   self.classified.get((delegation.address,
+                                                                                        minUTXOSize * 100000000)))
+
+                    if planner is not None:
+                        plan = planner.plan()
+
+                    writer.delegate(DelegateResult(address, delegation.address, delegation.fee, status, totals,
+                                                   recombineFlag, plan))
+
+                delegatesWeight += totals.sumValid
+
+                if totals.numValid > 0:     # this delegate has UTXOs being staked
+                    stakingDelegations += 1
+
+            else:
+                writer.delegate(DelegateResult(address, delegation.address, delegation.fee, "fee too low", None, False))
+
+        with timed_phase(self.timings, "report", address):
+            writer.staker_end(StakerSummary(address, len(delegations), stakerValidUTXOs, stakingDelegations,
+                                            delegatesWeight))
+
+            if stakerSchedule is not None:
+                stakerSchedule.sort()
+                delegatesSchedule.sort()
+                writer.projection(ProjectionResult(address, int(height), projectionBlocks, stakerSchedule,
+                                                   delegatesSchedule))
+
+            if netStakeWeight is not None and netStakeWeight > 0:
+                writer.network(network_share(address, height, stakerWeight, delegatesWeight, netStakeWeight))
+
+    def fetch_once(self, function, *args):
+        # returns a Future for function(*args), run in the worker threads if
+        # there are (otherwise now), once per run for the same function and
+        # address, so an address shared by several stakers is only fetched once
+
+        key = (function.__name__, args[0])
+
+        with self.lock:
+            if key in self.fetches:
+                return self.fetches[key]
+
+            if self.executor is not None:
+                future = self.executor.submit(function, *args)
+            else:
+                future = Future()
+
+            self.fetches[key] = future
+
+        if self.executor is None:           # serial mode
+            future.set_result(function(*args))
+
+        return future
+
+    def fetch_utxos(self, address, height, summary = None):
+        # fetch and decode the UTXOs for an address, used by the worker threads
+        # returns (UTXOSet, error)
+        # with the cache, the /address/<addr> summary (or the one passed in) is
+        # checked first and the cached UTXOs are used if the address is unchanged
+
+        utxoCache = self.utxoCache
+
+        if utxoCache is not None and (self.checkForChanges == False or address in self.reuseAddresses):
+            utxos = utxoCache.get(address)      # watch mode between rechecks, or an unchanged delegate
+
+            if utxos is not None:
+                return utxos, None
+
+        if utxoCache is not None:
+            if summary is None or len(summary) == 0:    # balance and transaction count, the cheap change check
+                summary, error = self.source.get_summary(address)
+
+            if len(summary) > 0:
+                utxos = utxoCache.get(address, summary)
+
+                if utxos is not None:       # unchanged since it was cached
+                    return utxos, None
+
+        utxos, error = self.source.get_utxos(address)
+
+        if utxoCache is not None and len(summary) > 0 and error is None:
+            utxoCache.put(address, height, summary, utxos)
+
+        return utxos, error
+
+    def get_utxos(self, address, height, summary = None):
+        # the UTXOSet of an address, fetched once per run, a failed request
+        # stops the checkup
+
+        utxos, error = self.fetch_once(self.fetch_utxos, address, height, summary).result()
+
+        if error is not None:
+            report_url_error(self.source.utxo_url(address), error)
+
+        return utxos
+
+    def utxo_batches(self, address, height, summary = None):
+        # the UTXOSet batches of an address for the analysis, the fetch started
+        # by a worker thread, shared by several stakers or classified in
+        # classifyPool, otherwise fetched now, from the cache if it is
+        # unchanged, or decoded as it arrives with streamUTXOs, a failed
+        # request stops the checkup
+
+        if self.executor is not None or len(self.stakers) > 1 or self.classifyPool is not None:
+            return [self.get_utxos(address, height, summary)]
+
+        if self.utxoCache is None:
+            return self.source.get_utxo_batches(address)
+
+        utxos, error = self.fetch_utxos(address, height, summary)
+
+        if error is not None:
+            report_url_error(self.source.utxo_url(address), error)
+
+        return [utxos]
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# global variables, constants, the configuration is in the settings from
+# read_config_file() or make_settings()
+
+throttledRequestsPerSecond = 10                         # starting rate after a 429 with no requestsPerSecond
+maxBackoff = 30                                         # seconds, longest wait between retries
+# the configuration entries, (key, kind, default), the rules for the
+# configuration file and for make_settings(), kind as in config_value()
+configEntries = [("isMainnet", "bool", False), ("numWorkers", "int", 1), ("cacheFile", "str", ''),
+                 ("cacheMaxAddresses", "int", 2000), ("streamUTXOs", "bool", False), ("watchMode", "bool", False),
+                 ("watchInterval", "int", 30), ("watchRecheckBlocks", "int", 1), ("requestsPerSecond", "count", 0),
+                 ("maxRetries", "count", 5), ("timeout", "int", 60), ("timingReport", "bool", False),
+                 ("timingFile", "str", ''), ("outputFormat", "choice", "text"), ("outputFile", "str", ''),
+                 ("dataSource", "choice", "qtuminfo"), ("apiEndpoint", "str", ''), ("rpcURL", "str", ''),
+                 ("rpcUser", "str", ''), ("rpcPassword", "str", ''), ("rpcBatchSize", "int", 500),
+                 ("projectionBlocks", "count", 0), ("historyFile", "str", ''), ("incrementalMode", "bool", False),
+                 ("incrementalRecheckBlocks", "int", 2700), ("utxoPageSize", "count", 0),
+                 ("utxoPageFetches", "int", 4), ("classifyProcesses", "count", 0), ("classifyShardSize", "int", 100000),
+                 ("planUTXOs", "bool", False), ("planMaxTxBytes", "int", 100000), ("responseCacheFile", "str", ''),
+                 ("responseCacheMemoryMB", "int", 64), ("responseCacheMaxEntries", "int", 5000),
+                 ("infoCacheSeconds", "count", 10), ("networkShare", "bool", False)]
+configChoices = {"outputFormat": ("text", "json", "csv", "ndjson"), "dataSource": ("qtuminfo", "rpc")}
+configKinds = {key: kind for key, kind, default in configEntries}
+configDefaults = {key: default for key, kind, default in configEntries}
+stakerKeys = ("stakerAddress", "stakerFee", "stakerMinUTXOSize")     # one staker, repeated for a batch checkup
+stakerAddressPattern = re.compile("[1-9A-HJ-NP-Za-km-z]{34}")           # base58, 34 characters
+legacyLine = re.compile(r'\s*(?:"(\w+)"\s*:\s*("[^"]*"|[^\s,#"]+)\s*,?\s*)?(?:#.*)?')  # "key": value, # comment
+yamlEntry = re.compile(r"([A-Za-z_]\w*)\s*:\s*(.*)")                    # key: value
+configCache = {}                                        # file name -> ((mtime, size), parsed configuration)
+defaultCacheFile = "SSCUTXOCache.db"                    # UTXO cache for incrementalMode without a cacheFile
+maxUTXOPages = 10000                                    # most /utxo pages for one address
+planFeePerKB = 400000                                   # satoshis per 1000 bytes, the minimum relay fee
+txOverheadBytes = 10                                    # transaction sizes, pay to public key hash
+txInputBytes = 148
+txOutputBytes = 34
+reduceBlockTimeHeight = 845000                          # mainnet, 32 second blocks and 1 QTUM reward from here
+firstHalvingHeight = 985500                             # mainnet, first block reward halving
+halvingBlocks = 3942000                                 # blocks between halvings after the first
+RPCPortMainnet = 3889                                   # qtumd default RPC ports
+RPCPortTestnet = 13889
+config_file_name = "SSCConfigurationFile.txt"           # name of configuration file
+APIEndpointTestnet = "https://testnet.qtum.info/api/"   # for testnet
+APIEndpointMainnet = "https://qtum.info/api/"           # for mainnet
+# MinimumUTXOValue = 100                                # minimum UTXO size from super staker
+
+# for API calls pretend to be a chrome 87 browser on a windows 10 machine
+headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36"}
+
+UTXOMaturity = 500                                      # confirmations before a UTXO can stake
+stakerMinimumSats = 10000000000                         # consensus requirement, 100.0 QTUM minimum staker UTXO
+unconfirmedHeight = 2147483647                          # block height for an unconfirmed UTXO, never mature
+utxoBatchSize = 4096                                    # UTXOs per classification batch when streaming
+utxoRecordPattern = re.compile(rb'\{[^{}]*\}')            # the first UTXO record of a page
+addressPattern = re.compile("[QqTt][1-9A-HJ-NP-Za-km-z]{33}(?![1-9A-HJ-NP-Za-km-z])")    # a Qtum address in a report line
+    
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# MAIN PROGRAM STARTS HERE  = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+# = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = = =
+
+def main():
+
+    start = timer()
+    configStart = time.perf_counter()
+
+    # the banner and configuration lines are held until the outputFormat is
+    # known, they must not be mixed into a json, csv or ndjson report
+
+    banner = io.StringIO()
+
+    try:
+        with redirect_stdout(banner):
+            print("SuperStakerCheckup", version, "\n")
+
+            settings = read_config_file(config_file_name)   # read configuration file parameters
+
+    except SystemExit:              # bad configuration file
+        print(banner.getvalue(), end = "")
+        raise
+
+    outputFile = settings["outputFile"]
+
+    if len(outputFile) > 0:
+        reportFile = open(outputFile, "w", newline = "")
+    else:
+        reportFile = sys.stdout
+
+    if settings["outputFormat"] == "text":      # everything goes to the report
+        console = reportFile
+    elif len(outputFile) > 0:
+        console = sys.stdout
+    else:                           # the report is on standard output, the rest goes to standard error
+        console = sys.stderr
+
+    console.write(banner.getvalue())
+
+    timings = None
+
+    if settings["timingReport"] == True or len(settings["timingFile"]) > 0:
+        timings = Timings(configStart, settings["dataSource"] == "rpc")
+        timings.add_phase("config", "", configStart, time.perf_counter() - configStart)
+
+    reportWriter = make_report_writer(settings, reportFile)
+    history = None
+
+    if len(settings["historyFile"]) > 0:            # record the results too
+        history = HistoryStore(settings["historyFile"])
+        reportWriter = TeeWriter([reportWriter, HistoryWriter(history)])
+
+    with redirect_stdout(console):
+        run_main(settings, reportWriter, timings, start)
+
+    if history is not None:
+        history.close()
+
+    if len(outputFile) > 0:
+        reportFile.close()
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def run_main(settings, reportWriter, timings, start):
+    # set up the API client and the cache for the Checkup engine, the one
+    # check_staker() runs, then run the checkup once, or on each new block in
+    # watch mode, the results go to reportWriter
+
+    responseCache = make_response_cache(settings)
+    apiClient = make_client(settings, timings, responseCache)
+    utxoCache = None
+
+    if len(settings["cacheFile"]) > 0:
+        utxoCache = UTXOCache(settings["cacheFile"], settings["cacheMaxAddresses"])
+    elif settings["incrementalMode"] == True:       # keep the UTXOs and the delegations between runs
+        utxoCache = UTXOCache(defaultCacheFile, settings["cacheMaxAddresses"])
+    elif settings["watchMode"] == True:             # keep the UTXOs in memory between blocks
+        utxoCache = UTXOCache(":memory:", settings["cacheMaxAddresses"])
+
+    engine = Checkup(settings, apiClient, utxoCache, timings)
+
+    if settings["watchMode"] == True:
+        try:
+            watch_blocks(engine, reportWriter)
+
+        except KeyboardInterrupt:
+            print("Watch mode stopped")
+
+        engine.close()
+
+        if responseCache is not None:
+            print(responseCache.summary())
+            responseCache.close()
+
+        utxoCache.close()
+        report_timings(settings, timings, apiClient, utxoCache, timer() - start)
+        return
+
+    try:
+        engine.run(engine.get_block_height(), reportWriter)
+
+    except CheckupError as e:
+        print("Checkup stopped,", e)
+        sys.exit(1)
+
+    engine.close()
+
+    if utxoCache is not None:
+        with timed_phase(timings, "cache save"):
+            utxoCache.close()
+
+    print("Duration:", format(timer() - start, "0.2f"), "seconds")
+
+    if responseCache is not None:
+        print(responseCache.summary())
+        responseCache.close()
+
+    report_timings(settings, timings, apiClient, utxoCache, timer() - start)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def report_timings(settings, timings, apiClient, utxoCache, duration):
+    # print and/or export the timing report, if it was asked for
+
+    if timings is None:
+        return
+
+    extra = {"duration": duration, "requestCount": apiClient.requestCount, "connectionsOpened": apiClient.connectionsOpened,
+             "retries": apiClient.retryCount}
+
+    if utxoCache is not None:
+        extra["cacheHits"] = utxoCache.hits
+        extra["cacheMisses"] = utxoCache.misses
+
+    responseCache = apiClient.cache
+
+    if responseCache is not None:
+        extra["responseCacheHits"] = responseCache.hits
+        extra["responseCacheRevalidated"] = responseCache.revalidated
+        extra["responseCacheMisses"] = responseCache.misses
+
+    if settings["timingReport"] == True:
+        timings.print_report()
+        print("\n" + ", ".join(key + " " + str(value) for key, value in extra.items() if key != "duration"))
+
+    if len(settings["timingFile"]) > 0:
+        timings.export(settings["timingFile"], extra)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def watch_blocks(engine, reportWriter):
+    # watch mode, check the block height every watchInterval seconds and on
+    # each new block rerun the checkup and print only what changed
+    # the UTXOs are kept in the cache between blocks and reclassified at the new
+    # height, so UTXOs crossing the maturity boundary need no requests; the
+    # staker summary (new stakes, delegation changes) is fetched every block and
+    # the delegate addresses are rechecked every watchRecheckBlocks blocks
+
+    settings = engine.settings
+    watchInterval = settings["watchInterval"]
+
+    lastHeight = ''
+    lastReport = None
+    recheckHeight = 0       # height of the last recheck of the delegate addresses
+
+    while True:
+
+        try:
+            height = engine.get_block_height()
+
+        except CheckupError as e:
+            print("Checkup stopped,", e, "\n")
+            height = ''
+
+        if len(height) > 0 and height != lastHeight:
+
+            checkForChanges = lastReport is None or int(height) - recheckHeight >= settings["watchRecheckBlocks"]
+
+            if checkForChanges == True:
+                recheckHeight = int(height)
+
+            if settings["outputFormat"] != "text":  # each block's results go to the report, no diff
+                try:
+                    engine.run(height, reportWriter, checkForChanges)
+
+                except CheckupError as e:
+                    recheckHeight = 0
+                    print("Checkup stopped,", e, "\n")
+                    time.sleep(watchInterval)
+                    continue
+
+                lastHeight = height
+                lastReport = []
+                time.sleep(watchInterval)
+                continue
+
+            output = io.StringIO()
+
+            try:
+                with redirect_stdout(output):
+                    engine.run(height, reportWriter, checkForChanges)
+
+            except CheckupError as e:       # try this block again at the next check
+                recheckHeight = 0
+                print(output.getvalue(), end = "")
+                print("Checkup stopped,", e, "\n")
+                time.sleep(watchInterval)
+                continue
+
+            report = split_report(output.getvalue())
+
+            if lastReport is None:      # first block, print the whole report
+                print(output.getvalue(), end = "")
+            else:
+                print_report_diff(lastReport, report, lastHeight, height, settings["isMainnet"])
+
+            lastHeight = height
+            lastReport = report
+
+        time.sleep(watchInterval)
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def split_report(text):
+    # split a printed checkup report into its sections (separated by blank
+    # lines), returns a list of (key, lines) where the key is (staker, name),
+    # staker the Super Staker the section belongs to ("" before the first
+    # one) and name the address in the first line, or the first two words for
+    # the other sections, so a delegate of two stakers has two sections
+
+    report = []
+    staker = ""
+
+    for section in text.split("\n\n"):
+        lines = [line.rstrip() for line in section.split("\n") if len(line.strip()) > 0]
+
+        if len(lines) == 0:
+            continue
+
+        match = addressPattern.search(lines[0])
+
+        if match is not None:
+            name = match.group(0)
+
+            if lines[0].startswith("Super Staker"):
+                staker = name
+
+        else:
+            name = " ".join(lines[0].split()[0:2])
+
+        report.append(((staker, name), lines))
+
+    return report
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def print_report_diff(lastReport, report, lastHeight, height, isMainnet):
+    # print the sections that changed between two reports, "+ " for new lines
+    # and sections, "- " for old ones, unchanged sections are not printed
+
+    lastSections = dict(lastReport)
+    sections = dict(report)
+    changes = 0
+
+    if isMainnet == True:
+        print("Mainnet height", height, "(was " + lastHeight + ")")
+    else:
+        print("Testnet height", height, "(was " + lastHeight + ")")
+
+    for key, lines in report:
+
+        if key[1].endswith("height"):       # the height section, printed above
+            continue
+
+        if key not in lastSections:         # a new delegate
+            for line in lines:
+                print("+ " + line)
+
+            changes += 1
+
+        elif lines != lastSections[key]:
+            if lines[0] == lastSections[key][0]:
+                print("  " + lines[0])
+
+            for line in difflib.ndiff(lastSections[key], lines):
+                if line[0] in "+-":
+                    print(line)
+
+            changes += 1
+
+    for key, lines in lastReport:           # delegates that left
+        if key not in sections:
+            for line in lines:
+                print("- " + line)
+
+            changes += 1
+
+    if changes == 0:
+        print("No changes")
+
+    print()
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import SSCBenchmark                                      # noqa: E402
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+script = os.path.join(repoDir, "SuperStakerCheckup - 2021-01-18.py")
+dataDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.fixture
+def start_mock_server():
+    # starts SSCBenchmark mock APIs, (numDelegates, numUTXOs), shut down after the test
+
+    servers = []
+
+    def start(numDelegates, numUTXOs):
+
+        server = SSCBenchmark.start_mock_server(numDelegates, numUTXOs, 0)
+        servers.append(server)
+
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.fixture
+def mock_server(start_mock_server):
+    # an SSCBenchmark mock API, 3 delegates with 15 UTXOs each, the staker 45
+
+    return start_mock_server(3, 15)
+
+
+def write_config(directory, server, extra = ""):
+    # the configuration file for the staker of a mock server, its fee and a
+    # min UTXO size of 100, extra is more "key": value, lines
+
+    text = ('"stakerAddress": ' + server.stakerAddress + ",\n"
+            '"stakerFee": ' + str(SSCBenchmark.benchmarkFee) + ",\n"
+            '"stakerMinUTXOSize": 100,\n'
+            '"isMainnet": true,\n'
+            '"apiEndpoint": ' + server.endpoint + ",\n" + extra)
+
+    with open(os.path.join(directory, "SSCConfigurationFile.txt"), "w") as configFile:
+        configFile.write(text)
+
+
+def run_program(directory):
+    # run SuperStakerCheckup in directory, returns its standard output without
+    # the Duration line
+
+    result = subprocess.run([sys.executable, script], cwd = directory, capture_output = True, text = True,
+                            timeout = 120)
+
+    assert result.returncode == 0, result.stderr
+
+    return "".join(line for line in result.stdout.splitlines(True) if not line.startswith("Duration:"))
+
+
+def baseline_report():
+    # the report of the original SuperStakerCheckup for the 5 delegate, 30 UTXO mock
+
+    with open(os.path.join(dataDir, "baseline_report.txt")) as baseline:
+        return baseline.read()
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+
+from conftest import baseline_report
+
+from superstakercheckup import check_staker, check_staker_async
+from superstakercheckup.checkup import TextWriter
+
+
+def test_check_staker_writer_prints_program_report(start_mock_server):
+    # the program and check_staker() run the same engine, with the program's
+    # report writer check_staker() prints the report of the program
+
+    server = start_mock_server(5, 30)
+    output = StringIO()
+
+    with redirect_stdout(output):
+        check_staker({"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                      "isMainnet": True, "apiEndpoint": server.endpoint}, writer = TextWriter(True))
+
+    report = baseline_report()
+
+    assert output.getvalue() == report[report.index("Mainnet height"):]
+
+
+def test_concurrent_calls_match_sequential(start_mock_server):
+    # check_staker() keeps nothing in module variables, two stakers checked at
+    # once in threads or coroutines get the results of checking them one at
+    # a time
+
+    configs = []
+
+    for numDelegates, numUTXOs, numWorkers in ((5, 30, 1), (8, 20, 4)):
+        server = start_mock_server(numDelegates, numUTXOs)
+        configs.append({"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                        "apiEndpoint": server.endpoint, "numWorkers": numWorkers})
+
+    expected = [check_staker(config) for config in configs]
+
+    assert expected[0] != expected[1]
+
+    with ThreadPoolExecutor(max_workers = 8) as pool:
+        results = list(pool.map(check_staker, configs * 4))
+
+    assert results == expected * 4
+
+    async def check_all():
+
+        return await asyncio.gather(*[check_staker_async(config) for config in configs * 2])
+
+    assert asyncio.run(check_all()) == expected * 2
@@ -0,0 +1,59 @@
+from superstakercheckup.checkup import UTXOCache, UTXOSet
+
+
+def make_utxos(count, start = 0):
+
+    utxos = UTXOSet()
+
+    for i in range(count):
+        utxos.append(start + i, 1000 + i)
+
+    return utxos
+
+
+def test_utxo_cache(tmp_path):
+
+    fileName = str(tmp_path / "cache.db")
+    summary = {"balance": "1000", "transactionCount": 3}
+
+    cache = UTXOCache(fileName, 10)
+    cache.put("Qa", 777320, summary, make_utxos(3))
+
+    assert list(cache.get("Qa", summary).values) == [0, 1, 2]
+    assert cache.get("Qa", {"balance": "1000", "transactionCount": 4}) is None
+    assert cache.get("Qb", summary) is None
+    assert cache.is_current("Qa", summary)
+    assert cache.hits == 1 and cache.misses == 2
+
+    cache.put_delegation_set("Qs", {"Qa": 10}, 777320, 777000)
+    cache.close()
+
+    cache = UTXOCache(fileName, 10)             # kept between runs
+
+    assert list(cache.get("Qa").heights) == [1000, 1001, 1002]
+    assert cache.get_delegation_set("Qs") == ({"Qa": 10}, 777320, 777000)
+    assert cache.get_delegation_set("Qt") == (None, None, None)
+
+    cache.close()
+
+
+def test_utxo_cache_eviction(tmp_path):
+
+    fileName = str(tmp_path / "cache.db")
+    cache = UTXOCache(fileName, 2)
+
+    for address in ("Qa", "Qb", "Qc"):
+        cache.put(address, 777320, {"balance": "1", "transactionCount": 1}, make_utxos(1))
+
+    cache.close()
+
+    cache = UTXOCache(fileName, 2)              # a new run, Qc used again
+    cache.get("Qc")
+    cache.put("Qd", 777321, {"balance": "1", "transactionCount": 1}, make_utxos(1))
+    cache.close()
+
+    cache = UTXOCache(fileName, 2)
+    kept = [address for address in ("Qa", "Qb", "Qc", "Qd") if cache.get(address) is not None]
+    cache.close()
+
+    assert kept == ["Qc", "Qd"]
@@ -0,0 +1,129 @@
+import random
+from array import array
+
+from superstakercheckup import checkup, check_staker
+from superstakercheckup.checkup import UTXOSet, UTXOTotals, ClassifyPool, classify_utxos, add_utxo_totals
+
+
+def reference_totals(values, heights, matureUTXOHeight, minimumSatsValue):
+    # the classification one UTXO at a time, as the first version did it
+
+    valid = [v for v, h in zip(values, heights) if v >= minimumSatsValue and h <= matureUTXOHeight]
+    immature = [v for v, h in zip(values, heights) if v >= minimumSatsValue and h > matureUTXOHeight]
+    tooSmall = [v for v in values if v < minimumSatsValue]
+
+    return UTXOTotals(len(values), sum(values), len(valid), sum(valid), len(immature), sum(immature),
+                      len(tooSmall), sum(tooSmall), max(values, default = 0))
+
+
+def test_boundaries():
+
+    minimum = 100 * 100000000
+    values = [minimum, minimum - 1, minimum, minimum + 1, 5]
+    heights = [1000, 1000, 1001, checkup.unconfirmedHeight, 2000]
+
+    totals = classify_utxos(values, heights, 1000, minimum)
+
+    assert totals == UTXOTotals(5, sum(values), 1, minimum, 2, 2 * minimum + 1, 2, minimum - 1 + 5, minimum + 1)
+
+
+def test_empty():
+
+    assert classify_utxos(array("q"), array("i"), 1000, 100) == UTXOTotals(0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_random_matches_reference():
+
+    rng = random.Random(7)
+
+    for count in (1, 10, 1000):
+        values = array("q", [rng.randrange(1, 10 ** 12) for i in range(count)])
+        heights = array("i", [rng.randrange(776000, 777400) for i in range(count)])
+
+        for minimum in (0, 10 ** 10, 10 ** 11, 10 ** 13):
+            assert classify_utxos(values, heights, 776820, minimum) == \
+                reference_totals(values, heights, 776820, minimum)
+
+
+def test_utxo_set():
+
+    utxos = UTXOSet()
+    utxos.append(300, 10)
+    utxos.append(50, 20)
+
+    page = UTXOSet(array("q", [700]), array("i", [checkup.unconfirmedHeight]))
+    utxos.extend(page)
+
+    assert len(utxos) == 3
+    assert list(utxos.values) == [300, 50, 700]
+    assert list(utxos.heights) == [10, 20, checkup.unconfirmedHeight]
+
+    copy = UTXOSet.from_bytes(*utxos.to_bytes())
+
+    assert list(copy.values) == list(utxos.values)
+    assert list(copy.heights) == list(utxos.heights)
+    assert copy.classify(15, 100) == classify_utxos(utxos.values, utxos.heights, 15, 100)
+
+
+def test_batches_add_up():
+
+    rng = random.Random(3)
+    values = [rng.randrange(1, 10 ** 11) for i in range(500)]
+    heights = [rng.randrange(776000, 777400) for i in range(500)]
+
+    whole = classify_utxos(values, heights, 776820, 10 ** 10)
+    first = classify_utxos(values[:200], heights[:200], 776820, 10 ** 10)
+    second = classify_utxos(values[200:], heights[200:], 776820, 10 ** 10)
+
+    assert add_utxo_totals(first, second) == whole
+
+
+def test_pool_matches_in_process():
+    # the sets of a run, many smaller than a shard, are classified together,
+    # each shard has pieces of several sets with their own minimum
+
+    rng = random.Random(5)
+    jobs = []
+
+    for count in (0, 1, 40, 130, 7, 300, 49, 12):
+        utxos = UTXOSet(array("q", [rng.randrange(1, 10 ** 12) for i in range(count)]),
+                        array("i", [rng.randrange(776000, 777400) for i in range(count)]))
+        jobs.append((utxos, rng.randrange(776500, 777000), rng.choice((0, 10 ** 10, 10 ** 11))))
+
+    pool = ClassifyPool(3, 50)
+    submitted = []
+    submit = pool.pool.submit
+
+    def count_submit(*args):
+
+        submitted.append(args)
+
+        return submit(*args)
+
+    pool.pool.submit = count_submit
+
+    try:
+        assert pool.classify_many(jobs) == [utxos.classify(matureUTXOHeight, minimumSatsValue)
+                                            for utxos, matureUTXOHeight, minimumSatsValue in jobs]
+        assert pool.classify(jobs[5][0], 776820, 10 ** 10) == jobs[5][0].classify(776820, 10 ** 10)
+
+    finally:
+        pool.close()
+
+    # 539 UTXOs, shards 0 to 179, 179 to 359 and 359 to 539, then the one large set alone
+
+    assert len(submitted) == 3 + 3
+    assert sorted((start, end) for args in submitted[:3] for start, end, height, minimum in args[3]) == \
+        [(0, 1), (1, 41), (41, 171), (171, 178), (178, 179), (179, 359), (359, 478), (478, 527), (527, 539)]
+
+
+def test_pool_checkup_matches_in_process(start_mock_server):
+
+    server = start_mock_server(5, 30)
+    config = {"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+              "apiEndpoint": server.endpoint}
+
+    result = check_staker(config)
+
+    assert check_staker(dict(config, classifyProcesses = 2, classifyShardSize = 5)) == result
+    assert check_staker(dict(config, classifyProcesses = 2, classifyShardSize = 5, numWorkers = 4)) == result
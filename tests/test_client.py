@@ -0,0 +1,149 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import SSCBenchmark
+
+from superstakercheckup import check_staker
+from superstakercheckup.checkup import APIClient, Timings, headers
+
+
+class CountingHandler(SSCBenchmark.MockAPIHandler):
+    # the mock API counting the connections it accepts and recording the
+    # Content-Encoding of each response, with server.closeConnections it asks
+    # the client to close the connection after each response
+
+    def setup(self):
+
+        SSCBenchmark.MockAPIHandler.setup(self)
+
+        with self.server.lock:
+            self.server.connections += 1
+
+    def send_body(self, raw, compressed):
+
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+
+        with self.server.lock:
+            self.server.encodings.append("gzip" if gzipped else "")
+
+        if self.server.closeConnections == False:
+            SSCBenchmark.MockAPIHandler.send_body(self, raw, compressed)
+            return
+
+        if gzipped:
+            raw = compressed
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(raw)
+        self.close_connection = True
+
+
+@pytest.fixture
+def counting_server(start_mock_server):
+    # the mock API, 5 delegates with 30 UTXOs each, with CountingHandler
+
+    server = start_mock_server(5, 30)
+    server.RequestHandlerClass = CountingHandler
+    server.connections = 0
+    server.encodings = []
+    server.closeConnections = False
+
+    return server
+
+
+def mock_urls(server):
+    # the /info, address and UTXO URLs of the mock
+
+    addresses = [server.stakerAddress] + [delegation["delegator"] for delegation in server.delegations]
+
+    return ([server.endpoint + "info"] + [server.endpoint + "address/" + address for address in addresses] +
+            [server.endpoint + "address/" + address + "/utxo" for address in addresses])
+
+
+def test_requests_reuse_one_connection(counting_server):
+    # N requests one after the other open one connection, kept alive
+
+    urls = mock_urls(counting_server) * 3
+    client = APIClient(headers, 1)
+
+    for url in urls:
+        client.get(url)
+
+    client.close()
+
+    assert counting_server.requests == len(urls) == 39
+    assert client.requestCount == len(urls)
+    assert client.connectionsOpened == counting_server.connections == 1
+
+
+def test_workers_open_at_most_one_connection_each(counting_server):
+    # 4 worker threads sharing a client need no more than 4 connections
+
+    urls = mock_urls(counting_server) * 4
+    client = APIClient(headers, 4)
+
+    with ThreadPoolExecutor(max_workers = 4) as pool:
+        list(pool.map(client.get, urls))
+
+    client.close()
+
+    assert counting_server.requests == len(urls)
+    assert 1 <= client.connectionsOpened == counting_server.connections <= 4
+
+
+def test_connection_closed_by_server_not_reused(counting_server):
+    # a response with Connection: close costs a new connection for the next
+    # request, and no retry
+
+    counting_server.closeConnections = True
+    urls = mock_urls(counting_server)
+    client = APIClient(headers, 1)
+
+    for url in urls:
+        client.get(url)
+
+    client.close()
+
+    assert client.connectionsOpened == counting_server.connections == counting_server.requests == len(urls)
+    assert client.retryCount == 0
+
+
+def test_check_staker_one_connection(counting_server):
+    # a checkup with one worker sends every request on one connection
+
+    check_staker({"stakerAddress": counting_server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                  "apiEndpoint": counting_server.endpoint, "numWorkers": 1})
+
+    assert counting_server.requests == 8
+    assert counting_server.connections == 1
+
+
+def test_gzip_body_decompressed(counting_server):
+    # the client asks for gzip and decompresses the response, buffered or
+    # streamed, fewer bytes on the wire than decoded
+
+    timings = Timings(0.0)
+    client = APIClient(headers, 1, timings = timings)
+    utxoURL = counting_server.endpoint + "address/" + counting_server.stakerAddress + "/utxo"
+    raw, compressed = counting_server.utxoBodies[counting_server.stakerAddress]
+
+    assert client.get(counting_server.endpoint + "info") == counting_server.info[0]
+    assert client.get(utxoURL) == raw
+    assert b"".join(client.stream(utxoURL)) == raw
+
+    client.close()
+
+    assert counting_server.encodings == ["gzip"] * 3
+    assert [(call["wireBytes"], call["bytes"], call["streamed"]) for call in timings.calls] == \
+        [(len(counting_server.info[1]), len(counting_server.info[0]), False), (len(compressed), len(raw), False),
+         (len(compressed), len(raw), True)]
+    assert len(compressed) < len(raw) / 2
@@ -0,0 +1,191 @@
+import os
+
+import pytest
+
+from superstakercheckup import checkup, load_config, ConfigError
+from superstakercheckup.checkup import make_settings, parse_config
+
+first = "QTJDTpkYTqTnvmJ1wD9oP3GJi8LcpEUVjN"
+second = "QNa8BFTmVSRMbTsS8SYUXA4vnnEUZ4yFcu"
+
+legacy = '''# SSCConfigurationFile
+
+"stakerAddress": QTJDTpkYTqTnvmJ1wD9oP3GJi8LcpEUVjN,  # first staker
+"stakerFee": 10,
+"stakerMinUTXOSize": 100,
+"stakerAddress": QNa8BFTmVSRMbTsS8SYUXA4vnnEUZ4yFcu,
+"stakerFee": 0,
+"stakerMinUTXOSize": 0,
+"isMainnet": true,
+"numWorkers": 8,
+"outputFormat": JSON,
+"rpcPassword": "pass word",
+'''
+
+jsonText = '''{"stakers": [{"stakerAddress": "QTJDTpkYTqTnvmJ1wD9oP3GJi8LcpEUVjN", "stakerFee": 10, "stakerMinUTXOSize": 100},
+                             ["QNa8BFTmVSRMbTsS8SYUXA4vnnEUZ4yFcu", 0, 0]],
+               "isMainnet": true, "numWorkers": 8, "outputFormat": "json", "rpcPassword": "pass word"}'''
+
+tomlText = '''isMainnet = true
+numWorkers = 8
+outputFormat = "json"
+rpcPassword = "pass word"
+
+[[stakers]]
+stakerAddress = "QTJDTpkYTqTnvmJ1wD9oP3GJi8LcpEUVjN"
+stakerFee = 10
+stakerMinUTXOSize = 100
+
+[[stakers]]
+stakerAddress = "QNa8BFTmVSRMbTsS8SYUXA4vnnEUZ4yFcu"
+stakerFee = 0
+stakerMinUTXOSize = 0
+'''
+
+yamlText = '''# SSCConfigurationFile
+isMainnet: true
+numWorkers: 8
+outputFormat: json
+rpcPassword: "pass word"    # quoted
+stakers:
+  - stakerAddress: QTJDTpkYTqTnvmJ1wD9oP3GJi8LcpEUVjN
+    stakerFee: 10
+    stakerMinUTXOSize: 100
+  - [QNa8BFTmVSRMbTsS8SYUXA4vnnEUZ4yFcu, 0, 0]
+'''
+
+expected = {"stakers": [(first, 10, 100), (second, 0, 0)], "isMainnet": True, "numWorkers": 8,
+            "outputFormat": "json", "rpcPassword": "pass word"}
+
+
+@pytest.mark.parametrize("text, fileName", [(legacy, "SSCConfigurationFile.txt"), (jsonText, "ssc.json"),
+                                            (tomlText, "ssc.toml"), (yamlText, "ssc.yaml"), (jsonText, ''),
+                                            (yamlText, '')])
+def test_formats(text, fileName):
+
+    if "toml" in fileName and checkup.tomllib is None:
+        pytest.skip("no tomllib")
+
+    assert parse_config(text, fileName) == expected
+
+
+@pytest.mark.parametrize("key", ["requestsPerSecond", "maxRetries", "projectionBlocks", "utxoPageSize",
+                                 "classifyProcesses", "infoCacheSeconds"])
+def test_zero_values(key):
+    # 0 is the default or the off value of these entries
+
+    config = parse_config('"stakerAddress": ' + first + ',\n"stakerFee": 3,\n"stakerMinUTXOSize": 100,\n"' +
+                          key + '": 0,\n')
+
+    assert config[key] == 0
+    assert make_settings(config)[key] == 0
+
+
+def checkup_value(entry):
+    # a typed value as a caller of check_staker() would give it
+
+    return int(entry) if entry.lstrip("-").isdigit() else entry
+
+
+@pytest.mark.parametrize("key, value", [("numWorkers", "0"), ("maxRetries", "-1"), ("isMainnet", "yes"),
+                                        ("outputFormat", "xml"), ("stakerFee", "101"), ("stakerAddress", "Q123")])
+def test_bad_values(key, value):
+
+    lines = {"stakerAddress": first, "stakerFee": "3", "stakerMinUTXOSize": "100"}
+    lines[key] = value
+    text = "".join('"' + name + '": ' + entry + ",\n" for name, entry in lines.items())
+
+    with pytest.raises(ConfigError):
+        parse_config(text)
+
+    with pytest.raises(ConfigError):
+        make_settings({name: checkup_value(entry) for name, entry in lines.items()})
+
+
+def test_bad_lines():
+
+    for text in ('"stakerFee": 3,\n', '"stakerAddress": ' + first + ',\n"stakerFee": 3,\n',
+                 '"stakerAddress": ' + first + ',\n"stakerFee": 3,\n"stakerMinUTXOSize": 1,\n"numWorkers": 2,\n'
+                 '"numWorkers": 3,\n', '"stakerAddress": ' + first + ',\n"unknownEntry": 1,\n', 'not a line\n'):
+        with pytest.raises(ConfigError):
+            parse_config(text)
+
+
+def test_settings_defaults():
+
+    settings = make_settings({"stakerAddress": first, "stakerFee": 3, "stakerMinUTXOSize": 100})
+
+    assert settings["stakers"] == [(first, 3, 100)]
+
+    for key, kind, default in checkup.configEntries:
+        assert settings[key] == default
+
+
+def test_settings_same_rules_as_file():
+
+    config = parse_config(legacy)
+
+    assert make_settings(config)["stakers"] == config["stakers"]
+    assert make_settings(dict(config, stakers = [[first, 10, 100]]))["stakers"] == [(first, 10, 100)]
+
+    with pytest.raises(ConfigError):
+        make_settings({"stakers": []})
+
+    with pytest.raises(ConfigError):
+        make_settings({"stakerAddress": first, "stakerFee": 3})
+
+
+def test_settings_staker_entry_next_to_stakers():
+    # a top level stakerFee or stakerMinUTXOSize would be ignored next to stakers
+
+    for key, value in (("stakerFee", 5), ("stakerMinUTXOSize", 0), ("stakerAddress", second)):
+        with pytest.raises(ConfigError):
+            make_settings({"stakers": [[first, 10, 100]], key: value})
+
+
+def test_quoted_staker_address():
+
+    config = parse_config(legacy.replace(first + ",", '"' + first + '",'))
+
+    assert config == expected
+    assert make_settings({"stakerAddress": '"' + first + '"', "stakerFee": 3, "stakerMinUTXOSize": 100})["stakers"] == \
+        [(first, 3, 100)]
+
+
+def test_byte_order_mark(tmp_path):
+    # a file saved as UTF-8 with a BOM, as some Windows editors do
+
+    for name, text in (("SSCConfigurationFile.txt", legacy), ("config.json", jsonText)):
+        fileName = str(tmp_path / name)
+
+        with open(fileName, "w", encoding = "utf-8-sig") as configFile:
+            configFile.write(text)
+
+        assert load_config(fileName) == expected
+
+
+def test_reload_on_change(tmp_path):
+
+    fileName = str(tmp_path / "SSCConfigurationFile.txt")
+
+    with open(fileName, "w") as configFile:
+        configFile.write(legacy)
+
+    config = load_config(fileName)
+    config["stakers"].append(("changed by the caller", 0, 0))
+
+    assert load_config(fileName) == expected            # the cached copy is not changed
+
+    with open(fileName, "w") as configFile:
+        configFile.write(legacy.replace('"numWorkers": 8', '"numWorkers": 16'))
+
+    status = os.stat(fileName)
+    os.utime(fileName, ns = (status.st_atime_ns, status.st_mtime_ns + 1000000000))
+
+    assert load_config(fileName)["numWorkers"] == 16
+
+
+def test_missing_file(tmp_path):
+
+    with pytest.raises(ConfigError):
+        load_config(str(tmp_path / "none.txt"))
@@ -0,0 +1,13 @@
+import pytest
+from conftest import write_config, run_program, baseline_report
+
+
+@pytest.mark.parametrize("extra", ['', '"numWorkers": 8,\n', '"streamUTXOs": true,\n',
+                                   '"utxoPageSize": 30,\n', '"utxoPageSize": 7,\n',
+                                   '"classifyProcesses": 0,\n"requestsPerSecond": 0,\n"maxRetries": 0,\n'])
+def test_report_same_as_baseline(start_mock_server, tmp_path, extra):
+
+    server = start_mock_server(5, 30)
+    write_config(str(tmp_path), server, extra)
+
+    assert run_program(str(tmp_path)) == baseline_report()
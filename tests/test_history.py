@@ -0,0 +1,174 @@
+import csv
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from conftest import write_config, run_program, repoDir
+
+from superstakercheckup import check_staker, UTXOTotals, StakerSummary
+from superstakercheckup.checkup import HistoryStore, HistoryWriter, StakerResult, DelegateResult
+
+
+def run_history(*args):
+    # the standard output of SSCHistory.py with args
+
+    result = subprocess.run([sys.executable, os.path.join(repoDir, "SSCHistory.py")] + list(args), cwd = repoDir,
+                            capture_output = True, text = True, timeout = 60)
+
+    assert result.returncode == 0, result.stderr
+
+    return result.stdout
+
+
+def record(store, height, stakerAddress, stakerValid, delegates):
+    # one run at height, a staker with stakerValid satoshis staked and
+    # delegates, a list of (address, fee, sumValid)
+
+    writer = HistoryWriter(store)
+    writer.start(str(height))
+    writer.staker(StakerResult(stakerAddress, 10, 100, UTXOTotals(3, stakerValid + 50, 2, stakerValid, 1, 50, 0, 0,
+                                                                  stakerValid), False, False))
+    delegatesWeight = 0
+
+    for address, fee, sumValid in delegates:
+        writer.delegate(DelegateResult(stakerAddress, address, fee, "staked", UTXOTotals(1, sumValid, 1, sumValid, 0, 0,
+                                                                                         0, 0, sumValid), False))
+        delegatesWeight += sumValid
+
+    writer.delegate(DelegateResult(stakerAddress, "QfeeTooLow", 5, "fee too low", None, False))
+    writer.staker_end(StakerSummary(stakerAddress, len(delegates) + 1, 3, len(delegates), delegatesWeight))
+    writer.finish()
+
+
+def test_record_run(start_mock_server, tmp_path):
+    # a run of the program with historyFile has the results of check_staker()
+
+    server = start_mock_server(5, 30)
+    fileName = str(tmp_path / "SSCHistory.db")
+    write_config(str(tmp_path), server, '"historyFile": "' + fileName + '",\n')
+    run_program(str(tmp_path))
+
+    result = check_staker({"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                           "apiEndpoint": server.endpoint})
+    [report] = result.stakers
+    store = HistoryStore(fileName)
+
+    assert store.stakers() == [(server.stakerAddress, result.height, result.height, 1)]
+    assert store.last_height() == result.height
+
+    staker = report.staker
+
+    assert store.address_history(server.stakerAddress, 0, result.height) == \
+        [(result.height, server.stakerAddress, 10, "staker", staker.totals.numValid, staker.totals.sumValid,
+          staker.totals.numImmature, staker.totals.sumImmature, staker.totals.numTooSmall, staker.totals.sumTooSmall,
+          staker.totals.numTotal, staker.totals.sumTotal)]
+
+    for delegate in report.delegates:
+        rows = store.address_history(delegate.address, 0, result.height)
+
+        if delegate.totals is None:         # fee too low, not checked
+            assert rows == []
+        else:
+            assert rows == [(result.height, server.stakerAddress, delegate.fee, delegate.status,
+                             delegate.totals.numValid, delegate.totals.sumValid, delegate.totals.numImmature,
+                             delegate.totals.sumImmature, delegate.totals.numTooSmall, delegate.totals.sumTooSmall,
+                             delegate.totals.numTotal, delegate.totals.sumTotal)]
+
+    [(height, sumValid, sumImmature, percentStaked, delegatesWeight, stakingDelegations)] = \
+        store.staker_history(server.stakerAddress, 0, result.height)
+
+    assert (height, sumValid, sumImmature) == (result.height, staker.totals.sumValid, staker.totals.sumImmature)
+    assert percentStaked == 100 * sumImmature / (sumImmature + sumValid)
+    assert (delegatesWeight, stakingDelegations) == (report.summary.delegatesWeight, report.summary.stakingDelegations)
+
+    store.close()
+
+
+def test_range_bounds(tmp_path):
+    # fromHeight and toHeight are both in the range
+
+    store = HistoryStore(str(tmp_path / "SSCHistory.db"))
+
+    for height in (100, 200, 300):
+        record(store, height, "Qstaker", height * 1000, [("Qdelegate", 10, height)])
+
+    def heights(rows):
+
+        return [row[0] for row in rows]
+
+    for fromHeight, toHeight, expected in ((100, 300, [100, 200, 300]), (101, 299, [200]), (200, 200, [200]),
+                                           (300, 1000, [300]), (0, 99, []), (301, 400, []), (300, 100, [])):
+        assert heights(store.address_history("Qdelegate", fromHeight, toHeight)) == expected
+        assert heights(store.staker_history("Qstaker", fromHeight, toHeight)) == expected
+
+    assert store.address_history("QfeeTooLow", 0, 1000) == []
+    assert store.address_history("Qunknown", 0, 1000) == []
+    assert store.staker_history("Qdelegate", 0, 1000) == []
+    assert store.staker_history("Qunknown", 0, 1000) == []
+
+    store.close()
+
+
+def test_staker_history(tmp_path):
+
+    store = HistoryStore(str(tmp_path / "SSCHistory.db"))
+
+    record(store, 100, "Qstaker", 0, [])
+    record(store, 200, "Qstaker", 150, [("Qa", 10, 400), ("Qb", 12, 600)])
+    record(store, 200, "Qother", 70, [("Qa", 10, 400)])         # a delegate of two stakers
+
+    assert store.staker_history("Qstaker", 0, 1000) == [(100, 0, 50, 100.0, 0, 0), (200, 150, 50, 25.0, 1000, 2)]
+    assert store.staker_history("Qother", 0, 1000) == [(200, 70, 50, 100 * 50 / 120, 400, 1)]
+    assert sorted(row[1] for row in store.address_history("Qa", 0, 1000)) == ["Qother", "Qstaker"]
+    assert store.stakers() == [("Qother", 200, 200, 1), ("Qstaker", 100, 200, 2)]
+
+    store.close()
+
+
+def test_run_that_stopped_leaves_nothing(tmp_path):
+
+    fileName = str(tmp_path / "SSCHistory.db")
+    store = HistoryStore(fileName)
+    record(store, 100, "Qstaker", 150, [])
+
+    writer = HistoryWriter(store)
+    writer.start("200")
+    writer.staker(StakerResult("Qstaker", 10, 100, UTXOTotals(1, 5, 1, 5, 0, 0, 0, 0, 5), False, False))
+    store.close()                       # stopped before finish()
+
+    store = HistoryStore(fileName)
+
+    assert store.last_height() == 100
+    assert [row[0] for row in store.address_history("Qstaker", 0, 1000)] == [100]
+
+    store.close()
+
+
+def test_history_program(tmp_path):
+    # SSCHistory.py prints the rows of the queries
+
+    fileName = str(tmp_path / "SSCHistory.db")
+    store = HistoryStore(fileName)
+
+    for height in (100, 200, 300):
+        record(store, height, "Qstaker", height * 1000, [("Qdelegate", 10, height)])
+
+    rows = [[str(value) for value in row] for row in store.staker_history("Qstaker", 150, 300)]
+    addressRows = [[str(value) for value in row] for row in store.address_history("Qdelegate", 100, 200)]
+    store.close()
+
+    output = run_history("--file", fileName, "--staker", "Qstaker", "--from", "150", "--to", "300", "--csv")
+
+    assert list(csv.reader(StringIO(output)))[1:] == rows
+
+    output = run_history("--file", fileName, "--address", "Qdelegate", "--from", "100", "--to", "200", "--csv")
+
+    assert list(csv.reader(StringIO(output)))[1:] == addressRows
+
+    output = run_history("--file", fileName, "--staker", "Qstaker", "--blocks", "150")
+
+    assert output.startswith("Staker Qstaker, heights 151 to 300 - 2 rows in ")
+    assert [line.split()[0] for line in output.splitlines()[3:]] == ["200", "300"]
+
+    assert run_history("--file", fileName).splitlines()[1].split() == ["Qstaker", "100", "300", "3"]
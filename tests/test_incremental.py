@@ -0,0 +1,21 @@
+from conftest import write_config, run_program, baseline_report
+
+
+def test_incremental_mode(start_mock_server, tmp_path):
+    # the second run refetches nothing that did not change, the report is the same
+
+    server = start_mock_server(5, 30)
+    write_config(str(tmp_path), server, '"incrementalMode": true,\n"cacheFile": SSCUTXOCache.db,\n')
+
+    first = run_program(str(tmp_path))
+    firstRequests = server.requests
+    second = run_program(str(tmp_path))
+
+    assert server.requests - firstRequests == 2             # /info and the staker summary
+    assert "No saved delegations, checking every delegate\n" in first
+    assert "Delegation changes since height 777320: 0 added, 0 removed, 0 fee changed\n" in second
+
+    report = baseline_report().split("\n\n")
+
+    for text in (first, second):
+        assert [section for section in text.split("\n\n") if "elegation" not in section] == report
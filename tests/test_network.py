@@ -0,0 +1,126 @@
+import math
+import random
+
+import pytest
+
+from superstakercheckup import checkup, check_staker, UTXOTotals, StakerSummary
+from superstakercheckup.checkup import HistoryStore, block_reward, blocks_per_day, network_share
+
+
+def test_block_reward_halving_boundaries():
+
+    first = checkup.firstHalvingHeight
+    blocks = checkup.halvingBlocks
+
+    for height, reward in ((0, 400000000), (checkup.reduceBlockTimeHeight - 1, 400000000),
+                           (checkup.reduceBlockTimeHeight, 100000000), (first - 1, 100000000), (first, 50000000),
+                           (first + blocks - 1, 50000000), (first + blocks, 25000000),
+                           (first + 2 * blocks - 1, 25000000), (first + 2 * blocks, 12500000)):
+        assert block_reward(height) == reward
+
+    assert blocks_per_day(checkup.reduceBlockTimeHeight - 1) == 675
+    assert blocks_per_day(checkup.reduceBlockTimeHeight) == 2700
+
+
+def test_expected_blocks_hand_computed():
+    # 1% of the network weight, 2700 blocks a day: 27 blocks, variance
+    # 2700 * 0.01 * 0.99, at 1 QTUM a block and at 0.5 after the first halving
+
+    share = network_share("Q", "900000", 3 * 10 ** 12, 10 ** 12, 4 * 10 ** 14)
+
+    assert share.share == pytest.approx(0.01)
+    assert share.expectedBlocks == pytest.approx(27)
+    assert share.variance == pytest.approx(26.73)
+    assert share.expectedReward == pytest.approx(27 * 100000000)
+    assert network_share("Q", str(checkup.firstHalvingHeight), 3 * 10 ** 12, 10 ** 12, 4 * 10 ** 14).expectedReward == \
+        pytest.approx(27 * 50000000)
+
+    # before the reduce block time fork, 675 blocks a day of 4 QTUM
+
+    share = network_share("Q", "800000", 2 * 10 ** 12, 0, 10 ** 14)
+
+    assert (share.expectedBlocks, share.variance) == pytest.approx((13.5, 675 * 0.02 * 0.98))
+    assert share.expectedReward == pytest.approx(13.5 * 400000000)
+
+    # a staker with more than the network weight reported, every block
+
+    share = network_share("Q", "900000", 5 * 10 ** 14, 0, 4 * 10 ** 14)
+
+    assert (share.share, share.expectedBlocks, share.variance) == (1, 2700, 0)
+
+
+def test_check_staker_network_share(start_mock_server):
+
+    server = start_mock_server(5, 30)
+    result = check_staker({"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                           "apiEndpoint": server.endpoint, "networkShare": True})
+    [report] = result.stakers
+
+    assert report.network == network_share(server.stakerAddress, result.height, report.staker.totals.sumValid,
+                                           report.summary.delegatesWeight, 2151586138402970)
+
+
+def test_share_table_matches_per_row(tmp_path):
+    # the GROUP BY buckets against the averages worked out row by row
+
+    rng = random.Random(11)
+    store = HistoryStore(str(tmp_path / "SSCHistory.db"))
+    bucketBlocks = 2700
+    rows = []                           # (staker, height, weight, netStakeWeight)
+
+    heights = sorted(rng.sample(range(checkup.reduceBlockTimeHeight - 6000, checkup.reduceBlockTimeHeight + 6000), 60))
+
+    for height in heights:
+        netStakeWeight = rng.randrange(10 ** 14, 3 * 10 ** 14)
+
+        if height % 7 != 0:             # some runs without networkShare
+            store.add_network(height, netStakeWeight)
+
+        for staker in ("Qa", "Qb"):
+            sumValid = rng.randrange(0, 10 ** 13)
+            delegatesWeight = rng.randrange(0, 10 ** 13)
+
+            if staker == "Qb" and height % 5 == 0:
+                sumValid = 4 * 10 ** 14             # more than the network, share 1
+
+            store.add_sample(height, staker, staker, 10, "staker", UTXOTotals(1, sumValid, 1, sumValid, 0, 0, 0, 0,
+                                                                              sumValid))
+            store.add_summary(height, StakerSummary(staker, 3, 1, 2, delegatesWeight))
+
+            if height % 7 != 0:
+                rows.append((staker, height, sumValid + delegatesWeight, netStakeWeight))
+
+    store.commit()
+
+    fromHeight = heights[5]
+    toHeight = heights[-5]
+    buckets = {}
+
+    for staker, height, weight, netStakeWeight in rows:
+        if fromHeight <= height <= toHeight:
+            buckets.setdefault((staker, height // bucketBlocks * bucketBlocks), []).append((weight, netStakeWeight))
+
+    expected = []
+
+    for (staker, bucket), samples in sorted(buckets.items()):
+        shares = [min(1, weight / netStakeWeight) for weight, netStakeWeight in samples]
+        share = sum(shares) / len(shares)
+        blocks = blocks_per_day(bucket)
+        expected.append((staker, bucket, len(samples), sum(weight for weight, netStakeWeight in samples) / len(samples),
+                         sum(netStakeWeight for weight, netStakeWeight in samples) / len(samples), share,
+                         blocks * share, math.sqrt(blocks * sum(s * (1 - s) for s in shares) / len(shares)),
+                         blocks * share * block_reward(bucket)))
+
+    table = store.share_table(fromHeight, toHeight, bucketBlocks)
+
+    assert len(table) == len(expected) > 4
+    assert {blocks_per_day(row[1]) for row in table} == {675, 2700}
+
+    for row, expectedRow in zip(table, expected):
+        assert row[:3] == expectedRow[:3]
+        assert row[3:] == pytest.approx(expectedRow[3:], rel = 1e-9)
+
+    assert store.share_table(fromHeight, toHeight, bucketBlocks, "Qb") == [row for row in table if row[0] == "Qb"]
+    assert store.share_table(fromHeight, toHeight, bucketBlocks, "Qunknown") == []
+
+    store.close()
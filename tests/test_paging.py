@@ -0,0 +1,152 @@
+from urllib.error import URLError
+
+import pytest
+
+from superstakercheckup import checkup
+from superstakercheckup.checkup import APIClient, QtumInfoSource, UTXOSet, iter_utxo_stream, parse_utxos
+
+
+def make_source(endpoint, pageSize):
+
+    return QtumInfoSource(APIClient(checkup.headers, 2), endpoint, pageSize = pageSize, pageFetches = 4)
+
+
+class PagedSource(QtumInfoSource):
+    # pages count UTXOs with limit and offset, without a server
+
+    def __init__(self, count, pageSize):
+
+        QtumInfoSource.__init__(self, None, "", pageSize = pageSize)
+        self.count = count
+        self.pages = 0
+
+    def get_utxo_page(self, address, offset):
+
+        self.pages += 1
+        end = min(offset + self.pageSize, self.count)
+        utxos = UTXOSet()
+
+        for i in range(offset, end):
+            utxos.append(i, 1000)
+
+        return utxos, "%064x" % offset if end > offset else None, None
+
+
+class SplitTransactionSource(QtumInfoSource):
+    # the pages of an address whose outputs all come from one transaction,
+    # as after a split, without a server
+
+    def __init__(self, count, pageSize):
+
+        QtumInfoSource.__init__(self, None, "", pageSize = pageSize)
+        self.count = count
+
+    def fetch(self, url):
+
+        offset = int(url.split("offset=")[1])
+
+        return ("[" + ",".join('{"transactionId":"%064x","outputIndex":%d,"value":"%d","blockHeight":700000}'
+                               % (1, i, 1000 + i) for i in range(offset, min(offset + self.pageSize, self.count))) +
+                "]").encode(), None
+
+
+def test_endpoint_ignoring_offset_stops(mock_server):
+    # the mock returns all the UTXOs whatever the limit and offset, a delegate
+    # with exactly utxoPageSize UTXOs used to page forever
+
+    source = make_source(mock_server.endpoint, 15)
+    address = mock_server.delegations[0]["delegator"]
+
+    utxos, error = source.get_utxos(address)
+
+    assert error is None
+    assert sorted(utxos.values) == sorted(value for value, blockHeight in mock_server.utxoColumns[address])
+    assert mock_server.requests <= 1 + source.pageFetches
+
+
+def test_first_page_longer_than_page_size(mock_server):
+
+    source = make_source(mock_server.endpoint, 15)
+
+    utxos, error = source.get_utxos(mock_server.stakerAddress)
+
+    assert error is None
+    assert len(utxos) == 45
+    assert mock_server.requests == 1
+
+
+def test_paged_utxos_complete():
+
+    for count in (0, 7, 15, 16, 100, 105):
+        source = PagedSource(count, 15)
+
+        utxos, error = source.get_utxos("Q")
+
+        assert error is None
+        assert sorted(utxos.values) == list(range(count))
+
+
+def test_pages_starting_with_same_transaction():
+    # consecutive pages start with the same transaction id, only a repeated
+    # first UTXO means the offset was ignored
+
+    for count in (40, 45):
+        source = SplitTransactionSource(count, 10)
+
+        utxos, error = source.get_utxos("Q")
+
+        assert error is None
+        assert sorted(utxos.values) == list(range(1000, 1000 + count))
+
+
+def test_max_pages(monkeypatch):
+
+    monkeypatch.setattr(checkup, "maxUTXOPages", 5)
+    source = PagedSource(1000, 10)
+
+    pages = list(source.iter_utxo_pages("Q"))
+
+    assert sum(len(utxos) for utxos, error in pages) == 50
+    assert isinstance(pages[-1][1], URLError)
+    assert source.pages == 5
+
+
+def utxo_json(count):
+
+    return ("[" + ",".join('{"transactionId":"%064x","outputIndex":0,"value":"%d","isStake":false,"blockHeight":%s}'
+                           % (i, 1000 + i, "null" if i == 2 else 700000 + i) for i in range(count)) + "]").encode()
+
+
+def test_stream_any_chunk_size():
+
+    body = utxo_json(5)
+    expected = [(1000, 700000), (1001, 700001), (1002, checkup.unconfirmedHeight), (1003, 700003), (1004, 700004)]
+
+    for size in (1, 2, 7, 64, len(body)):
+        chunks = [body[i:i + size] for i in range(0, len(body), size)]
+
+        assert list(iter_utxo_stream(chunks)) == expected
+
+
+def test_stream_empty_and_truncated():
+
+    assert list(iter_utxo_stream([b"[", b" ]"])) == []
+
+    with pytest.raises(ValueError):
+        list(iter_utxo_stream([utxo_json(3)[:-10]]))
+
+    with pytest.raises(ValueError):
+        list(iter_utxo_stream([b'{"error": 1}']))
+
+
+def test_stream_matches_parse(mock_server):
+
+    source = make_source(mock_server.endpoint, 0)
+    address = mock_server.stakerAddress
+    url = source.utxo_url(address)
+
+    streamed = list(iter_utxo_stream(source.client.stream(url)))
+    parsed = parse_utxos(source.client.get(url))
+
+    assert streamed == list(zip(parsed.values, parsed.heights))
+    assert streamed == list(mock_server.utxoColumns[address])
@@ -0,0 +1,109 @@
+import random
+
+from superstakercheckup import checkup
+from superstakercheckup.checkup import UTXOSet, UTXOPlanner, plan_splits, plan_combines, pack_transactions
+from superstakercheckup.checkup import transaction_fee
+
+coin = 100000000
+
+
+def check_transaction(transaction, minimumSatsValue, maxTxBytes):
+    # a planned transaction is standard size, pays the fee for its size once
+    # and makes only UTXOs big enough to stake
+
+    size = checkup.txOverheadBytes + len(transaction.inputs) * checkup.txInputBytes + \
+        len(transaction.outputs) * checkup.txOutputBytes
+
+    assert transaction.size == size <= maxTxBytes
+    assert transaction.fee == transaction_fee(size)
+    assert sum(value for value, blockHeight in transaction.inputs) == sum(transaction.outputs) + transaction.fee
+    assert min(transaction.outputs) >= minimumSatsValue
+
+
+def test_split():
+
+    groups = plan_splits([(1000 * coin, 10), (150 * coin, 11), (250 * coin, 12)], 100 * coin, 100000)
+
+    assert [len(outputs) for inputs, outputs, size, fee in groups] == [9, 2]    # 150 can not make two
+    assert all(size == checkup.txInputBytes + len(outputs) * checkup.txOutputBytes
+               for inputs, outputs, size, fee in groups)
+
+    for transaction in pack_transactions(groups, 100000):
+        check_transaction(transaction, 100 * coin, 100000)
+
+
+def test_split_limited_by_size():
+
+    maxTxBytes = checkup.txOverheadBytes + checkup.txInputBytes + 5 * checkup.txOutputBytes
+    groups = plan_splits([(10000 * coin, 10)], 100 * coin, maxTxBytes)
+
+    assert len(groups[0][1]) == 5
+
+
+def test_combine():
+
+    utxos = [(value * coin // 10, 10) for value in (600, 300, 200, 150, 50, 40, 10, 1)]
+    groups, leftover = plan_combines(utxos, 100 * coin, 100000)
+
+    transactions = pack_transactions(groups, 100000)
+    spent = sorted(utxo for transaction in transactions for utxo in transaction.inputs)
+
+    assert sorted(spent + leftover) == sorted(utxos)
+    assert len(transactions) == 1 and len(transactions[0].outputs) == 1
+
+    for transaction in transactions:
+        check_transaction(transaction, 100 * coin, 100000)
+
+
+def test_dust_left_over():
+
+    dust = [(100, 10), (200, 11)]                   # worth less than the fee to spend them
+    groups, leftover = plan_combines(dust + [(60 * coin, 12), (50 * coin, 13)], 100 * coin, 100000)
+
+    assert sorted(dust) == sorted(leftover[:2])
+    assert len(groups) == 1
+
+
+def test_overhead_once_per_transaction():
+    # several groups packed into one transaction pay the overhead once
+
+    groups = plan_splits([(300 * coin, 10), (400 * coin, 11), (500 * coin, 12)], 100 * coin, 100000)
+    transactions = pack_transactions(groups, 100000)
+
+    assert len(transactions) == 1
+    assert transactions[0].fee == transaction_fee(checkup.txOverheadBytes + sum(group[2] for group in groups))
+
+    check_transaction(transactions[0], 100 * coin, 100000)
+
+
+def test_pack_best_fit():
+
+    maxTxBytes = 1000
+    groups = [([(1, 1)], [1], size, 0) for size in (600, 500, 390, 300, 100, 90)]
+
+    transactions = pack_transactions(groups, maxTxBytes)
+
+    assert [transaction.size for transaction in transactions] == [maxTxBytes, maxTxBytes]
+    assert [len(transaction.inputs) for transaction in transactions] == [2, 4]
+
+
+def test_planner_random():
+
+    rng = random.Random(5)
+    utxos = UTXOSet()
+
+    for i in range(3000):
+        utxos.append(rng.randrange(1000, 3 * 10 ** 10), rng.randrange(770000, 776800))
+
+    for maxTxBytes in (5000, 100000):
+        planner = UTXOPlanner(777320, 100 * coin, 200 * coin, maxTxBytes)
+        planner.add(utxos)
+        plan = planner.plan()
+
+        for transaction in plan.splits + plan.combines:
+            check_transaction(transaction, 100 * coin, maxTxBytes)
+
+        small = sorted((value, height) for value, height in zip(utxos.values, utxos.heights) if value < 100 * coin)
+        combined = [utxo for transaction in plan.combines for utxo in transaction.inputs] + plan.leftover
+
+        assert sorted(combined) == small
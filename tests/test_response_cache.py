@@ -0,0 +1,100 @@
+import hashlib
+import json
+
+import SSCBenchmark
+
+from superstakercheckup import checkup
+from superstakercheckup.checkup import APIClient, ResponseCache
+
+
+class ETagHandler(SSCBenchmark.MockAPIHandler):
+    # the mock API with an ETag on each response and 304 Not Modified for a
+    # matching If-None-Match, as qtum.info does
+
+    def send_body(self, raw, compressed):
+
+        etag = '"' + hashlib.md5(raw).hexdigest() + '"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def test_response_cache_revalidation(mock_server, tmp_path):
+
+    mock_server.RequestHandlerClass = ETagHandler
+    fileName = str(tmp_path / "responses.db")
+    url = mock_server.endpoint + "address/" + mock_server.stakerAddress
+
+    cache = ResponseCache(fileName, 1000000, 100, 60)
+    client = APIClient(checkup.headers, 1, cache = cache)
+    body = client.get(url)
+
+    assert json.loads(body)["delegations"] == mock_server.delegations
+    assert client.get(url) == body
+    assert client.get(mock_server.endpoint + "info") == client.get(mock_server.endpoint + "info")
+    assert (cache.misses, cache.revalidated, cache.hits) == (2, 1, 1)
+
+    client.close()
+    cache.close()
+
+    cache = ResponseCache(fileName, 1000000, 100, 60)       # from the file in the next run
+    client = APIClient(checkup.headers, 1, cache = cache)
+
+    assert client.get(url) == body
+    assert (cache.misses, cache.revalidated) == (0, 1)
+
+    client.close()
+    cache.close()
+
+
+def test_revalidation_updates_only_metadata(mock_server, tmp_path):
+    # a 304 writes the new times and validators, not the body again
+
+    mock_server.RequestHandlerClass = ETagHandler
+    url = mock_server.endpoint + "address/" + mock_server.stakerAddress
+    cache = ResponseCache(str(tmp_path / "responses.db"), 1000000, 100, 60)
+    client = APIClient(checkup.headers, 1, cache = cache)
+    body = client.get(url)
+    fetched = cache.db.execute("SELECT fetched FROM responses").fetchone()[0]
+    statements = []
+    cache.db.set_trace_callback(statements.append)
+
+    assert client.get(url) == body
+    assert cache.revalidated == 1
+    assert len(statements) == 1 and statements[0].startswith("UPDATE") and "body" not in statements[0]
+
+    cache.refresh(url, cache.lookup(url), '"new"', '')          # a 304 with a new ETag
+
+    etag, newFetched, lastUsed, storedBody = cache.db.execute("SELECT etag, fetched, lastUsed, body "
+                                                              "FROM responses").fetchone()
+
+    assert etag == '"new"' and cache.lookup(url).etag == '"new"'
+    assert newFetched >= fetched and lastUsed == newFetched
+    assert storedBody == body
+
+    client.close()
+    cache.close()
+
+
+def test_response_cache_memory_bound():
+
+    cache = ResponseCache('', 100, 10, 0)
+
+    for i in range(5):
+        cache.store("http://x/address/" + str(i), b"x" * 40, '"e"', '')
+
+    assert cache.memoryBytes <= 100
+    assert cache.lookup("http://x/address/0") is None
+    assert cache.lookup("http://x/address/4").body == b"x" * 40
+    assert cache.is_fresh("http://x/info", cache.lookup("http://x/address/4")) == False
@@ -0,0 +1,136 @@
+from urllib.error import URLError, HTTPError
+
+import pytest
+
+import SSCBenchmark
+
+from superstakercheckup import checkup, check_staker, CheckupError
+from superstakercheckup.checkup import APIClient, QtumInfoSource
+
+
+class FailingHandler(SSCBenchmark.MockAPIHandler):
+    # the mock API answering with the (status, Retry-After) of server.failures
+    # first, one for each request, then with the responses, status 0 closes
+    # the connection with no response
+
+    def send_body(self, raw, compressed):
+
+        with self.server.lock:
+            failure = self.server.failures.pop(0) if len(self.server.failures) > 0 else None
+
+        if failure is None:
+            SSCBenchmark.MockAPIHandler.send_body(self, raw, compressed)
+            return
+
+        status, retryAfter = failure
+
+        if status == 0:
+            self.close_connection = True
+            return
+
+        self.send_response(status)
+
+        if retryAfter is not None:
+            self.send_header("Retry-After", retryAfter)
+
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def failing_server(mock_server, monkeypatch):
+    # the mock API with FailingHandler, the retry waits are recorded in
+    # mock_server.sleeps instead of slept
+
+    mock_server.RequestHandlerClass = FailingHandler
+    mock_server.failures = []
+    mock_server.sleeps = []
+    monkeypatch.setattr(checkup.time, "sleep", mock_server.sleeps.append)
+
+    return mock_server
+
+
+def test_429_slows_down_and_honours_retry_after(failing_server):
+
+    failing_server.failures = [(429, "3"), (429, "3")]
+    client = APIClient(checkup.headers, 1, maxRetries = 5)
+
+    assert client.get(failing_server.endpoint + "info") == failing_server.info[0]
+    assert client.retryCount == 2
+    assert failing_server.requests == 3
+
+    # no limit until the first 429, then throttledRequestsPerSecond, halved
+    # on the second and raised a little by the request that succeeded
+
+    assert client.limiter.rate == checkup.throttledRequestsPerSecond / 2 + 0.5
+    assert [delay for delay in failing_server.sleeps if delay >= 3] == [3, 3]
+
+    client.close()
+
+
+def test_5xx_retried_with_backoff(failing_server):
+
+    failing_server.failures = [(503, None), (500, None), (502, None)]
+    client = APIClient(checkup.headers, 1, maxRetries = 5)
+
+    assert client.get(failing_server.endpoint + "info") == failing_server.info[0]
+    assert client.retryCount == 3
+    assert client.limiter.rate == 0                         # a 5xx is not a rate limit
+    delays = [delay for delay in failing_server.sleeps if delay > 0]   # not the mock's latency
+
+    assert len(delays) == 3
+    assert all(delay <= checkup.maxBackoff for delay in delays)
+
+    client.close()
+
+
+def test_4xx_not_retried(failing_server):
+
+    failing_server.failures = [(404, None)]
+    client = APIClient(checkup.headers, 1, maxRetries = 5)
+
+    with pytest.raises(HTTPError):
+        client.get(failing_server.endpoint + "info")
+
+    assert client.retryCount == 0
+
+    client.close()
+
+
+def test_stream_retried_by_the_client_only(failing_server):
+    # a failed streamed UTXO request is retried maxRetries times in all
+
+    address = failing_server.stakerAddress
+    client = APIClient(checkup.headers, 1, maxRetries = 2)
+    source = QtumInfoSource(client, failing_server.endpoint, streamUTXOs = True)
+
+    failing_server.failures = [(503, None), (0, None)]
+    utxos, error = source.get_utxos(address)
+
+    assert error is None
+    assert list(zip(utxos.values, utxos.heights)) == list(failing_server.utxoColumns[address])
+
+    client.close()
+
+    for status, errorType in ((503, HTTPError), (0, URLError)):
+        client = APIClient(checkup.headers, 1, maxRetries = 2)      # no idle connection to retry once
+        source = QtumInfoSource(client, failing_server.endpoint, streamUTXOs = True)
+        failing_server.failures = [(status, None)] * 100
+        failing_server.requests = 0
+        utxos, error = source.get_utxos(address)
+
+        assert isinstance(error, errorType)
+        assert failing_server.requests == 3
+
+        client.close()
+
+
+def test_checkup_error_when_retries_run_out(failing_server):
+
+    failing_server.failures = [(500, None)] * 100
+
+    with pytest.raises(CheckupError):
+        check_staker({"stakerAddress": failing_server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                      "apiEndpoint": failing_server.endpoint, "maxRetries": 2})
+
+    assert failing_server.requests == 3
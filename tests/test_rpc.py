@@ -0,0 +1,10 @@
+from conftest import write_config, run_program, baseline_report
+
+
+def test_rpc_report_same_as_baseline(start_mock_server, tmp_path):
+
+    server = start_mock_server(5, 30)
+    rpcURL = server.endpoint[:-len("api/")]
+    write_config(str(tmp_path), server, '"dataSource": rpc,\n"rpcURL": ' + rpcURL + ',\n')
+
+    assert run_program(str(tmp_path)) == baseline_report()
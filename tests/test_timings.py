@@ -0,0 +1,169 @@
+import json
+from contextlib import redirect_stdout
+from io import StringIO
+
+from conftest import write_config, run_program
+
+from superstakercheckup.checkup import Timings, timed_phase, get_endpoint_kind
+
+endpoint = "http://127.0.0.1:3001/api/"
+
+
+def make_timings(rpc = False):
+    # Timings started at 100 s with four phases and four requests, one reused
+    # connection each for the address and a UTXO page, times in binary
+    # fractions so the sums are exact
+
+    timings = Timings(100.0, rpc)
+
+    timings.add_phase("config", "", 100.0, 0.5)
+    timings.add_phase("delegate", "Qa", 101.0, 0.25)
+    timings.add_phase("delegate", "Qb", 101.5, 0.75)
+    timings.add_phase("report", "Qa", 102.5, 0.125)
+
+    for url, start, connect, firstByte, transfer, wireBytes, decodedBytes in (
+            (endpoint + "info", 100.5, 0.125, 0.25, 0.0625, 1024, 2048),
+            (endpoint + "address/Qa", 100.75, None, 0.375, 0.125, 2048, 4096),
+            (endpoint + "address/Qa/utxo", 101.0, None, 0.5, 0.5, 10240, 51200),
+            (endpoint + "address/Qb/utxo", 101.5, 0.25, 0.25, 0.25, 5120, 20480)):
+        timings.add_call({"url": url, "start": start, "connect": connect, "firstByte": firstByte,
+                          "status": 200, "transfer": transfer, "wireBytes": wireBytes, "bytes": decodedBytes,
+                          "streamed": False})
+
+    timings.add_parse(endpoint + "info", 0.03125)
+    timings.add_parse(endpoint + "address/Qa/utxo", 0.0625)
+    timings.add_parse(endpoint + "address/Qa/utxo", 0.0625)         # a second page
+    timings.add_parse(endpoint + "address/Qb/utxo", 0.125)
+
+    return timings
+
+
+def test_print_report_aggregates_phases_and_requests():
+    # phases summed by name and requests by endpoint, in first seen order, with
+    # an all row, a reused connection counts no connect time, then the slowest
+
+    output = StringIO()
+
+    with redirect_stdout(output):
+        make_timings().print_report()
+
+    assert output.getvalue() == """
+Timing report
+
+Phase                 Count    Total s      Max s
+config                    1      0.500      0.500
+delegate                  2      1.000      0.750
+report                    1      0.125      0.125
+
+Requests              Count  Connect s First byte s  Transfer s   Parse s    Wire KB  Decoded KB
+/info                     1      0.125        0.250       0.062     0.031        1.0         2.0
+/address                  1      0.000        0.375       0.125     0.000        2.0         4.0
+/address/utxo             2      0.250        0.750       0.750     0.250       15.0        70.0
+all                       4      0.375        1.375       0.938     0.281       18.0        76.0
+
+Slowest requests (connect + first byte + transfer s, decoded KB)
+  1.000      50.0 http://127.0.0.1:3001/api/address/Qa/utxo
+  0.750      20.0 http://127.0.0.1:3001/api/address/Qb/utxo
+  0.500       4.0 http://127.0.0.1:3001/api/address/Qa
+  0.438       2.0 http://127.0.0.1:3001/api/info
+"""
+
+
+def test_print_report_rpc_calls_in_one_group():
+
+    output = StringIO()
+
+    with redirect_stdout(output):
+        make_timings(True).print_report()
+
+    lines = output.getvalue().splitlines()
+    requestStart = [line.split(" ")[0] for line in lines].index("Requests") + 1
+
+    assert [line.split()[0:2] for line in lines[requestStart:requestStart + 3]] == [["rpc", "4"], ["all", "4"], []]
+    assert get_endpoint_kind(endpoint + "info", True) == "rpc"
+
+
+def test_export_times_relative_to_start(tmp_path):
+    # each request with its parse time (None if it was not decoded), the
+    # phases and the counters, starts relative to the Timings start
+
+    fileName = str(tmp_path / "timing.json")
+    make_timings().export(fileName, {"duration": 3.0, "requestCount": 4})
+
+    with open(fileName) as timingFile:
+        exported = json.load(timingFile)
+
+    assert exported["duration"] == 3.0
+    assert exported["requestCount"] == 4
+    assert exported["phases"] == [{"phase": "config", "item": "", "start": 0.0, "seconds": 0.5},
+                                  {"phase": "delegate", "item": "Qa", "start": 1.0, "seconds": 0.25},
+                                  {"phase": "delegate", "item": "Qb", "start": 1.5, "seconds": 0.75},
+                                  {"phase": "report", "item": "Qa", "start": 2.5, "seconds": 0.125}]
+    assert [(call["start"], call["parse"]) for call in exported["requests"]] == \
+        [(0.5, 0.03125), (0.75, None), (1.0, 0.125), (1.5, 0.125)]
+    assert exported["requests"][1]["connect"] is None
+
+
+def test_timed_phase():
+    # a phase is recorded when its body is done, even when it raises, and
+    # nothing at all without timings
+
+    timings = Timings(0.0)
+
+    with timed_phase(timings, "staker", "Qa"):
+        pass
+
+    try:
+        with timed_phase(timings, "delegate", "Qb"):
+            raise ValueError
+
+    except ValueError:
+        pass
+
+    with timed_phase(None, "staker", "Qc"):
+        pass
+
+    assert [(name, item) for name, item, phaseStart, seconds in timings.phases] == [("staker", "Qa"),
+                                                                                   ("delegate", "Qb")]
+    assert all(phaseStart > 0 and seconds >= 0 for name, item, phaseStart, seconds in timings.phases)
+
+
+def test_program_timing_report(start_mock_server, tmp_path):
+    # the printed tables of a run are the sums of its exported phases and
+    # requests, one phase per staker, delegate and report, one request per
+    # address and UTXO page
+
+    server = start_mock_server(5, 30)
+    write_config(str(tmp_path), server, '"timingReport": true,\n"timingFile": timing.json,\n')
+    output = run_program(str(tmp_path))
+
+    with open(str(tmp_path / "timing.json")) as timingFile:
+        exported = json.load(timingFile)
+
+    lines = output[output.index("Timing report"):].splitlines()
+    phaseRows = lines[3:lines.index("", 3)]
+    requestStart = lines.index("", 3) + 2
+    requestRows = lines[requestStart:lines.index("", requestStart)]
+
+    phaseCounts = {}
+
+    for phase in exported["phases"]:
+        phaseCounts[phase["phase"]] = phaseCounts.get(phase["phase"], 0) + 1
+
+    assert [row[:20].strip() for row in phaseRows] == list(phaseCounts)
+    assert [int(row[20:27]) for row in phaseRows] == list(phaseCounts.values())
+    assert phaseCounts["staker"] == phaseCounts["report"] == 1
+    assert phaseCounts["delegate"] == 5
+
+    for row in phaseRows:
+        seconds = [phase["seconds"] for phase in exported["phases"] if phase["phase"] == row[:20].strip()]
+
+        assert float(row[27:38]) == round(sum(seconds), 3)
+        assert float(row[38:49]) == round(max(seconds), 3)
+
+    assert [row.split()[0:2] for row in requestRows] == [["/info", "1"], ["/address", "1"], ["/address/utxo", "6"],
+                                                        ["all", "8"]]
+    assert exported["requestCount"] == len(exported["requests"]) == server.requests == 8
+    assert float(requestRows[-1].split()[6]) == round(sum(call["wireBytes"] for call in exported["requests"]) / 1024, 1)
+    assert float(requestRows[-1].split()[7]) == round(sum(call["bytes"] for call in exported["requests"]) / 1024, 1)
+    assert "requestCount 8, connectionsOpened " + str(exported["connectionsOpened"]) + ", retries 0" in output
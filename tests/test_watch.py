@@ -0,0 +1,119 @@
+import random
+from contextlib import redirect_stdout
+from io import StringIO
+
+import SSCBenchmark
+
+from superstakercheckup import UTXOTotals, StakerResult, DelegateResult, StakerSummary
+from superstakercheckup.checkup import TextWriter, split_report, print_report_diff
+
+rng = random.Random(17)
+firstStaker, secondStaker, shared, leaving, joining, other = [SSCBenchmark.make_address(rng) for i in range(6)]
+
+
+def totals(sumValid):
+
+    return UTXOTotals(3, sumValid + 300000000, 2, sumValid, 1, 200000000, 0, 100000000, sumValid)
+
+
+def render(height, stakers):
+    # the printed report of stakers, a list of (address, sumValid, delegates),
+    # delegates a list of (address, fee, sumValid), sumValid None for a fee
+    # too low
+
+    output = StringIO()
+    writer = TextWriter(True)
+
+    with redirect_stdout(output):
+        writer.start(str(height))
+
+        for address, sumValid, delegates in stakers:
+            writer.staker(StakerResult(address, 10, 100, totals(sumValid), False, False))
+
+            for delegate, fee, delegateValid in delegates:
+                if delegateValid is None:
+                    writer.delegate(DelegateResult(address, delegate, fee, "fee too low", None, False))
+                else:
+                    writer.delegate(DelegateResult(address, delegate, fee, "staked", totals(delegateValid), False))
+
+            weight = sum(delegateValid for delegate, fee, delegateValid in delegates if delegateValid is not None)
+            writer.staker_end(StakerSummary(address, len(delegates), 3, len(delegates), weight))
+
+        writer.finish()
+
+    return output.getvalue()
+
+
+def diff(lastReport, report):
+
+    output = StringIO()
+
+    with redirect_stdout(output):
+        print_report_diff(split_report(lastReport), split_report(report), "100", "101", True)
+
+    return output.getvalue()
+
+
+def test_split_report_keys_sections_by_staker():
+
+    report = split_report(render(100, [(firstStaker, 50000000000, [(shared, 10, 20000000000), (other, 5, None)]),
+                                       (secondStaker, 60000000000, [(shared, 10, 20000000000)])]))
+
+    assert [key for key, lines in report] == [("", "Mainnet height"), (firstStaker, firstStaker),
+                                              (firstStaker, shared), (firstStaker, other),
+                                              (firstStaker, "Number of"), (secondStaker, secondStaker),
+                                              (secondStaker, shared), (secondStaker, "Number of")]
+
+
+def test_report_diff_several_stakers():
+    # the shared delegate changes under one staker only, one staker loses a
+    # delegate and the other gains one
+
+    lastReport = render(100, [(firstStaker, 50000000000, [(shared, 10, 20000000000), (leaving, 10, 30000000000)]),
+                              (secondStaker, 60000000000, [(shared, 10, 20000000000)])])
+    report = render(101, [(firstStaker, 50000000000, [(shared, 12, 20000000000)]),
+                          (secondStaker, 60000000000, [(shared, 10, 20000000000), (joining, 10, 40000000000)])])
+
+    lastSections = dict(split_report(lastReport))
+    sections = dict(split_report(report))
+    output = diff(lastReport, report).splitlines()
+
+    assert output[0] == "Mainnet height 101 (was 100)"
+    assert output[-1] == ""
+
+    # the first staker's delegate, its fee changed, printed as a line diff
+
+    sharedLast = lastSections[(firstStaker, shared)]
+    sharedNow = sections[(firstStaker, shared)]
+
+    assert output[1:3] == ["- " + sharedLast[0], "+ " + sharedNow[0]]
+
+    # the first staker's summary has one delegate less
+
+    start = output.index("  Number of valid Staker UTXOs (mature + immature) 3")
+
+    assert output[start + 1:start + 5] == ["- Number of delegates being staked 2", "+ Number of delegates being staked 1",
+                                           "- " + lastSections[(firstStaker, "Number of")][2],
+                                           "+ " + sections[(firstStaker, "Number of")][2]]
+
+    # the second staker gains a delegate, its shared delegate is unchanged
+
+    joined = ["+ " + line for line in sections[(secondStaker, joining)]]
+
+    assert output[output.index(joined[0]):output.index(joined[0]) + len(joined)] == joined
+    assert sum(1 for line in output if shared in line) == 2
+
+    # the delegate that left, at the end
+
+    assert output[-1 - len(lastSections[(firstStaker, leaving)]):-1] == \
+        ["- " + line for line in lastSections[(firstStaker, leaving)]]
+
+    assert all(firstStaker not in line and secondStaker not in line for line in output)
+
+
+def test_report_diff_no_changes():
+
+    stakers = [(firstStaker, 50000000000, [(shared, 10, 20000000000)]),
+               (secondStaker, 60000000000, [(shared, 10, 20000000000), (other, 5, None)])]
+
+    assert diff(render(100, stakers), render(101, stakers)) == "Mainnet height 101 (was 100)\nNo changes\n\n"
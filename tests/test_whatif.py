@@ -0,0 +1,82 @@
+import random
+
+from superstakercheckup import check_staker, what_if
+from superstakercheckup.checkup import UTXOSet, WhatIfSimulator, analyse_delegate_utxos
+
+height = 777320
+
+
+def make_delegates(rng, count):
+    # (fee, UTXOSet) for count delegates
+
+    delegates = []
+
+    for i in range(count):
+        utxos = UTXOSet()
+
+        for j in range(rng.randrange(0, 20)):
+            utxos.append(rng.randrange(1, 400) * 100000000 + rng.randrange(100000000),
+                         rng.randrange(height - 2000, height + 1))
+
+        delegates.append((rng.choice([0, 5, 10, 15]), utxos))
+
+    return delegates
+
+
+def brute_force(delegates, fee, minUTXOSize):
+    # the point worked out the way the checkup does it, one delegate at a time
+
+    staked = staking = weight = tooSmall = recombine = 0
+
+    for delegateFee, utxos in delegates:
+        if delegateFee < fee:
+            continue
+
+        totals, recombineFlag = analyse_delegate_utxos([utxos], height, minUTXOSize)
+        staked += 1
+        staking += totals.numValid > 0
+        weight += totals.sumValid
+        tooSmall += totals.sumTooSmall
+        recombine += recombineFlag
+
+    return staked, staking, weight, tooSmall, recombine
+
+
+def test_sweep_matches_brute_force():
+
+    rng = random.Random(11)
+    delegates = make_delegates(rng, 60)
+    simulator = WhatIfSimulator(height)
+
+    for fee, utxos in delegates:
+        simulator.add(fee, utxos)
+
+    fees = [0, 3, 5, 10, 12, 15, 20]
+    sizes = [0, 1, 50, 100, 250, 500]
+    points = simulator.sweep(fees, sizes)
+
+    assert simulator.delegationCount == 60
+    assert [(point.fee, point.minUTXOSize) for point in points] == [(fee, size) for fee in fees for size in sizes]
+
+    for point in points:
+        assert tuple(point[2:]) == brute_force(delegates, point.fee, point.minUTXOSize)
+
+
+def test_what_if_matches_check_staker(start_mock_server):
+
+    server = start_mock_server(20, 25)
+    config = {"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100, "isMainnet": True,
+              "apiEndpoint": server.endpoint}
+
+    result = what_if(config, [5, 10, 15], [50, 100, 200])
+    staker = result.stakers[0]
+
+    assert result.height == height
+    assert staker.delegationCount == len(server.delegations)
+
+    for point in staker.points:
+        pointConfig = dict(config, stakerFee = point.fee, stakerMinUTXOSize = point.minUTXOSize)
+        summary = check_staker(pointConfig).stakers[0].summary
+
+        assert (point.stakingDelegations, point.delegatesWeight) == (summary.stakingDelegations,
+                                                                     summary.delegatesWeight)
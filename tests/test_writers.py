@@ -0,0 +1,201 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from conftest import write_config, run_program
+
+from superstakercheckup import check_staker
+from superstakercheckup.checkup import JSONWriter, NDJSONWriter, CSVWriter
+
+
+def staker_config(server, stakerFee):
+    # the mock staker with the maturity projection and the network share, at a
+    # fee of 15 every delegation of the mock (fee 10) has a fee too low
+
+    return {"stakerAddress": server.stakerAddress, "stakerFee": stakerFee, "stakerMinUTXOSize": 100,
+            "isMainnet": True, "apiEndpoint": server.endpoint, "projectionBlocks": 2000, "networkShare": True}
+
+
+def result_fields(result):
+    # the fields of a result as the writers write them, the UTXO totals inlined
+
+    fields = {}
+
+    for key, value in result._asdict().items():
+        if key == "totals":
+            if value is not None:
+                fields.update(value._asdict())
+        elif key != "plan":
+            fields[key] = value
+
+    return fields
+
+
+def check_record(record, result, recordType, dropped = ()):
+    # record has the fields of result and no others, dropped are left out
+
+    fields = result_fields(result)
+
+    for key in dropped:
+        del fields[key]
+
+    if recordType is not None:
+        fields["type"] = recordType
+
+    assert record == fields
+
+
+def check_projection(points, report):
+    # the projection points start at the checkup height, with the weights of the
+    # report, and each has the weights of the schedules at its height
+
+    projection = report.projection
+
+    assert points[0] == {"height": projection.height,
+                         "stakerWeight": report.staker.totals.sumValid,
+                         "delegatesWeight": report.summary.delegatesWeight}
+    assert [point["height"] for point in points] == sorted(set(point["height"] for point in points))
+    assert points[-1]["height"] <= projection.height + projection.horizon
+
+    for point in points:
+        assert point["stakerWeight"] == projection.stakerSchedule.weight_at(point["height"])[1]
+        assert point["delegatesWeight"] == projection.delegatesSchedule.weight_at(point["height"])[1]
+
+
+def csv_text(value):
+    # a value as csv.writer writes it
+
+    if value is None:
+        return ''
+
+    return str(value)
+
+
+def test_json_report_matches_api(start_mock_server, tmp_path):
+    # the program's JSON report has the results check_staker() returns
+
+    server = start_mock_server(5, 30)
+    write_config(str(tmp_path), server, '"outputFormat": json,\n"outputFile": report.json,\n')
+    run_program(str(tmp_path))
+
+    with open(str(tmp_path / "report.json")) as reportFile:
+        report = json.load(reportFile)
+
+    result = check_staker({"stakerAddress": server.stakerAddress, "stakerFee": 10, "stakerMinUTXOSize": 100,
+                           "isMainnet": True, "apiEndpoint": server.endpoint})
+    staker = result.stakers[0]
+
+    assert report["height"] == result.height
+    assert report["network"] == "mainnet"
+    assert len(report["stakers"]) == 1
+
+    record = report["stakers"][0]
+
+    assert sorted(record) == ["address", "delegates", "fee", "maxValue", "minUTXOSize", "numImmature", "numTooSmall",
+                              "numTotal", "numValid", "recombineFlag", "splitFlag", "sumImmature", "sumTooSmall",
+                              "sumTotal", "sumValid", "summary", "type"]
+    assert record["summary"]["delegatesWeight"] == staker.summary.delegatesWeight
+    assert [delegate["address"] for delegate in record["delegates"]] == \
+        [delegate.address for delegate in staker.delegates]
+    assert [delegate["sumValid"] for delegate in record["delegates"]] == \
+        [delegate.totals.sumValid for delegate in staker.delegates]
+
+
+@pytest.mark.parametrize("stakerFee", [10, 15])
+def test_json_writer_fields(start_mock_server, stakerFee):
+
+    server = start_mock_server(5, 30)
+    output = StringIO()
+    result = check_staker(staker_config(server, stakerFee), writer = JSONWriter(output, True))
+    report = json.loads(output.getvalue())
+
+    assert report["height"] == result.height
+    assert report["network"] == "mainnet"
+    assert len(report["stakers"]) == len(result.stakers)
+
+    for record, staker in zip(report["stakers"], result.stakers):
+        check_record({key: value for key, value in record.items()
+                      if key not in ("delegates", "summary", "projection", "network")}, staker.staker, "staker")
+        check_record(record["summary"], staker.summary, "summary")
+        check_record(record["network"], staker.network, None, ("stakerAddress",))
+
+        assert len(record["delegates"]) == len(staker.delegates) == 5
+
+        for delegateRecord, delegate in zip(record["delegates"], staker.delegates):
+            check_record(delegateRecord, delegate, "delegate")
+
+        assert record["projection"]["horizon"] == 2000
+        check_projection(record["projection"]["points"], staker)
+
+    statuses = [delegate["status"] for delegate in report["stakers"][0]["delegates"]]
+
+    if stakerFee == 10:
+        assert statuses == ["staked"] * 5
+    else:
+        assert statuses == ["fee too low"] * 5
+        assert "sumValid" not in report["stakers"][0]["delegates"][0]
+
+
+@pytest.mark.parametrize("stakerFee", [10, 15])
+def test_ndjson_writer_fields(start_mock_server, stakerFee):
+    # one line per result, in report order, each with the height
+
+    server = start_mock_server(5, 30)
+    output = StringIO()
+    result = check_staker(staker_config(server, stakerFee), writer = NDJSONWriter(output))
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    staker = result.stakers[0]
+
+    assert [record["type"] for record in records] == \
+        ["staker"] + ["delegate"] * 5 + ["summary", "projection", "network"]
+    assert all(record.pop("height") == result.height for record in records)
+
+    check_record(records[0], staker.staker, "staker")
+
+    for record, delegate in zip(records[1:6], staker.delegates):
+        check_record(record, delegate, "delegate")
+
+    check_record(records[6], staker.summary, "summary")
+
+    # the height of the network share is the checkup height, popped above
+
+    check_record(records[8], staker.network, "network", ("height",))
+
+    assert records[7]["stakerAddress"] == server.stakerAddress
+    check_projection(records[7]["points"], staker)
+
+
+@pytest.mark.parametrize("stakerFee", [10, 15])
+def test_csv_writer_fields(start_mock_server, stakerFee):
+    # a row for the staker and each delegate, then the projection rows, the
+    # columns a result does not have are empty
+
+    server = start_mock_server(5, 30)
+    output = StringIO()
+    result = check_staker(staker_config(server, stakerFee), writer = CSVWriter(output, True))
+    rows = list(csv.DictReader(StringIO(output.getvalue())))
+    staker = result.stakers[0]
+
+    assert list(rows[0]) == CSVWriter.columns + CSVWriter.projectionColumns
+    assert all(row["height"] == str(result.height) for row in rows)
+    assert [row["type"] for row in rows[:6]] == ["staker"] + ["delegate"] * 5
+
+    for row, item in zip(rows[:6], [staker.staker] + staker.delegates):
+        fields = result_fields(item)
+        fields["type"] = row["type"]
+        fields["height"] = result.height
+
+        if row["type"] == "staker":
+            fields["stakerAddress"] = item.address
+
+        assert row == {column: csv_text(fields.get(column)) for column in row}
+
+    points = [{"height": int(row["projectedHeight"]), "stakerWeight": int(row["stakerWeight"]),
+               "delegatesWeight": int(row["delegatesWeight"])} for row in rows[6:]]
+
+    assert all(row["type"] == "projection" and row["stakerAddress"] == server.stakerAddress for row in rows[6:])
+    check_projection(points, staker)
+
+    if stakerFee == 15:
+        assert [row["numValid"] for row in rows[1:6]] == [''] * 5